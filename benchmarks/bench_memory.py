@@ -0,0 +1,97 @@
+"""Memory per entry of a loaded dictionary, before and after the compact store.
+
+"before" is the representation DictionaryStore used to keep: a list of
+{'word', 'meaning'} dicts plus an index of lower-cased keys. "after" is the
+current store (parallel word and meaning lists, keys sharing the word's
+string when it is already lower-case). "text" is what the word and meaning
+strings alone take. Each measurement loads the same synthetic dict_*.json in
+a fresh interpreter and reports, per entry, the memory still allocated after
+loading (retained) and the highest allocation during the load (peak), both
+from tracemalloc. Run from the repository root:
+
+    python benchmarks/bench_memory.py [sizes] [script]
+
+sizes is a comma-separated list (default 100000,1000000), script one of the
+synthetic scripts (default latin).
+"""
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def old_load(json_file):
+    """The former DictionaryStore.load, without the journal"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entries = []
+    index = {}
+    for entry in data:
+        word = entry.get('word', '')
+        key = word.lower()
+        if key not in index:
+            index[key] = len(entries)
+            entries.append({'word': word, 'meaning': entry.get('meaning', '')})
+    return entries, index
+
+def child(representation, data_dir, source_lang, target_lang):
+    """Runs inside the spawned interpreter; prints retained and peak bytes"""
+    from wordpocket import config
+    config.DATA_DIR = data_dir
+    from wordpocket.storage import DictionaryStore
+    json_file = os.path.join(data_dir, f"dict_{source_lang}_{target_lang}.json")
+
+    gc.collect()
+    tracemalloc.start()
+    if representation == 'before':
+        loaded = old_load(json_file)
+        count = len(loaded[0])
+    else:
+        loaded = DictionaryStore(source_lang, target_lang)
+        count = len(loaded)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if representation == 'before':
+        text = sum(sys.getsizeof(entry['word']) + sys.getsizeof(entry['meaning']) for entry in loaded[0])
+    else:
+        text = sum(sys.getsizeof(word) + sys.getsizeof(meaning)
+                   for word, meaning in zip(loaded.words, loaded.meanings))
+    print(json.dumps({'count': count, 'retained': retained, 'peak': peak, 'text': text}))
+
+def measure(representation, data_dir, source_lang, target_lang):
+    output = subprocess.run([sys.executable, __file__, '--child', representation, data_dir,
+                             source_lang, target_lang],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    import synthetic
+
+    sizes = [int(size) for size in (sys.argv[1] if len(sys.argv) > 1 else "100000,1000000").split(",")]
+    script = sys.argv[2] if len(sys.argv) > 2 else 'latin'
+
+    print(f"{'entries':>9}{'text B':>9}{'before B':>10}{'after B':>9}{'saved':>8}"
+          f"{'peak before B':>15}{'peak after B':>14}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            source_lang, target_lang, _ = synthetic.write_dictionary(data_dir, size, script)
+            before = measure('before', data_dir, source_lang, target_lang)
+            after = measure('after', data_dir, source_lang, target_lang)
+        count = after['count']
+        print(f"{count:>9}{after['text'] / count:>9.0f}{before['retained'] / count:>10.0f}"
+              f"{after['retained'] / count:>9.0f}{1 - after['retained'] / before['retained']:>7.0%}"
+              f"{before['peak'] / count:>15.0f}{after['peak'] / count:>14.0f}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(*sys.argv[2:6])
+    else:
+        main()
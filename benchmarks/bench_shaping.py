@@ -0,0 +1,83 @@
+"""Per-cell cost of PDF text shaping, before and after TextShaper.
+
+"before" is the implementation export_pdf used to call for every cell: a new
+ArabicReshaper per string and a per-character range loop for script
+detection. Run from the repository root:
+
+    python benchmarks/bench_shaping.py [cells]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arabic_reshaper import ArabicReshaper
+from bidi.algorithm import get_display
+
+from wordpocket.pdf import TextShaper
+
+def old_is_arabic_text(text):
+    for char in text:
+        if '\u0600' <= char <= '\u06FF' or \
+           '\u0750' <= char <= '\u077F' or \
+           '\u08A0' <= char <= '\u08FF' or \
+           '\uFB50' <= char <= '\uFDFF' or \
+           '\uFE70' <= char <= '\uFEFF':
+            return True
+    return False
+
+def old_prepare_arabic_text(text):
+    reshaper = ArabicReshaper(configuration=TextShaper.RESHAPER_CONFIGURATION)
+    return get_display(reshaper.reshape(text))
+
+def old_process_text(text, lang_code):
+    if not text:
+        return ""
+    if lang_code == 'AR' or old_is_arabic_text(text):
+        return old_prepare_arabic_text(text)
+    return text
+
+def sample_column(script, cells, distinct):
+    if script == 'arabic':
+        words = ["مرحبا", "كتاب", "مدرسة", "الطالب", "جميل", "بيت"]
+    else:
+        words = ["hello", "book", "school", "student", "beautiful", "house"]
+    return [f"{words[i % len(words)]} {i % distinct}" for i in range(cells)]
+
+def per_cell_us(func, texts, lang_code):
+    start = time.perf_counter()
+    func(texts, lang_code)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+def main():
+    cells = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cases = [
+        ('latin, all distinct', 'latin', 'EN', cells),
+        ('arabic, all distinct', 'arabic', 'AR', cells),
+        ('arabic, 10% distinct', 'arabic', 'AR', max(1, cells // 10)),
+    ]
+
+    print(f"{'case':<24}{'before us/cell':>16}{'after us/cell':>16}{'speedup':>10}")
+    for name, script, lang_code, distinct in cases:
+        texts = sample_column(script, cells, distinct)
+        before = per_cell_us(lambda column, lang: [old_process_text(t, lang) for t in column], texts, lang_code)
+        # A fresh shaper so the LRU starts empty
+        shaper = TextShaper()
+        after = per_cell_us(shaper.process_column, texts, lang_code)
+        print(f"{name:<24}{before:>16.1f}{after:>16.1f}{before / after:>9.1f}x")
+
+    # Script detection alone, on text that is not Arabic (the full scan case)
+    texts = sample_column('latin', cells, cells)
+    start = time.perf_counter()
+    for text in texts:
+        old_is_arabic_text(text)
+    before = (time.perf_counter() - start) / cells * 1e6
+    start = time.perf_counter()
+    for text in texts:
+        TextShaper.is_arabic_text(text)
+    after = (time.perf_counter() - start) / cells * 1e6
+    print(f"{'is_arabic_text (latin)':<24}{before:>16.2f}{after:>16.2f}{before / after:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Cold-start time of the widget: importing final.py and the first paint.
+
+Every run is a fresh interpreter with QT_QPA_PLATFORM=offscreen and a
+throwaway settings/data directory. "import" is the time spent in
+`import final`, "first paint" the wall time from spawning the process to
+the first paint event of DictionaryApp. The slowest imports under final
+come from `python -X importtime`. Run from the repository root:
+
+    python benchmarks/bench_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def child(settings_dir):
+    """Runs inside the spawned interpreter; prints the import time and the paint timestamp"""
+    sys.path.insert(0, ROOT)
+    start = time.perf_counter()
+    import final
+    import_time = time.perf_counter() - start
+
+    from PySide6.QtCore import QObject, QEvent
+    from PySide6.QtWidgets import QApplication
+
+    from wordpocket import config
+    final.SCRIPT_DIR = config.SCRIPT_DIR = settings_dir
+    final.DATA_DIR = config.DATA_DIR = os.path.join(settings_dir, "data")
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                print(f"RESULT {import_time} {time.time()}", flush=True)
+                # Skip closeEvent, it would write settings and compact stores
+                os._exit(0)
+            return False
+
+    app = QApplication(sys.argv)
+    window = final.DictionaryApp()
+    paint_filter = FirstPaint()
+    window.installEventFilter(paint_filter)
+    window.show()
+    app.exec()
+
+def run_once(env):
+    with tempfile.TemporaryDirectory() as settings_dir:
+        start = time.time()
+        output = subprocess.run([sys.executable, __file__, "--child", settings_dir],
+                                env=env, capture_output=True, text=True, timeout=60).stdout
+    for line in output.splitlines():
+        if line.startswith("RESULT "):
+            _, import_time, painted_at = line.split()
+            return float(import_time), float(painted_at) - start
+    raise RuntimeError(f"child did not paint:\n{output}")
+
+def slowest_imports(env, count=10):
+    """Cumulative import time (us) of the slowest modules, from -X importtime"""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import final"],
+                            cwd=ROOT, env=env, capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[13:]:
+            continue
+        fields = line[12:].split("|")
+        try:
+            rows.append((int(fields[1]), fields[2].rstrip()))
+        except ValueError:
+            continue  # header line
+    return sorted(rows, reverse=True)[:count]
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+
+    results = [run_once(env) for _ in range(runs)]
+    import_times = [r[0] * 1000 for r in results]
+    paint_times = [r[1] * 1000 for r in results]
+
+    print(f"{'runs':<24}{runs:>10}")
+    print(f"{'import final (ms)':<24}{statistics.median(import_times):>10.1f}   min {min(import_times):.1f}")
+    print(f"{'first paint (ms)':<24}{statistics.median(paint_times):>10.1f}   min {min(paint_times):.1f}")
+    print()
+    print(f"{'slowest imports':<48}{'cumulative ms':>14}")
+    for cumulative, name in slowest_imports(env):
+        print(f"{name:<48}{cumulative / 1000:>14.1f}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,57 @@
+"""Offline, deterministic stand-in for the deep-translator backend.
+
+install() puts a FakeBackend in place of wordpocket's configured
+translation backends, so the translation paths can be timed without a
+network and with a chosen round-trip latency.
+"""
+import hashlib
+import threading
+import time
+
+from wordpocket.backends import TranslationBackend
+
+class FakeBackend(TranslationBackend):
+    """A TranslationBackend that sleeps instead of going online.
+
+    Each text costs `latency` seconds of sleep, as the deep-translator
+    backend also sends one request per text of a batch; batch_latency, if
+    set, is charged once per batch instead. Translations are derived from a
+    hash of the pair and the text, so they are the same on every run.
+    """
+    name = "fake"
+
+    def __init__(self, latency=0.05, batch_latency=None):
+        super().__init__()
+        self.latency = latency
+        self.batch_latency = batch_latency
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+
+    def _count(self):
+        with self._calls_lock:
+            self.calls += 1
+
+    @staticmethod
+    def _fake(text, source_code, target_code):
+        digest = hashlib.sha1(f"{source_code}:{target_code}:{text}".encode('utf-8')).hexdigest()
+        return f"{target_code}-{digest[:8]}"
+
+    def translate(self, text, source_code, target_code):
+        self._count()
+        time.sleep(self.latency)
+        return self._fake(text, source_code, target_code)
+
+    def translate_batch(self, texts, source_code, target_code):
+        self._count()
+        latency = self.batch_latency if self.batch_latency is not None else self.latency * len(texts)
+        time.sleep(latency)
+        return [self._fake(text, source_code, target_code) for text in texts]
+
+def install(latency=0.05, batch_latency=None):
+    """Route wordpocket's translations to a FakeBackend and return it"""
+    from wordpocket import config, translation
+    backend = FakeBackend(latency, batch_latency)
+    config.TRANSLATOR_AVAILABLE = True
+    config.TRANSLATOR_TYPE = "deep_translator"
+    translation.translator_pool.configure([backend])
+    return backend
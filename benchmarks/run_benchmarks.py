@@ -0,0 +1,345 @@
+"""Benchmark suite for the paths that slow down as dictionaries grow.
+
+Every case runs in a fresh interpreter (QT_QPA_PLATFORM=offscreen, a
+throwaway data directory) on a synthetic dictionary from synthetic.py, with
+translations served by fake_translator.py. The results, timings plus peak
+RSS, are written as JSON; --compare checks them against an earlier file and
+exits with status 1 if any timing or peak memory grew by more than
+--threshold. Run from the repository root:
+
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --output new.json
+    python benchmarks/run_benchmarks.py --sizes 1000000 --scripts latin --cases store_load,search
+
+Cases:
+    store_load      DictionaryStore load of the dictionary
+    save_to_json    DictionaryApp.save_to_json, new words and updates
+    editor_load     TableEditorWindow construction (load_data), store not loaded
+    editor_save     TableEditorWindow.save_data after editing EDITOR_SAVE_ROWS rows
+    search          search index build and queries
+    shaping         TextShaper.process_column over the meanings (fresh cache)
+    export_pdf      export_dictionary_pdf of up to --pdf-rows rows
+    translate_word  DictionaryApp.translate_word round-trips, cold and cached
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+SAVE_TO_JSON_WORDS = 200
+EDITOR_SAVE_ROWS = 1000
+SEARCH_QUERIES = ("ka", "kar", "bemo", "ka ri", "karitomen")
+SHAPING_MAX_CELLS = 100000
+TRANSLATE_WORDS = 20
+
+# Differences below these (by metric suffix) are noise, never regressions
+NOISE_FLOOR = {'_s': 0.005, '_ms': 0.5, '_mb': 5}
+
+# Cases whose cost does not depend on the script only run for 'latin'
+SCRIPT_INDEPENDENT = ('save_to_json', 'translate_word')
+CASES = ('store_load', 'save_to_json', 'editor_load', 'editor_save', 'search',
+         'shaping', 'export_pdf', 'translate_word')
+
+def guard_emit_refcount():
+    """Work around PySide6 builds whose Signal.emit() drops a reference to True.
+
+    The large cases emit hundreds of thousands of signals (one per edited
+    row, per progress step), which would free True and abort the child.
+    Only applied when a test emit shows the leak. Returns the MB the pin
+    takes (0 without it); the RSS figures leave it out, so they compare
+    across PySide6 builds.
+    """
+    from PySide6.QtCore import QObject, Signal
+
+    class Probe(QObject):
+        ping = Signal()
+
+    probe = Probe()
+    before = sys.getrefcount(True)
+    for _ in range(10):
+        probe.ping.emit()
+    if sys.getrefcount(True) < before:
+        print("PySide6 Signal.emit() leaks references to True; pinning it for the benchmark")
+        pinned = guard_emit_refcount.pinned = [True, False] * 10000000
+        return sys.getsizeof(pinned) / (1024 * 1024)
+    return 0.0
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+# --- Cases (run inside the child interpreter) ---
+
+def case_store_load(env):
+    from wordpocket.storage import get_dictionary_store
+    start = time.perf_counter()
+    store = get_dictionary_store(env['source'], env['target'])
+    return {'load_s': time.perf_counter() - start, 'entries': len(store)}
+
+def case_save_to_json(env):
+    import final
+    from wordpocket.storage import get_dictionary_store
+    get_dictionary_store(env['source'], env['target'])
+    app = env['new_app']()
+
+    def save(word, meaning):
+        app.word_entry.setText(word)
+        app.translation_entry.setText(meaning)
+        start = time.perf_counter()
+        app.save_to_json()
+        return time.perf_counter() - start
+
+    app.timer.stop()
+    new = [save(f"benchword{i}", f"meaning{i}") for i in range(SAVE_TO_JSON_WORDS)]
+    updates = [save(entry['word'], "updated") for entry in env['entries'][:SAVE_TO_JSON_WORDS]]
+    final.close_dictionary_stores()
+    return {'new_word_ms': statistics.median(new) * 1000,
+            'update_ms': statistics.median(updates) * 1000}
+
+def case_editor_load(env):
+    import final
+    app = env['new_app']()
+    start = time.perf_counter()
+    editor = final.TableEditorWindow(app, env['source'], env['target'])
+    elapsed = time.perf_counter() - start
+    return {'load_s': elapsed, 'rows': len(editor.model.words)}
+
+def case_editor_save(env):
+    import final
+    app = env['new_app']()
+    editor = final.TableEditorWindow(app, env['source'], env['target'])
+    editor.model.fetch_all()
+    rows = min(EDITOR_SAVE_ROWS, len(editor.model.words))
+    step = max(1, len(editor.model.words) // rows)
+    for row in range(0, rows * step, step):
+        editor.model.setData(editor.model.index(row, 1), f"edited {row}")
+    start = time.perf_counter()
+    editor.save_data()
+    return {'save_s': time.perf_counter() - start, 'rows': rows}
+
+def case_search(env):
+    from wordpocket.storage import get_dictionary_store
+    store = get_dictionary_store(env['source'], env['target'])
+    start = time.perf_counter()
+    store.search_index()
+    result = {'build_s': time.perf_counter() - start}
+    for query in SEARCH_QUERIES:
+        start = time.perf_counter()
+        store.search(query)
+        result[f"query_{query.replace(' ', '_')}_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+def case_shaping(env):
+    from wordpocket.pdf import TextShaper
+    meanings = [entry['meaning'] for entry in env['entries'][:SHAPING_MAX_CELLS]]
+    shaper = TextShaper()
+    start = time.perf_counter()
+    shaper.process_column(meanings, env['target'])
+    return {'shape_s': time.perf_counter() - start, 'cells': len(meanings)}
+
+def case_export_pdf(env):
+    from wordpocket.metrics import metrics
+    from wordpocket.pdf import export_dictionary_pdf
+    entries = env['entries'][:env['pdf_rows']]
+    path = os.path.join(env['dir'], "export.pdf")
+    start = time.perf_counter()
+    rows = export_dictionary_pdf(path, env['source'], env['target'],
+                                 [entry['word'] for entry in entries],
+                                 [entry['meaning'] for entry in entries])
+    result = {'export_s': time.perf_counter() - start, 'rows': rows}
+    histograms = metrics.snapshot()['histograms']
+    for phase in ('pdf_fonts', 'pdf_shaping', 'pdf_build'):
+        result[f"{phase}_s"] = histograms[phase]['max']
+    return result
+
+def case_translate_word(env):
+    from PySide6.QtWidgets import QApplication
+    import final
+    app = env['new_app']()
+    qt_app = QApplication.instance()
+
+    def round_trip(word):
+        app.word_entry.setText(word)
+        app.timer.stop()
+        app.translation_entry.clear()
+        start = time.perf_counter()
+        app.translate_word()
+        while not app.translation_entry.text():
+            qt_app.processEvents()
+            time.sleep(0.0005)
+        return time.perf_counter() - start
+
+    words = [f"lookup{i}" for i in range(TRANSLATE_WORDS)]
+    cold = [round_trip(word) for word in words]
+    # The translation cache answers the second round
+    cached = [round_trip(word) for word in words]
+    saved_word = env['entries'][0]['word']
+    saved = [round_trip(saved_word) for _ in range(TRANSLATE_WORDS)]
+    app.translation_pool.waitForDone()
+    return {'cold_ms': statistics.median(cold) * 1000,
+            'cached_ms': statistics.median(cached) * 1000,
+            'saved_ms': statistics.median(saved) * 1000,
+            'latency_ms': env['latency'] * 1000}
+
+def child(case, size, script, latency, pdf_rows):
+    """Run one case in this (fresh) interpreter and print its result as JSON"""
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, BENCHMARKS_DIR)
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    import fake_translator
+    import synthetic
+
+    # First, so that no earlier peak hides the pin from the RSS figures
+    pin_mb = guard_emit_refcount()
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_dir = os.path.join(work_dir, "data")
+        source, target, entries = synthetic.write_dictionary(data_dir, size, script)
+        # Fonts come from the repository; everything written goes to work_dir
+        os.symlink(os.path.join(ROOT, "fonts"), os.path.join(work_dir, "fonts"))
+
+        from wordpocket import config
+        config.SCRIPT_DIR = work_dir
+        config.DATA_DIR = data_dir
+        fake_translator.install(latency)
+
+        def new_app():
+            from PySide6.QtWidgets import QApplication
+            import final
+            final.SCRIPT_DIR = work_dir
+            final.DATA_DIR = data_dir
+            with open(os.path.join(work_dir, "settings.json"), 'w', encoding='utf-8') as f:
+                json.dump({'source_languages': [source], 'target_languages': [target]}, f)
+            if QApplication.instance() is None:
+                new_app.qt_app = QApplication([])
+            return final.DictionaryApp()
+
+        env = {'dir': work_dir, 'source': source, 'target': target, 'entries': entries,
+               'latency': latency, 'pdf_rows': pdf_rows, 'new_app': new_app}
+        setup_rss = peak_rss_mb() - pin_mb
+        result = globals()[f"case_{case}"](env)
+        result['setup_peak_rss_mb'] = setup_rss
+        result['peak_rss_mb'] = peak_rss_mb() - pin_mb
+    print("RESULT " + json.dumps(result), flush=True)
+    # Skip Qt and store teardown, it is not part of any case
+    os._exit(0)
+
+# --- Driver ---
+
+def run_case(case, size, script, args):
+    command = [sys.executable, os.path.abspath(__file__), "--child", case, str(size), script,
+               str(args.latency), str(args.pdf_rows)]
+    process = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+    for line in process.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[7:])
+    raise RuntimeError(f"{case} {size} {script} failed:\n{process.stdout[-2000:]}\n{process.stderr[-2000:]}")
+
+def compare(baseline, current, threshold):
+    """Print the change of every timing and memory figure; returns the regressions"""
+    old = {(r['case'], r['size'], r['script']): r['metrics'] for r in baseline['results']}
+    regressions = []
+    print(f"\n{'case':<16}{'size':>9}  {'script':<8}{'metric':<26}{'baseline':>12}{'current':>12}{'change':>9}")
+    for r in current['results']:
+        before = old.get((r['case'], r['size'], r['script']))
+        if before is None:
+            continue
+        for metric, value in r['metrics'].items():
+            if not metric.endswith(('_s', '_ms', '_mb')) or metric not in before or metric == 'latency_ms':
+                continue
+            if not before[metric]:
+                continue
+            change = value / before[metric] - 1
+            noise = next(floor for suffix, floor in NOISE_FLOOR.items() if metric.endswith(suffix))
+            flag = ""
+            if change > threshold and value - before[metric] > noise:
+                flag = "  REGRESSION"
+                regressions.append((r['case'], r['size'], r['script'], metric, change))
+            print(f"{r['case']:<16}{r['size']:>9}  {r['script']:<8}{metric:<26}{before[metric]:>12.4g}"
+                  f"{value:>12.4g}{change * 100:>8.1f}%{flag}")
+    return regressions
+
+def main():
+    import synthetic
+    parser = argparse.ArgumentParser(description="WordPocket benchmark suite")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="dictionary sizes, comma-separated (default: %(default)s)")
+    parser.add_argument("--scripts", default=",".join(synthetic.SCRIPTS),
+                        help="meaning scripts, comma-separated (default: %(default)s)")
+    parser.add_argument("--cases", default=",".join(CASES), help="cases to run (default: all)")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="fake translator round-trip in seconds (default: %(default)s)")
+    parser.add_argument("--pdf-rows", type=int, default=10000,
+                        help="rows exported by export_pdf at most (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=1800, help="seconds per case (default: %(default)s)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare the results with")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative growth counted as a regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    scripts = args.scripts.split(",")
+    cases = args.cases.split(",")
+    for case in cases:
+        if case not in CASES:
+            parser.error(f"unknown case {case!r} (choose from {', '.join(CASES)})")
+
+    results = []
+    print(f"{'case':<16}{'size':>9}  {'script':<8}{'seconds':>9}  metrics")
+    for case in cases:
+        for size in sizes:
+            for script in scripts:
+                if case in SCRIPT_INDEPENDENT and script != scripts[0]:
+                    continue
+                start = time.perf_counter()
+                metrics = run_case(case, size, script, args)
+                elapsed = time.perf_counter() - start
+                results.append({'case': case, 'size': size, 'script': script, 'metrics': metrics})
+                summary = ", ".join(f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}"
+                                    for key, value in metrics.items())
+                print(f"{case:<16}{size:>9}  {script:<8}{elapsed:>9.1f}  {summary}", flush=True)
+
+    from PySide6 import __version__ as pyside_version
+    report = {
+        'meta': {
+            'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'pyside6': pyside_version,
+            'platform': platform.platform(),
+            'latency': args.latency,
+            'pdf_rows': args.pdf_rows,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions above {args.threshold * 100:.0f}%")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _, _, case, size, script, latency, pdf_rows = sys.argv
+        child(case, int(size), script, float(latency), int(pdf_rows))
+    else:
+        sys.path.insert(0, BENCHMARKS_DIR)
+        sys.exit(main())
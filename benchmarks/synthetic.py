@@ -0,0 +1,69 @@
+"""Deterministic synthetic dictionaries for the benchmarks.
+
+Words are Latin pseudo-words; meanings are written in one of SCRIPTS, each
+stored under a language pair whose target uses that script (so the PDF
+export picks the matching font and shaping path). The same count, script
+and seed always give the same entries.
+"""
+import json
+import os
+import random
+
+# script -> (source language, target language) of the generated dictionary
+SCRIPTS = {
+    'latin': ('EN', 'TR'),
+    'arabic': ('EN', 'AR'),
+    'cjk': ('EN', 'ZH'),
+}
+
+LATIN_SYLLABLES = [consonant + vowel for consonant in "bcdfgklmnprstvyz" for vowel in "aeiou"]
+ARABIC_LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+CJK_CHARACTERS = [chr(code) for code in range(0x4E00, 0x4E00 + 3000)]
+
+def _unique_word(rng, index, alphabet, digits, extra):
+    """A random prefix of 0..extra symbols plus index written in fixed-width base len(alphabet).
+
+    The fixed-width suffix alone identifies the index, so words never collide.
+    """
+    suffix = []
+    for _ in range(digits):
+        index, digit = divmod(index, len(alphabet))
+        suffix.append(alphabet[digit])
+    prefix = [rng.choice(alphabet) for _ in range(rng.randint(0, extra))]
+    return "".join(prefix + suffix)
+
+def _digits(count, base):
+    digits = 1
+    while base ** digits < count:
+        digits += 1
+    return digits
+
+def generate_entries(count, script='latin', seed=0):
+    """count {'word', 'meaning'} dicts, words unique case-insensitively"""
+    if script not in SCRIPTS:
+        raise ValueError(f"Unknown script: {script} (choose from {', '.join(SCRIPTS)})")
+    rng = random.Random(f"{seed}-{script}-{count}")
+    word_digits = _digits(count, len(LATIN_SYLLABLES))
+    entries = []
+    for index in range(count):
+        word = _unique_word(rng, index, LATIN_SYLLABLES, word_digits, 2)
+        meanings = []
+        for _ in range(rng.randint(1, 3)):
+            if script == 'latin':
+                meanings.append("".join(rng.choice(LATIN_SYLLABLES) for _ in range(rng.randint(2, 4))))
+            elif script == 'arabic':
+                meanings.append("".join(rng.choice(ARABIC_LETTERS) for _ in range(rng.randint(3, 8))))
+            else:
+                meanings.append("".join(rng.choice(CJK_CHARACTERS) for _ in range(rng.randint(1, 4))))
+        entries.append({'word': word, 'meaning': ", ".join(meanings)})
+    return entries
+
+def write_dictionary(data_dir, count, script='latin', seed=0):
+    """Write dict_{source}_{target}.json into data_dir; returns (source, target, entries)"""
+    source_lang, target_lang = SCRIPTS[script]
+    entries = generate_entries(count, script, seed)
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"dict_{source_lang}_{target_lang}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+    return source_lang, target_lang, entries
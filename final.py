@@ -1,88 +1,127 @@
 import sys
 import json
 import os
+import sqlite3
+import threading
+import time
 from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
-                              QLineEdit, QPushButton, QToolButton, QLabel, QTableWidget, 
-                              QTableWidgetItem, QHeaderView, QMessageBox, QFileDialog,
-                              QDialog, QListWidget, QListWidgetItem, QDialogButtonBox)
-from PySide6.QtCore import Qt, QTimer
+                              QLineEdit, QPushButton, QToolButton, QLabel, QTableView, 
+                              QHeaderView, QMessageBox, QFileDialog, QProgressDialog,
+                              QDialog, QListWidget, QListWidgetItem, QDialogButtonBox,
+                              QInputDialog, QCheckBox, QCompleter, QPlainTextEdit)
+from PySide6.QtCore import (Qt, QTimer, QObject, QRunnable, QThreadPool, Signal,
+                            QAbstractTableModel, QAbstractProxyModel, QModelIndex, QStringListModel,
+                            QFileSystemWatcher)
 from PySide6.QtGui import QIcon, QRegion, QPainterPath
-try:
-    from deep_translator import GoogleTranslator
-    TRANSLATOR_AVAILABLE = True
-    TRANSLATOR_TYPE = "deep_translator"
-    print("Using deep-translator for translations")
-except ImportError:
-    try:
-        # Fallback to older googletrans version
-        from googletrans import Translator
-        translator = Translator()
-        TRANSLATOR_AVAILABLE = True
-        TRANSLATOR_TYPE = "googletrans"
-        print("Using googletrans for translations")
-    except ImportError:
-        TRANSLATOR_AVAILABLE = False
-        print("Warning: Neither 'deep-translator' nor 'googletrans' installed. Translation will be disabled.")
-        print("Install with: pip install deep-translator")
-    else:
-        TRANSLATOR_TYPE = "deep_translator"
-
-
-
-
-# Get the directory where the script is located
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_DIR = os.path.join(SCRIPT_DIR, "data")
-
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
-
-    # Import for Arabic text shaping
-    from arabic_reshaper import ArabicReshaper
-    from bidi.algorithm import get_display
-
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+
+# Everything that does not need Qt lives in the wordpocket package
+from wordpocket.config import (SCRIPT_DIR, DATA_DIR, LANGUAGES, BACKENDS_ENV, TRANSLATION_BACKENDS,
+                               REPORTLAB_AVAILABLE, normalize_text)
+from wordpocket.translation import (TranslationCache, translator_pool, translate_text, translate_many,
+                                    translation_latency, single_flight)
+from wordpocket.metrics import metrics
+from wordpocket.state import SettingsFile, write_behind
+from wordpocket.storage import (DICTIONARY_FILE_RE, get_dictionary_store, loaded_dictionary_store,
+                                close_dictionary_stores, dictionary_pairs, subscribe_all, merge_meanings)
+from wordpocket.lookup import lookup_saved
+from wordpocket.search import SearchIndex
+from wordpocket.completion import WordFrequencies, build_prefix_index
+from wordpocket.debounce import AdaptiveDebounce
+from wordpocket.pdf import ExportCancelled, export_dictionary_pdf, font_manager
+from wordpocket.importer import ImportCancelled, import_vocabulary
+
+if TRANSLATION_BACKENDS:
+    print(f"Translation backends: {', '.join(TRANSLATION_BACKENDS)}")
+else:
+    print("Warning: Neither 'deep-translator' nor 'googletrans' installed. Translation will be disabled.")
+    print("Install with: pip install deep-translator")
+
+if not REPORTLAB_AVAILABLE:
     print("Warning: 'reportlab', 'arabic-reshaper', or 'python-bidi' not installed. PDF export will be disabled.")
-LANGUAGES = {
-    'EN': {'name': 'English', 'code': 'en', 'font': 'NotoSans-Regular.ttf'},
-    'TR': {'name': 'Türkçe', 'code': 'tr', 'font': 'NotoSans-Regular.ttf'},
-    'AR': {'name': 'العربية', 'code': 'ar', 'font': 'NotoSansArabic-Regular.ttf'},
-    'FR': {'name': 'Français', 'code': 'fr', 'font': 'NotoSans-Regular.ttf'},
-    'DE': {'name': 'Deutsch', 'code': 'de', 'font': 'NotoSans-Regular.ttf'},
-    'ES': {'name': 'Español', 'code': 'es', 'font': 'NotoSans-Regular.ttf'},
-    'IT': {'name': 'Italiano', 'code': 'it', 'font': 'NotoSans-Regular.ttf'},
-    'RU': {'name': 'Русский', 'code': 'ru', 'font': 'NotoSans-Regular.ttf'},
-    'JA': {'name': '日本語', 'code': 'ja', 'font': 'NotoSansJP-Regular.ttf'},
-    'KO': {'name': '한국어', 'code': 'ko', 'font': 'NotoSansKR-Regular.ttf'},
-    'ZH': {'name': '中文', 'code': 'zh', 'font': 'NotoSansSC-Regular.ttf'},
-    'PT': {'name': 'Português', 'code': 'pt', 'font': 'NotoSans-Regular.ttf'},
-    'NL': {'name': 'Nederlands', 'code': 'nl', 'font': 'NotoSans-Regular.ttf'},
-    'SV': {'name': 'Svenska', 'code': 'sv', 'font': 'NotoSans-Regular.ttf'},
-    'DA': {'name': 'Dansk', 'code': 'da', 'font': 'NotoSans-Regular.ttf'},
-    'NO': {'name': 'Norsk', 'code': 'no', 'font': 'NotoSans-Regular.ttf'},
-    'FI': {'name': 'Suomi', 'code': 'fi', 'font': 'NotoSans-Regular.ttf'},
-    'PL': {'name': 'Polski', 'code': 'pl', 'font': 'NotoSans-Regular.ttf'},
-    'CS': {'name': 'Čeština', 'code': 'cs', 'font': 'NotoSans-Regular.ttf'},
-    'HU': {'name': 'Magyar', 'code': 'hu', 'font': 'NotoSans-Regular.ttf'}
-}
-
-# Add font mapping to the LANGUAGES dictionary
-default_latin_font = 'NotoSans-Regular.ttf'
-for lang_key in LANGUAGES:
-    if lang_key not in ['AR', 'JA', 'KO', 'ZH']:
-        LANGUAGES[lang_key]['font'] = default_latin_font
+
+class TranslationSignals(QObject):
+    # generation, translation, error message, (source code, target code)
+    finished = Signal(int, str, str, object)
+
+class TranslationTask(QRunnable):
+    """Runs translate_text on a worker thread and reports back through signals.
+
+    With saved_lookup, a (source_lang, target_lang, pivot) tuple, the saved
+    dictionaries are searched first (loading them if needed), then the cache,
+    and the network is only used when neither knows the word.
+    """
+    def __init__(self, generation, word, source_code, target_code, cache=None, saved_lookup=None):
+        super().__init__()
+        self.generation = generation
+        self.word = word
+        self.source_code = source_code
+        self.target_code = target_code
+        self.cache = cache
+        self.saved_lookup = saved_lookup
+        self.signals = TranslationSignals()
+
+    def run(self):
+        if self.saved_lookup is not None:
+            source_lang, target_lang, pivot = self.saved_lookup
+            try:
+                saved = lookup_saved(self.word, source_lang, target_lang, pivot)
+            except Exception as e:
+                print(f"Saved dictionary lookup error: {e}")
+                saved = None
+            if saved is not None:
+                # Not cached: the dictionary stays the source of truth for it
+                self.signals.finished.emit(self.generation, saved[0], "", self.pair())
+                return
+        if self.cache is not None:
+            cached = self.cache.get(self.source_code, self.target_code, self.word)
+            if cached is not None:
+                self.signals.finished.emit(self.generation, cached, "", self.pair())
+                return
+        try:
+            translation = translate_text(self.word, self.source_code, self.target_code)
+        except Exception as e:
+            self.signals.finished.emit(self.generation, "", str(e) or e.__class__.__name__, self.pair())
+            return
+        if self.cache is not None:
+            self.cache.put(self.source_code, self.target_code, self.word, translation)
+        self.signals.finished.emit(self.generation, translation, "", self.pair())
+
+    def pair(self):
+        return (self.source_code, self.target_code)
+
+class BatchTranslateSignals(QObject):
+    progress = Signal(int, int)
+    # status ('done', 'cancelled' or 'error'), {normalized word: translation}, error message
+    finished = Signal(str, object, str)
+
+class BatchTranslateTask(QRunnable):
+    """Runs translate_many on a worker thread"""
+    def __init__(self, words, source_code, target_code, cache=None):
+        super().__init__()
+        # The editor keeps a reference until the task reports back
+        self.setAutoDelete(False)
+        self.words = words
+        self.source_code = source_code
+        self.target_code = target_code
+        self.cache = cache
+        self.signals = BatchTranslateSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            results = translate_many(self.words, self.source_code, self.target_code, self.cache,
+                                     progress=self.signals.progress.emit,
+                                     is_cancelled=self._cancelled.is_set)
+        except Exception as e:
+            self.signals.finished.emit('error', {}, str(e))
+            return
+        status = 'cancelled' if self._cancelled.is_set() else 'done'
+        self.signals.finished.emit(status, results, "")
 
 class LanguageSettingsDialog(QDialog):
-    # This class remains unchanged
     def __init__(self, parent, current_settings):
         super().__init__(parent)
         self.setWindowTitle("Language Settings")
@@ -123,6 +162,14 @@ class LanguageSettingsDialog(QDialog):
             self.target_list.addItem(item)
         layout.addWidget(self.target_list)
 
+        self.pivot_check = QCheckBox("Also translate through other saved dictionaries (e.g. FR → EN → TR)")
+        self.pivot_check.setChecked(current_settings.get('pivot_lookup', True))
+        layout.addWidget(self.pivot_check)
+
+        diagnostics_button = QPushButton("Diagnostics...", self)
+        diagnostics_button.clicked.connect(lambda: DiagnosticsDialog(parent).exec())
+        layout.addWidget(diagnostics_button)
+
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
@@ -144,6 +191,632 @@ class LanguageSettingsDialog(QDialog):
 
         return source_languages, target_languages
 
+    def get_pivot_lookup(self):
+        return self.pivot_check.isChecked()
+
+class DiagnosticsDialog(QDialog):
+    """Timings and sizes collected by wordpocket.metrics, plus the trace switch"""
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        self.setWindowTitle("Diagnostics")
+        self.setGeometry(300, 300, 720, 480)
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+
+        self.report = QPlainTextEdit(self)
+        self.report.setReadOnly(True)
+        self.report.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.report.setStyleSheet("font-family: monospace;")
+        layout.addWidget(self.report)
+
+        self.trace_check = QCheckBox(f"Write every measurement to {os.path.join(DATA_DIR, PERF_TRACE_FILE)}", self)
+        self.trace_check.setChecked(bool(metrics.trace_path))
+        self.trace_check.toggled.connect(self.toggle_trace)
+        layout.addWidget(self.trace_check)
+
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton("Refresh", self)
+        refresh_button.clicked.connect(self.refresh)
+        reset_button = QPushButton("Reset", self)
+        reset_button.clicked.connect(self.reset)
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(reset_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        snapshot = metrics.snapshot()
+        lines = [f"{'measurement':<56}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for key, summary in snapshot['histograms'].items():
+            if 'p50' in summary:
+                lines.append(f"{key:<56}{summary['count']:>7}{summary['p50'] * 1000:>10.1f}"
+                             f"{summary['p95'] * 1000:>10.1f}{summary['max'] * 1000:>10.1f}")
+        if not snapshot['histograms']:
+            lines.append("(nothing measured yet)")
+
+        lines.append("")
+        for key, value in snapshot['values'].items():
+            lines.append(f"{key:<56}{value:>17}")
+
+        cache = getattr(self.app, 'translation_cache', None)
+        if cache is not None:
+            stats = cache.stats()
+            lines.append(f"{'translation cache hit rate':<56}{stats['hit_rate'] * 100:>16.1f}%")
+            lines.append(f"{'translation cache entries':<56}{stats['entries']:>17}")
+        lines.append(f"{'requests coalesced in flight':<56}{single_flight.coalesced:>17}")
+        for name, state, retry_in in translator_pool.status():
+            if state == 'open':
+                state = f"open, retry in {retry_in:.0f}s"
+            lines.append(f"{'backend ' + name:<56}{state:>17}")
+        if hasattr(self.app, 'debounce'):
+            lines.append(f"{'current debounce ms':<56}{self.app.debounce.delay_ms(translation_latency.value):>17}")
+        self.report.setPlainText("\n".join(lines))
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def toggle_trace(self, enabled):
+        self.app.perf_trace = enabled
+        metrics.set_trace(os.path.join(DATA_DIR, PERF_TRACE_FILE) if enabled else None)
+        self.app.save_settings()
+
+# Lookups running at once for the main window: the pair on screen plus the
+# prefetched ones, so switching languages is instant without flooding the
+# translation service
+TRANSLATION_WORKERS = 3
+
+# JSON-lines trace in DATA_DIR, written when enabled in the diagnostics dialog
+PERF_TRACE_FILE = "perf_trace.jsonl"
+
+# Delay between showing the main window and loading the saved dictionaries
+# of the configured languages in the background
+DICTIONARY_PRELOAD_DELAY_MS = 1000
+
+# Delay between showing the main window and building the word completion index
+COMPLETION_INDEX_DELAY_MS = 1000
+
+# Delay between showing the main window and prewarming the PDF fonts
+FONT_PREWARM_DELAY_MS = 1000
+
+class ImportSignals(QObject):
+    # progress in per mille (file offsets can exceed a C int)
+    progress = Signal(int, int)
+    # status ('done', 'cancelled' or 'error'), row counts, error message
+    finished = Signal(str, object, str)
+
+class ImportTask(QRunnable):
+    """Runs import_vocabulary on a worker thread"""
+    def __init__(self, file_path, store, policy):
+        super().__init__()
+        # The editor keeps a reference until the task reports back
+        self.setAutoDelete(False)
+        self.file_path = file_path
+        self.store = store
+        self.policy = policy
+        self.signals = ImportSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        def progress(done, total):
+            self.signals.progress.emit(done * 1000 // max(total, 1), 1000)
+
+        try:
+            counts = import_vocabulary(self.file_path, self.store, self.policy,
+                                       progress=progress, is_cancelled=self._cancelled.is_set)
+        except ImportCancelled:
+            # Batches imported before the cancel stay in the dictionary
+            self.signals.finished.emit('cancelled', {}, "")
+        except Exception as e:
+            self.signals.finished.emit('error', {}, str(e))
+        else:
+            self.signals.finished.emit('done', counts, "")
+
+class CompletionIndexSignals(QObject):
+    # source language, PrefixIndex (None on error)
+    finished = Signal(str, object)
+
+class CompletionIndexTask(QRunnable):
+    """Builds the word completion index of a source language on a worker thread"""
+    def __init__(self, lang, frequencies):
+        super().__init__()
+        self.lang = lang
+        self.frequencies = frequencies
+        self.signals = CompletionIndexSignals()
+
+    def run(self):
+        try:
+            index = build_prefix_index(self.lang, self.frequencies)
+        except Exception as e:
+            print(f"Error building the completion index: {e}")
+            index = None
+        self.signals.finished.emit(self.lang, index)
+
+class SearchIndexSignals(QObject):
+    finished = Signal()
+
+class SearchIndexTask(QRunnable):
+    """Builds a store's search index on a worker thread, before the first search needs it"""
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self.signals = SearchIndexSignals()
+
+    def run(self):
+        try:
+            self.store.search_index()
+        except Exception as e:
+            print(f"Error building the search index: {e}")
+        self.signals.finished.emit()
+
+class DictionaryChangeSignals(QObject):
+    # source language, [(store key, entry or None)] of a change to any dictionary
+    changed = Signal(str, object)
+
+class StoreChangeSignals(QObject):
+    # [(store key, entry or None)], origin (see DictionaryStore.subscribe)
+    changed = Signal(object, object)
+
+class PdfExportSignals(QObject):
+    progress = Signal(int, int)
+    # status ('done', 'cancelled' or 'error'), message
+    finished = Signal(str, str)
+
+class PdfExportTask(QRunnable):
+    """Runs export_dictionary_pdf on a worker thread"""
+    def __init__(self, file_path, source_lang, target_lang, words, meanings):
+        super().__init__()
+        # The editor keeps a reference until the task reports back
+        self.setAutoDelete(False)
+        self.file_path = file_path
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.words = words
+        self.meanings = meanings
+        self.signals = PdfExportSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            export_dictionary_pdf(self.file_path, self.source_lang, self.target_lang,
+                                  self.words, self.meanings,
+                                  progress=self.signals.progress.emit,
+                                  is_cancelled=self._cancelled.is_set)
+        except ExportCancelled:
+            # reportlab writes the file only at the end of the build, so
+            # nothing has been written yet
+            self.signals.finished.emit('cancelled', "")
+        except Exception as e:
+            self.signals.finished.emit('error', str(e))
+        else:
+            self.signals.finished.emit('done', self.file_path)
+
+# Delay between the last edit in the table editor and the automatic save
+AUTOSAVE_DELAY_MS = 2000
+
+# Delay between the last keystroke in the editor's search box and the search
+SEARCH_DELAY_MS = 150
+
+# Delay between an outside change of a dict_*.json file and applying it, so a
+# program writing the file in several steps is read once it is done
+DICTIONARY_RELOAD_DELAY_MS = 300
+
+class DictionaryTableModel(QAbstractTableModel):
+    """Two-column word/meaning model over plain parallel string lists.
+
+    No per-cell objects are created; rows are handed to the view in batches
+    through canFetchMore/fetchMore, so opening a large dictionary only costs
+    what is actually scrolled into view.
+
+    Edits are tracked per row: dirty_rows maps a changed row to the word it
+    was loaded with (None for added rows) and deleted_words collects the
+    loaded words of removed rows, so a save only has to persist that delta.
+    Changes saved by someone else arrive through apply_store_changes and
+    touch only their rows.
+    """
+    FETCH_BATCH = 1000
+
+    # Emitted on every user edit (cell change, added or removed row)
+    modified = Signal()
+
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.words = []
+        self.meanings = []
+        self._fetched = 0
+        self.dirty_rows = {}
+        self.deleted_words = []
+        # Store key -> row, or list of rows for a repeated key; built on first
+        # use, kept up to date by edits and dropped when rows are removed
+        self._key_rows = None
+
+    def set_rows(self, words, meanings, key_rows=None):
+        """Replace all rows; key_rows may give {store key: row} for them (it is kept)"""
+        self.beginResetModel()
+        self.words = list(words)
+        self.meanings = list(meanings)
+        self._fetched = min(self.FETCH_BATCH, len(self.words))
+        self.dirty_rows = {}
+        self.deleted_words = []
+        self._key_rows = key_rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 2
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._fetched < len(self.words)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH, len(self.words) - self._fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def fetch_all(self):
+        """Expose every row to the view (before appending at the end)"""
+        self.fetch_through(len(self.words) - 1)
+
+    def fetch_through(self, row):
+        """Expose the rows up to and including row to the view"""
+        last = min(row, len(self.words) - 1)
+        if self._fetched <= last:
+            self.beginInsertRows(QModelIndex(), self._fetched, last)
+            self._fetched = last + 1
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        column = self.words if index.column() == 0 else self.meanings
+        return column[index.row()]
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        column = self.words if index.column() == 0 else self.meanings
+        row = index.row()
+        if column[row] == value:
+            return True
+        if row not in self.dirty_rows:
+            self.dirty_rows[row] = self.words[row].strip()
+        if index.column() == 0:
+            self._unindex_row(row)
+        column[row] = value
+        if index.column() == 0:
+            self._index_row(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        self.modified.emit()
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def append_row(self, word="", meaning=""):
+        """Append a row at the very end and return its row number"""
+        self.fetch_all()
+        row = len(self.words)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.words.append(word)
+        self.meanings.append(meaning)
+        self._fetched += 1
+        self.dirty_rows[row] = None
+        self._index_row(row)
+        self.endInsertRows()
+        self.modified.emit()
+        return row
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row + count > self._fetched:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        for removed in range(row, row + count):
+            origin = self.dirty_rows.pop(removed, self.words[removed].strip())
+            if origin is not None:
+                self.deleted_words.append(origin)
+        # Rows below the removed block move up
+        self.dirty_rows = {(r - count if r > row else r): origin for r, origin in self.dirty_rows.items()}
+        del self.words[row:row + count]
+        del self.meanings[row:row + count]
+        self._fetched -= count
+        self._key_rows = None
+        self.endRemoveRows()
+        self.modified.emit()
+        return True
+
+    def fill_meanings(self, translations):
+        """Fill empty meanings from {normalized word: meaning}; returns the number of rows filled"""
+        filled = []
+        for row, word in enumerate(self.words):
+            if self.meanings[row].strip():
+                continue
+            meaning = translations.get(normalize_text(word))
+            if meaning:
+                if row not in self.dirty_rows:
+                    self.dirty_rows[row] = word.strip()
+                self.meanings[row] = meaning
+                filled.append(row)
+        if filled:
+            if filled[0] < self._fetched:
+                last = min(filled[-1], self._fetched - 1)
+                self.dataChanged.emit(self.index(filled[0], 1), self.index(last, 1),
+                                      [Qt.DisplayRole, Qt.EditRole])
+            self.modified.emit()
+        return len(filled)
+
+    def is_modified(self):
+        return bool(self.dirty_rows or self.deleted_words)
+
+    def changes(self):
+        """Return (deleted_words, puts) for DictionaryStore.apply_changes"""
+        deleted = list(self.deleted_words)
+        puts = []
+        for row in sorted(self.dirty_rows):
+            origin = self.dirty_rows[row]
+            word = self.words[row].strip()
+            meaning = self.meanings[row].strip()
+            if word or meaning:
+                puts.append((origin, word, meaning))
+            elif origin is not None:
+                # A row that was cleared counts as deleted
+                deleted.append(origin)
+        return deleted, puts
+
+    def merge_duplicate_rows(self):
+        """Merge edited rows into an earlier row with the same word; returns the merged words.
+
+        The store keeps one entry per word, so saving two such rows would
+        keep only one meaning. As with the 'merge' import policy, the first
+        row gets the meanings of the others, which are removed.
+        """
+        merged = []
+        duplicates = []
+        for key in {self.key(self.words[row]) for row in self.dirty_rows}:
+            rows = sorted(self._rows_of(key))
+            if not key or len(rows) < 2:
+                continue
+            first = rows[0]
+            meaning = self.meanings[first]
+            for row in rows[1:]:
+                meaning = merge_meanings(meaning, self.meanings[row])
+            if meaning != self.meanings[first]:
+                if first not in self.dirty_rows:
+                    self.dirty_rows[first] = self.words[first].strip()
+                self.meanings[first] = meaning
+                if first < self._fetched:
+                    self.dataChanged.emit(self.index(first, 1), self.index(first, 1),
+                                          [Qt.DisplayRole, Qt.EditRole])
+            duplicates.extend(rows[1:])
+            merged.append(self.words[first].strip())
+        for row in sorted(duplicates, reverse=True):
+            self.fetch_through(row)
+            self.removeRows(row, 1)
+        return merged
+
+    def mark_clean(self):
+        self.dirty_rows = {}
+        self.deleted_words = []
+
+    def rows(self):
+        """Iterate over all (word, meaning) pairs, fetched into the view or not"""
+        return zip(self.words, self.meanings)
+
+    @staticmethod
+    def key(word):
+        """Store key of a cell's word"""
+        return word.strip().lower()
+
+    def _index_row(self, row):
+        if self._key_rows is None:
+            return
+        key = self.key(self.words[row])
+        rows = self._key_rows.get(key)
+        if rows is None:
+            self._key_rows[key] = row
+        elif isinstance(rows, int):
+            self._key_rows[key] = [rows, row]
+        else:
+            rows.append(row)
+
+    def _unindex_row(self, row):
+        if self._key_rows is None:
+            return
+        key = self.key(self.words[row])
+        rows = self._key_rows.get(key)
+        if rows == row:
+            del self._key_rows[key]
+        elif isinstance(rows, list) and row in rows:
+            rows.remove(row)
+
+    def _rows_of(self, key):
+        if self._key_rows is None:
+            self._key_rows = {}
+            for row in range(len(self.words)):
+                self._index_row(row)
+        rows = self._key_rows.get(key)
+        if rows is None:
+            return ()
+        return (rows,) if isinstance(rows, int) else rows
+
+    def rows_for_keys(self, keys):
+        """Sorted row numbers of the words with the given store keys"""
+        return sorted(row for key in keys for row in self._rows_of(key))
+
+    def apply_store_changes(self, changes):
+        """Bring rows up to date with (key, entry) changes saved elsewhere; None deletes.
+
+        Only the rows of the changed keys are touched: updates emit dataChanged
+        for their rows, new words are appended at the end and deletions
+        remove their rows. Rows with unsaved edits, and unsaved deletions,
+        are left alone, as the next save writes over the change anyway.
+        These are not user edits, so nothing becomes dirty.
+        """
+        pending = {self.key(origin) for origin in self.dirty_rows.values() if origin is not None}
+        pending.update(self.key(word) for word in self.deleted_words)
+        updated = []
+        appended = []
+        removed = []
+        for key, entry in changes:
+            if key in pending:
+                continue
+            rows = self._rows_of(key)
+            if entry is None:
+                removed.extend(row for row in rows if row not in self.dirty_rows)
+            elif rows:
+                for row in rows:
+                    if row not in self.dirty_rows:
+                        self.words[row] = entry['word']
+                        self.meanings[row] = entry['meaning']
+                        updated.append(row)
+            else:
+                appended.append(entry)
+
+        visible = [row for row in updated if row < self._fetched]
+        if visible:
+            self.dataChanged.emit(self.index(min(visible), 0), self.index(max(visible), 1),
+                                  [Qt.DisplayRole, Qt.EditRole])
+
+        if appended:
+            first = len(self.words)
+            # Rows past the fetched ones reach the view through fetchMore
+            shown = self._fetched == first
+            if shown:
+                self.beginInsertRows(QModelIndex(), first, first + len(appended) - 1)
+            for entry in appended:
+                self.words.append(entry['word'])
+                self.meanings.append(entry['meaning'])
+                self._index_row(len(self.words) - 1)
+            if shown:
+                self._fetched = len(self.words)
+                self.endInsertRows()
+
+        for row in sorted(removed, reverse=True):
+            fetched = row < self._fetched
+            if fetched:
+                self.beginRemoveRows(QModelIndex(), row, row)
+            del self.words[row]
+            del self.meanings[row]
+            self.dirty_rows = {(r - 1 if r > row else r): origin for r, origin in self.dirty_rows.items()}
+            if fetched:
+                self._fetched -= 1
+                self.endRemoveRows()
+        if removed:
+            self._key_rows = None
+
+class SearchProxyModel(QAbstractProxyModel):
+    """Shows a given list of rows of a DictionaryTableModel.
+
+    Unlike QSortFilterProxyModel nothing is asked of every source row: the
+    rows come straight from the search index, and the vertical header keeps
+    the row numbers of the full table. Editing goes through to the source.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._proxy_rows = {}
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.dataChanged.connect(self._on_data_changed)
+        # Removed rows shift the rows below them; a reset ends the search
+        model.rowsAboutToBeRemoved.connect(self.beginResetModel)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(lambda: self.set_source_rows([], reset=False))
+
+    def set_source_rows(self, rows, reset=True):
+        if reset:
+            self.beginResetModel()
+        self._rows = list(rows)
+        self._proxy_rows = {row: proxy_row for proxy_row, row in enumerate(self._rows)}
+        self.endResetModel()
+
+    def source_rows(self):
+        return self._rows
+
+    def _on_rows_removed(self, parent, first, last):
+        count = last - first + 1
+        self.set_source_rows([row - count if row > last else row for row in self._rows
+                              if not first <= row <= last], reset=False)
+
+    def _on_data_changed(self, top_left, bottom_right, roles):
+        if top_left.row() == bottom_right.row():
+            index = self.mapFromSource(top_left)
+            if index.isValid():
+                self.dataChanged.emit(index, self.index(index.row(), bottom_right.column()), roles)
+        elif self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, 1), roles)
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        return self.sourceModel().index(self._rows[proxy_index.row()], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        proxy_row = self._proxy_rows.get(source_index.row()) if source_index.isValid() else None
+        if proxy_row is None:
+            return QModelIndex()
+        return self.index(proxy_row, source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self._rows) or not 0 <= column < 2:
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 2
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Vertical and role == Qt.DisplayRole:
+            return str(self._rows[section] + 1) if section < len(self._rows) else None
+        return self.sourceModel().headerData(section, orientation, role)
+
 class TableEditorWindow(QWidget):
     def __init__(self, parent, source_lang, target_lang):
         super().__init__()
@@ -153,6 +826,20 @@ class TableEditorWindow(QWidget):
 
         # Use relative path for JSON file
         self.json_file = os.path.join(DATA_DIR, f"dict_{source_lang}_{target_lang}.json")
+        self.store = None
+        self.export_task = None
+        self.export_progress = None
+        self.translate_task = None
+        self.translate_progress = None
+        self.import_task = None
+        self.import_progress = None
+        self.search_index_task = None
+        # Changes to the store made elsewhere (main window, imports, outside
+        # edits) arrive here, queued to the GUI thread
+        self.store_signals = StoreChangeSignals()
+        self.store_signals.changed.connect(self.on_store_changed)
+        # Kept so that unsubscribe() gets the very object subscribe() got
+        self.store_listener = self.store_signals.changed.emit
 
         self.setWindowTitle(f"Dictionary Editor - {source_lang} to {target_lang}")
         self.setGeometry(200, 200, 600, 400)
@@ -166,15 +853,30 @@ class TableEditorWindow(QWidget):
 
         layout = QVBoxLayout(self)
 
-        self.table = QTableWidget(self)
-        self.table.setColumnCount(2)
-
         headers = [LANGUAGES[source_lang]['name'], LANGUAGES[target_lang]['name']]
-        self.table.setHorizontalHeaderLabels(headers)
+        self.model = DictionaryTableModel(headers, self)
 
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.Stretch)
-        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        self.search_model = SearchProxyModel(self)
+        self.search_model.setSourceModel(self.model)
+
+        self.search_input = QLineEdit(self)
+        self.search_input.setPlaceholderText("Search words and meanings...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_input.textChanged.connect(lambda: self.search_timer.start(SEARCH_DELAY_MS))
+
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
+
+        # Edits are flushed shortly after the user stops typing
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.timeout.connect(self.save_data)
+        self.model.modified.connect(lambda: self.autosave_timer.start(AUTOSAVE_DELAY_MS))
+
+        self.setup_table_header()
 
         button_layout = QHBoxLayout()
 
@@ -187,6 +889,17 @@ class TableEditorWindow(QWidget):
         save_button = QPushButton("Save", self)
         save_button.clicked.connect(self.save_data)
 
+        import_button = QPushButton("Import", self)
+        import_button.setToolTip("Add words from a CSV, TSV or JSON-lines file")
+        import_button.clicked.connect(self.import_file)
+
+        translate_button = QPushButton("Translate Missing", self)
+        translate_button.setToolTip("Translate the words without a meaning (in the selection, or all rows)")
+        if not translator_pool.available():
+            translate_button.setEnabled(False)
+            translate_button.setToolTip("Translation requires 'deep-translator' or 'googletrans' to be installed.")
+        translate_button.clicked.connect(self.translate_missing)
+
         export_button = QPushButton("Export PDF", self)
         if not REPORTLAB_AVAILABLE:
             export_button.setEnabled(False)
@@ -196,232 +909,315 @@ class TableEditorWindow(QWidget):
         button_layout.addWidget(add_button)
         button_layout.addWidget(delete_button)
         button_layout.addWidget(save_button)
+        button_layout.addWidget(import_button)
+        button_layout.addWidget(translate_button)
         button_layout.addWidget(export_button)
 
+        layout.addWidget(self.search_input)
         layout.addWidget(self.table)
         layout.addLayout(button_layout)
 
         self.load_data()
 
-    def load_data(self):
-        try:
-            if os.path.exists(self.json_file):
-                with open(self.json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                self.table.setRowCount(len(data))
+    def setup_table_header(self):
+        """Resize modes of the headers (setModel resets them)"""
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        # Fixed row heights so the view never measures rows it does not show
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+    def apply_search(self):
+        """Show only the rows matching the search box, or every row when it is empty"""
+        self.search_timer.stop()
+        query = self.search_input.text().strip()
+        if not query or self.store is None:
+            if self.table.model() is not self.model:
+                self.table.setModel(self.model)
+                self.setup_table_header()
+            return
 
-                for row, item in enumerate(data):
-                    word_item = QTableWidgetItem(item.get('word', ''))
-                    meaning_item = QTableWidgetItem(item.get('meaning', ''))
+        if not self.store.search_index_ready():
+            # Searched once the background build started by load_data is done
+            return
+        try:
+            keys = self.store.search(query)
+            # The store's index has the saved rows; rows with unsaved edits
+            # are matched on what they show now
+            dirty_rows = self.model.dirty_rows
+            rows = [row for row in self.model.rows_for_keys(keys) if row not in dirty_rows]
+            if dirty_rows:
+                edited = SearchIndex()
+                edited.add_many((row, self.model.words[row], self.model.meanings[row]) for row in dirty_rows)
+                rows = sorted(rows + list(edited.search(query)))
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Search error: {str(e)}")
+            return
+        # Only the rows up to the last match have to be in the table model
+        if rows:
+            self.model.fetch_through(rows[-1])
+        self.search_model.set_source_rows(rows)
+        if self.table.model() is not self.search_model:
+            self.table.setModel(self.search_model)
+            self.setup_table_header()
+
+    def source_row(self, index):
+        """Row of the table model behind a (possibly filtered) view index"""
+        if self.table.model() is self.search_model:
+            index = self.search_model.mapToSource(index)
+        return index.row()
 
-                    self.table.setItem(row, 0, word_item)
-                    self.table.setItem(row, 1, meaning_item)
-            else:
-                self.table.setRowCount(0)
-                # Ensure directory exists before creating file
-                os.makedirs(os.path.dirname(self.json_file), exist_ok=True)
-                with open(self.json_file, 'w', encoding='utf-8') as f:
-                    json.dump([], f, ensure_ascii=False, indent=2)
+    def load_data(self):
+        pair = f"{self.source_lang}-{self.target_lang}"
+        try:
+            with metrics.timer('load_data', pair=pair):
+                store = get_dictionary_store(self.source_lang, self.target_lang)
+                if store is not self.store:
+                    store.subscribe(self.store_listener)
+                self.store = store
+                words, meanings, key_rows = self.store.snapshot()
+                self.model.set_rows(words, meanings, key_rows)
+            metrics.set_value('dictionary_rows', len(words), pair=pair)
+            metrics.set_value('dictionary_bytes', self.store.size_on_disk(), pair=pair)
+            # Build the search index in the background so the first search is instant
+            if not self.store.search_index_ready():
+                self.search_index_task = SearchIndexTask(self.store)
+                self.search_index_task.signals.finished.connect(self.on_search_index_ready)
+                QThreadPool.globalInstance().start(self.search_index_task)
+            if self.search_input.text().strip():
+                self.apply_search()
         except json.JSONDecodeError:
             QMessageBox.critical(self, "Error", f"JSON file is corrupted: {self.json_file}. Please check or delete it.")
-            self.table.setRowCount(0)
+            self.model.set_rows([], [])
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Error loading file: {str(e)}")
 
-    def add_row(self):
-        row_count = self.table.rowCount()
-        self.table.insertRow(row_count)
+    def on_search_index_ready(self):
+        self.search_index_task = None
+        if self.search_input.text().strip():
+            self.apply_search()
 
-        self.table.setItem(row_count, 0, QTableWidgetItem(""))
-        self.table.setItem(row_count, 1, QTableWidgetItem(""))
+    def add_row(self):
+        # A new row would not match the search; show the whole table
+        self.search_input.clear()
+        self.apply_search()
+        row = self.model.append_row()
+        self.table.scrollTo(self.model.index(row, 0))
 
     def delete_row(self):
-        current_row = self.table.currentRow()
+        current_row = self.source_row(self.table.currentIndex())
         if current_row >= 0:
-            self.table.removeRow(current_row)
+            self.model.removeRows(current_row, 1)
 
     def save_data(self):
-        try:
-            data = []
-
-            for row in range(self.table.rowCount()):
-                word_item = self.table.item(row, 0)
-                meaning_item = self.table.item(row, 1)
-
-                if word_item and meaning_item:
-                    word = word_item.text().strip()
-                    meaning = meaning_item.text().strip()
-
-                    if word or meaning:
-                        data.append({
-                            'word': word,
-                            'meaning': meaning
-                        })
+        """Persist only the rows added, edited or deleted since the last save"""
+        self.autosave_timer.stop()
+        if self.store is None:
+            # The dictionary could not be loaded; never overwrite it with an empty table
+            return
+        if not self.model.is_modified():
+            return
 
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.json_file), exist_ok=True)
-            
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+        try:
+            with metrics.timer('save_data', pair=f"{self.source_lang}-{self.target_lang}"):
+                merged = self.model.merge_duplicate_rows()
+                if merged:
+                    print(f"Merged rows with the same word: {', '.join(merged)}")
+                deleted_words, puts = self.model.changes()
+                self.store.apply_changes(deleted_words, puts, origin=self)
+                self.model.mark_clean()
+            metrics.set_value('dictionary_bytes', self.store.size_on_disk(),
+                              pair=f"{self.source_lang}-{self.target_lang}")
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Save error: {str(e)}")
 
+    def on_store_changed(self, changes, origin):
+        """Apply rows saved elsewhere; this window's own saves are already on screen"""
+        if origin is self:
+            return
+        with metrics.timer('apply_store_changes', pair=f"{self.source_lang}-{self.target_lang}"):
+            self.model.apply_store_changes(changes)
+        metrics.set_value('dictionary_rows', len(self.model.words), pair=f"{self.source_lang}-{self.target_lang}")
+
     def refresh_table(self):
         """Refresh table data - can be called from parent"""
+        # Keep pending edits, reloading would otherwise drop them
+        self.save_data()
         self.load_data()
 
+    def import_file(self):
+        """Stream a vocabulary file into this dictionary on a worker thread"""
+        if self.store is None:
+            return
+
+        if self.import_task is not None:
+            QMessageBox.information(self, "Info", "An import is already running.")
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import Vocabulary",
+            "",
+            "Vocabulary Files (*.csv *.tsv *.txt *.jsonl *.ndjson *.json);;All Files (*)"
+        )
+
+        if not file_path:
+            return
+
+        policies = {
+            "Keep the saved meaning": 'keep',
+            "Overwrite with the imported meaning": 'overwrite',
+            "Merge both meanings": 'merge',
+        }
+        choice, ok = QInputDialog.getItem(self, "Import Vocabulary", "Words that are already saved:",
+                                          list(policies), 0, False)
+        if not ok:
+            return
+
+        # Pending edits go in first; imported rows arrive through on_store_changed
+        self.save_data()
+
+        self.import_progress = QProgressDialog("Importing...", "Cancel", 0, 1000, self)
+        self.import_progress.setWindowTitle("Import Vocabulary")
+        self.import_progress.setMinimumDuration(300)
+        self.import_progress.setAutoClose(False)
+
+        self.import_task = ImportTask(file_path, self.store, policies[choice])
+        self.import_task.signals.progress.connect(self.on_import_progress)
+        self.import_task.signals.finished.connect(self.on_import_finished)
+        self.import_progress.canceled.connect(self.import_task.cancel)
+        QThreadPool.globalInstance().start(self.import_task)
+
+    def on_import_progress(self, done, total):
+        if self.import_progress is not None:
+            self.import_progress.setValue(done)
+
+    def on_import_finished(self, status, counts, message):
+        self.import_task = None
+        if self.import_progress is not None:
+            self.import_progress.close()
+            self.import_progress = None
+
+        if status == 'error':
+            QMessageBox.critical(self, "Error", f"Import error: {message}")
+        elif status == 'done':
+            QMessageBox.information(self, "Info",
+                                    f"Imported {counts['rows']} rows: {counts['added']} added, "
+                                    f"{counts['updated']} updated, {counts['unchanged']} unchanged, "
+                                    f"{counts['skipped']} skipped.")
+
+    def translate_missing(self):
+        """Fill empty meanings of the selected rows (or all rows) with one bulk translation"""
+        if not translator_pool.available():
+            QMessageBox.critical(self, "Error", "Translation requires 'deep-translator' or 'googletrans'.\n\nInstall with: pip install deep-translator")
+            return
+
+        if self.translate_task is not None:
+            QMessageBox.information(self, "Info", "A translation is already running.")
+            return
+
+        selected_rows = sorted({self.source_row(index) for index in self.table.selectionModel().selectedIndexes()})
+        rows = selected_rows or range(len(self.model.words))
+        words = [self.model.words[row] for row in rows
+                 if self.model.words[row].strip() and not self.model.meanings[row].strip()]
+        if not words:
+            QMessageBox.information(self, "Info", "No words with a missing meaning!")
+            return
+
+        self.translate_progress = QProgressDialog("Translating...", "Cancel", 0, len(words), self)
+        self.translate_progress.setWindowTitle("Translate Missing")
+        self.translate_progress.setMinimumDuration(300)
+        self.translate_progress.setAutoClose(False)
+
+        self.translate_task = BatchTranslateTask(words, LANGUAGES[self.source_lang]['code'],
+                                                 LANGUAGES[self.target_lang]['code'],
+                                                 getattr(self.parent, 'translation_cache', None))
+        self.translate_task.signals.progress.connect(self.on_translate_progress)
+        self.translate_task.signals.finished.connect(self.on_translate_finished)
+        self.translate_progress.canceled.connect(self.translate_task.cancel)
+        QThreadPool.globalInstance().start(self.translate_task)
+
+    def on_translate_progress(self, done, total):
+        if self.translate_progress is not None:
+            self.translate_progress.setMaximum(total)
+            self.translate_progress.setValue(done)
+
+    def on_translate_finished(self, status, translations, message):
+        self.translate_task = None
+        if self.translate_progress is not None:
+            self.translate_progress.close()
+            self.translate_progress = None
+
+        # Whatever was translated (even before a cancel) goes in with a single save
+        filled = self.model.fill_meanings(translations)
+        self.save_data()
+
+        if status == 'error':
+            QMessageBox.critical(self, "Error", f"Translation error: {message}")
+        elif status == 'done':
+            QMessageBox.information(self, "Info", f"Filled {filled} missing meanings.")
+
     def export_pdf(self):
         if not REPORTLAB_AVAILABLE:
             QMessageBox.critical(self, "Error", "PDF export requires 'reportlab', 'arabic-reshaper', 'python-bidi' libraries.\n\nInstall with: pip install reportlab arabic-reshaper python-bidi")
             return
 
-        try:
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Save as PDF",
-                f"dictionary_{self.source_lang}_{self.target_lang}.pdf",
-                "PDF Files (*.pdf)"
-            )
-
-            if not file_path:
-                return
+        if self.export_task is not None:
+            QMessageBox.information(self, "Info", "A PDF export is already running.")
+            return
 
-            doc = SimpleDocTemplate(file_path, pagesize=A4)
-            elements = []
-            styles = getSampleStyleSheet()
+        if not any(word.strip() or meaning.strip() for word, meaning in self.model.rows()):
+            QMessageBox.information(self, "Info", "No data in table to export to PDF!")
+            return
 
-            # --- Font Selection and Registration ---
-            # Font for source language
-            source_font_path = os.path.join(SCRIPT_DIR, "fonts", LANGUAGES[self.source_lang]['font'])
-            source_font_name = f'Font-{self.source_lang}'
-            if os.path.exists(source_font_path) and source_font_name not in pdfmetrics.getRegisteredFontNames():
-                pdfmetrics.registerFont(TTFont(source_font_name, source_font_path))
-            
-            # Font for target language
-            target_font_path = os.path.join(SCRIPT_DIR, "fonts", LANGUAGES[self.target_lang]['font'])
-            target_font_name = f'Font-{self.target_lang}'
-            if os.path.exists(target_font_path) and target_font_name not in pdfmetrics.getRegisteredFontNames():
-                pdfmetrics.registerFont(TTFont(target_font_name, target_font_path))
-
-            # Fallback font
-            fallback_font_name = 'Helvetica'
-
-            # --- Paragraph Styles ---
-            source_style = styles['Normal'].clone('SourceStyle')
-            source_style.fontName = source_font_name if source_font_name in pdfmetrics.getRegisteredFontNames() else fallback_font_name
-            source_style.alignment = TA_CENTER
-            source_style.fontSize = 12
-            source_style.leading = 15
-
-            target_style = styles['Normal'].clone('TargetStyle')
-            target_style.fontName = target_font_name if target_font_name in pdfmetrics.getRegisteredFontNames() else fallback_font_name
-            target_style.alignment = TA_CENTER
-            target_style.fontSize = 12
-            target_style.leading = 15
-
-            # --- Header Styles ---
-            header_source_style = styles['Heading2'].clone('HeaderSourceStyle')
-            header_source_style.fontName = source_style.fontName
-            header_source_style.alignment = TA_CENTER
-
-            header_target_style = styles['Heading2'].clone('HeaderTargetStyle')
-            header_target_style.fontName = target_style.fontName
-            header_target_style.alignment = TA_CENTER
-
-            table_data = []
-
-            # Add headers with their specific fonts
-            processed_headers = [
-                Paragraph(self.process_text(LANGUAGES[self.source_lang]['name'], self.source_lang), header_source_style),
-                Paragraph(self.process_text(LANGUAGES[self.target_lang]['name'], self.target_lang), header_target_style)
-            ]
-
-            table_data.append(processed_headers)
-
-            # Process table data
-            for row in range(self.table.rowCount()):
-                word_item = self.table.item(row, 0)
-                meaning_item = self.table.item(row, 1)
-
-                if word_item and meaning_item:
-                    word = word_item.text().strip()
-                    meaning = meaning_item.text().strip()
-
-                    if word or meaning:
-                        processed_word = self.process_text(word, self.source_lang)
-                        processed_meaning = self.process_text(meaning, self.target_lang)
-
-                        table_data.append([
-                            Paragraph(processed_word, source_style),
-                            Paragraph(processed_meaning, target_style)
-                        ])
-
-            if len(table_data) <= 1:
-                QMessageBox.information(self, "Info", "No data in table to export to PDF!")
-                return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save as PDF",
+            f"dictionary_{self.source_lang}_{self.target_lang}.pdf",
+            "PDF Files (*.pdf)"
+        )
 
-            # Create and style the table
-            table = Table(table_data, colWidths=[3*inch, 3*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('LINEBELOW', (0, 0), (-1, 0), 2, colors.black),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ]))
-
-            elements.append(table)
-            doc.build(elements)
+        if not file_path:
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"PDF save error: {str(e)}")
-            print(e)
+        # The worker gets its own copy of the row lists (the strings are
+        # shared), so editing can continue while the export runs
+        words = list(self.model.words)
+        meanings = list(self.model.meanings)
 
-    def process_text(self, text, lang_code):
-        """Process text for PDF display, handling RTL and special characters."""
-        if not text:
-            return ""
-        
-        if lang_code == 'AR' or self.is_arabic_text(text):
-            return self.prepare_arabic_text(text)
-        
-        return text
-
-    def is_arabic_text(self, text):
-        for char in text:
-            if '\u0600' <= char <= '\u06FF' or \
-               '\u0750' <= char <= '\u077F' or \
-               '\u08A0' <= char <= '\u08FF' or \
-               '\uFB50' <= char <= '\uFDFF' or \
-               '\uFE70' <= char <= '\uFEFF':
-                return True
-        return False
-
-    def prepare_arabic_text(self, text):
-        reshaper = ArabicReshaper(
-            configuration={
-                'delete_harakat': False,
-                'delete_tatweel': False,
-                'support_ligatures': True,
-                'arabic_reshaper_join_by_shadda': True,
-                'delete_unnecessary_dots': False,
-                'shift_harakat_position': False,
-                'support_vocalized_arabic': True,
-            }
-        )
-        reshaped_text = reshaper.reshape(text)
-        bidi_text = get_display(reshaped_text)
-        return bidi_text
+        self.export_progress = QProgressDialog("Exporting PDF...", "Cancel", 0, len(words), self)
+        self.export_progress.setWindowTitle("Export PDF")
+        self.export_progress.setMinimumDuration(300)
+        self.export_progress.setAutoClose(False)
+
+        self.export_task = PdfExportTask(file_path, self.source_lang, self.target_lang, words, meanings)
+        self.export_task.signals.progress.connect(self.on_export_progress)
+        self.export_task.signals.finished.connect(self.on_export_finished)
+        self.export_progress.canceled.connect(self.export_task.cancel)
+        QThreadPool.globalInstance().start(self.export_task)
+
+    def on_export_progress(self, done, total):
+        if self.export_progress is not None:
+            self.export_progress.setValue(done)
+
+    def on_export_finished(self, status, message):
+        self.export_task = None
+        if self.export_progress is not None:
+            self.export_progress.close()
+            self.export_progress = None
+
+        if status == 'error':
+            QMessageBox.critical(self, "Error", f"PDF save error: {message}")
 
     def closeEvent(self, event):
+        if self.translate_task is not None:
+            self.translate_task.cancel()
+        if self.import_task is not None:
+            self.import_task.cancel()
         self.save_data()
+        if self.store is not None:
+            self.store.unsubscribe(self.store_listener)
         # Notify parent that table window is closing
         if hasattr(self.parent, 'table_window'):
             self.parent.table_window = None
@@ -480,6 +1276,15 @@ class DictionaryApp(QWidget):
         """)
         self.word_entry.textChanged.connect(self.reset_timer)
 
+        # Suggestions come from the saved words of the source language, most
+        # used first; the list is filled by update_completions, not by Qt
+        self.completion_model = QStringListModel(self)
+        self.completer = QCompleter(self.completion_model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setWidget(self.word_entry)
+        self.completer.activated.connect(self.on_completion_activated)
+        self.word_entry.textEdited.connect(self.update_completions)
+
         # --- Translation box ---
         self.translation_entry = QLineEdit(self.content_widget)
         self.translation_entry.setReadOnly(True)
@@ -586,106 +1391,346 @@ class DictionaryApp(QWidget):
         main_layout.addLayout(input_layout2)
         main_layout.addLayout(button_layout1)
 
-        # Timer for debouncing
+        # Translations run on a small worker pool so the widget never blocks on
+        # the network. Every request carries a generation number and results
+        # from older generations are discarded.
+        self.translation_pool = QThreadPool(self)
+        self.translation_pool.setMaxThreadCount(TRANSLATION_WORKERS)
+        self.translation_generation = 0
+
+        # The current word is translated for every configured language pair at
+        # once; prefetched holds the results by (source code, target code) and
+        # prefetch_pending the pairs still on the pool
+        self.prefetch_word = None
+        self.prefetched = {}
+        self.prefetch_pending = set()
+        self.shown_pair = None
+
+        # Persistent translation cache, also keeps known words working offline
+        try:
+            self.translation_cache = TranslationCache(os.path.join(DATA_DIR, "translation_cache.sqlite3"))
+        except sqlite3.Error as e:
+            print(f"Translation cache disabled: {e}")
+            self.translation_cache = None
+
+        # Load the saved dictionaries of the configured languages in the
+        # background, so lookups can be answered from them without waiting
+        QTimer.singleShot(DICTIONARY_PRELOAD_DELAY_MS, self.preload_dictionaries)
+
+        # Outside edits of data/dict_*.json are applied to the loaded
+        # dictionaries as a diff (and reach an open table editor row by row)
+        self.changed_dictionary_files = set()
+        self.dictionary_reload_timer = QTimer(self)
+        self.dictionary_reload_timer.setSingleShot(True)
+        self.dictionary_reload_timer.timeout.connect(self.reload_changed_dictionaries)
+        self.dictionary_watcher = QFileSystemWatcher(self)
+        self.dictionary_watcher.directoryChanged.connect(self.watch_dictionary_files)
+        self.dictionary_watcher.fileChanged.connect(self.on_dictionary_file_changed)
+        if os.path.isdir(DATA_DIR):
+            self.dictionary_watcher.addPath(DATA_DIR)
+        self.watch_dictionary_files()
+
+        # Word completion; the counts and the index are loaded in the background too
+        self.word_frequencies = WordFrequencies(os.path.join(DATA_DIR, "word_frequency.json"))
+        self.completion_indexes = {}  # source language -> PrefixIndex
+        # Changes made while an index is being built, applied once it is done
+        self.completion_pending = {}
+        # Saves, table edits, imports and outside edits of any dictionary
+        # reach the completion index through the stores' notifications
+        self.dictionary_signals = DictionaryChangeSignals()
+        self.dictionary_signals.changed.connect(self.update_completion_index)
+        subscribe_all(self.on_any_store_changed)
+        QTimer.singleShot(COMPLETION_INDEX_DELAY_MS, self.build_completion_index)
+
+        # Register the PDF fonts in the background so the first export is fast.
+        # Started after the first paint, as it imports reportlab.
+        if REPORTLAB_AVAILABLE:
+            QTimer.singleShot(FONT_PREWARM_DELAY_MS,
+                              lambda: font_manager.prewarm(self.source_languages + self.target_languages))
+
+        # Timer for debouncing; its delay follows the typing speed and the
+        # backend latency
+        self.debounce = AdaptiveDebounce()
         self.timer = QTimer(self)
         self.timer.setSingleShot(True)  # Only run once after the timeout
         self.timer.timeout.connect(self.translate_word)
 
     def load_settings(self):
         """Load language settings from file"""
+        start = time.perf_counter()
         default_settings = {
             'source_languages': ['FR', 'EN'],
-            'target_languages': ['AR', 'TR']
+            'target_languages': ['AR', 'TR'],
+            'pivot_lookup': True,
+            'perf_trace': False
         }
 
-        try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    self.source_languages = settings.get('source_languages', default_settings['source_languages'])
-                    self.target_languages = settings.get('target_languages', default_settings['target_languages'])
-            else:
-                self.source_languages = default_settings['source_languages']
-                self.target_languages = default_settings['target_languages']
-                self.save_settings()
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-            self.source_languages = default_settings['source_languages']
-            self.target_languages = default_settings['target_languages']
-
-        # Fix: Initialize settings variable before using it
-        settings = {}
-        if os.path.exists(self.settings_file):
-            try:
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-            except:
-                pass
-
-        self.source_lang_index = settings.get('source_language_index', 0)
-        self.target_lang_index = settings.get('target_language_index', 0)
+        # Read once; save_settings() only updates this copy and the file is written behind
+        self.settings = SettingsFile(self.settings_file, default_settings)
+        self.source_languages = self.settings.get('source_languages')
+        self.target_languages = self.settings.get('target_languages')
+        self.pivot_lookup = self.settings.get('pivot_lookup')
+        self.perf_trace = self.settings.get('perf_trace')
+        # Optional: backend names/URLs or {"backend": ..., "timeout": seconds}, in priority order
+        self.translation_backends = self.settings.get('translation_backends')
+        self.source_lang_index = self.settings.get('source_language_index', 0)
+        self.target_lang_index = self.settings.get('target_language_index', 0)
+        if not self.settings.existed:
+            self.save_settings()
         print(f"Loaded settings: {self.source_languages[self.source_lang_index]}, {self.target_languages[self.target_lang_index]}")
+        if self.perf_trace and not metrics.trace_path:
+            metrics.set_trace(os.path.join(DATA_DIR, PERF_TRACE_FILE))
+        # The environment variable wins over the settings file
+        if self.translation_backends is not None and not os.environ.get(BACKENDS_ENV):
+            try:
+                translator_pool.configure(self.translation_backends)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Invalid translation_backends setting, keeping {', '.join(TRANSLATION_BACKENDS)}: {e}")
+        metrics.record('load_settings', time.perf_counter() - start)
 
     def save_settings(self):
-        """Save language settings to file"""
-        try:
-            settings = {
-                'source_languages': self.source_languages,
-                'target_languages': self.target_languages,
-                'source_language_index': self.source_lang_index,
-                'target_language_index': self.target_lang_index
-            }
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
-        print(f"Saved settings: {self.source_languages[self.source_lang_index]}, {self.target_languages[self.target_lang_index]}")
+        """Save language settings (written to the file in the background)"""
+        settings = {
+            'source_languages': list(self.source_languages),
+            'target_languages': list(self.target_languages),
+            'pivot_lookup': self.pivot_lookup,
+            'perf_trace': self.perf_trace,
+            'source_language_index': self.source_lang_index,
+            'target_language_index': self.target_lang_index
+        }
+        if self.translation_backends is not None:
+            settings['translation_backends'] = self.translation_backends
+        if self.settings.update(settings):
+            print(f"Saved settings: {self.source_languages[self.source_lang_index]}, {self.target_languages[self.target_lang_index]}")
 
     def reset_timer(self):
         """Reset the timer every time the user types a new character"""
-        self.timer.start(500)  # Start the timer again with a 500ms delay
+        # Any request still in flight is for text the user has already changed
+        self.cancel_prefetch()
+        self.debounce.keystroke()
+
+        # Words known locally are shown without waiting for the debounce; the
+        # timer still fires to prefetch the other language pairs
+        word = self.word_entry.text().strip()
+        if word:
+            local = self.local_translation(word, self.source_languages[self.source_lang_index],
+                                           self.target_languages[self.target_lang_index])
+            if local is not None:
+                self.translation_entry.setText(local)
+        self.timer.start(self.debounce.delay_ms(translation_latency.value))
+
+    def preload_dictionaries(self):
+        """Load the dictionaries between configured languages on a background thread"""
+        languages = set(self.source_languages + self.target_languages)
+        pairs = [pair for pair in dictionary_pairs() if set(pair) <= languages]
+
+        def load():
+            for source_lang, target_lang in pairs:
+                try:
+                    get_dictionary_store(source_lang, target_lang)
+                except Exception as e:
+                    print(f"Error loading dictionary {source_lang}-{target_lang}: {e}")
+
+        threading.Thread(target=load, daemon=True).start()
+
+    def watch_dictionary_files(self, directory=None):
+        """Watch every dict_*.json in the data directory (files replaced by a rename drop out)"""
+        if not os.path.isdir(DATA_DIR):
+            return
+        watched = set(self.dictionary_watcher.files())
+        paths = [os.path.join(DATA_DIR, name) for name in os.listdir(DATA_DIR)
+                 if name.endswith(".json") and DICTIONARY_FILE_RE.match(name)]
+        missing = [path for path in paths if path not in watched]
+        if missing:
+            self.dictionary_watcher.addPaths(missing)
+
+    def on_dictionary_file_changed(self, path):
+        self.changed_dictionary_files.add(path)
+        self.dictionary_reload_timer.start(DICTIONARY_RELOAD_DELAY_MS)
+
+    def reload_changed_dictionaries(self):
+        """Apply outside edits to the loaded dictionaries; the app's own writes are skipped"""
+        paths, self.changed_dictionary_files = self.changed_dictionary_files, set()
+        for path in paths:
+            match = DICTIONARY_FILE_RE.match(os.path.basename(path))
+            store = loaded_dictionary_store(*match.groups()) if match else None
+            if store is None:
+                continue
+            try:
+                changed = store.reload_if_changed()
+            except (OSError, ValueError) as e:
+                print(f"Error reloading {path}: {e}")
+                continue
+            if changed:
+                print(f"Applied {changed} outside changes from {path}")
+        self.watch_dictionary_files()
+
+    def build_completion_index(self):
+        """Start building the completion index for the current source language"""
+        lang = self.source_languages[self.source_lang_index]
+        if lang in self.completion_indexes:
+            return
+        # Marks the build as started; completion stays off until it is done
+        self.completion_indexes[lang] = None
+        self.completion_pending[lang] = []
+        task = CompletionIndexTask(lang, self.word_frequencies)
+        task.signals.finished.connect(self.on_completion_index_built)
+        QThreadPool.globalInstance().start(task)
+
+    def on_completion_index_built(self, lang, index):
+        pending = self.completion_pending.pop(lang, [])
+        if index is None:
+            # Try again on the next language switch
+            self.completion_indexes.pop(lang, None)
+        else:
+            self.completion_indexes[lang] = index
+            self.apply_completion_changes(lang, pending)
+
+    def on_any_store_changed(self, store, changes, origin):
+        """Runs on the thread that changed a dictionary; hands the change to the GUI thread"""
+        self.dictionary_signals.changed.emit(store.source_lang, changes)
+
+    def update_completion_index(self, lang, changes):
+        """Keep the completion index of a source language in step with its dictionaries"""
+        if lang not in self.completion_indexes:
+            return
+        if self.completion_indexes[lang] is None:
+            # The build may have read the dictionaries before this change
+            self.completion_pending[lang].extend(changes)
+            return
+        self.apply_completion_changes(lang, changes)
+
+    def apply_completion_changes(self, lang, changes):
+        index = self.completion_indexes[lang]
+        stores = [loaded_dictionary_store(*pair) for pair in dictionary_pairs() if pair[0] == lang]
+        for key, entry in changes:
+            if entry is not None:
+                index.add(entry['word'])
+            elif not any(store is not None and store.get(key) is not None for store in stores):
+                # Deleted, and no other dictionary of the language has it
+                index.remove(key)
+
+    def update_completions(self, text):
+        """Offer the saved words starting with what the user typed"""
+        index = self.completion_indexes.get(self.source_languages[self.source_lang_index])
+        words = index.complete(text) if index is not None else []
+        if not words or (len(words) == 1 and words[0].lower() == text.strip().lower()):
+            self.completer.popup().hide()
+            return
+        self.completion_model.setStringList(words)
+        self.completer.complete()
+
+    def on_completion_activated(self, word):
+        """Show a picked suggestion right away; it is saved, so no network call is needed"""
+        self.word_entry.setText(word)
+        self.timer.stop()
+        self.translate_word()
+
+    def cancel_prefetch(self):
+        """Forget the current word: drop queued lookups and ignore running ones"""
+        self.translation_generation += 1
+        self.translation_pool.clear()
+        self.prefetch_word = None
+        self.prefetched = {}
+        self.prefetch_pending = set()
+
+    def local_translation(self, word, source_lang, target_lang):
+        """Translation from the loaded dictionaries or the translation cache, or None.
+
+        The cache is only peeked at: this runs on the GUI thread, so it makes
+        no write, and partial words typed so far do not count as misses.
+        """
+        saved = lookup_saved(word, source_lang, target_lang, self.pivot_lookup, loaded_only=True)
+        if saved is not None:
+            return saved[0]
+        if self.translation_cache is not None:
+            return self.translation_cache.peek(LANGUAGES[source_lang]['code'], LANGUAGES[target_lang]['code'], word)
+        return None
+
+    def prefetch(self, word):
+        """Translate word for every configured language pair, the one on screen first"""
+        self.cancel_prefetch()
+        self.prefetch_word = word
+        current = (self.source_languages[self.source_lang_index],
+                   self.target_languages[self.target_lang_index])
+        pairs = [current] + [(source_lang, target_lang)
+                             for source_lang in self.source_languages
+                             for target_lang in self.target_languages
+                             if source_lang != target_lang and (source_lang, target_lang) != current]
+        for source_lang, target_lang in pairs:
+            pair = (LANGUAGES[source_lang]['code'], LANGUAGES[target_lang]['code'])
+            # Saved words are answered without a round-trip; the worker below
+            # also checks the dictionaries not loaded yet
+            saved = lookup_saved(word, source_lang, target_lang, self.pivot_lookup, loaded_only=True)
+            if saved is not None:
+                self.prefetched[pair] = saved[0]
+                continue
+            if self.translation_cache is not None:
+                # Shown at once; the worker's cache lookup counts the hit
+                cached = self.translation_cache.peek(pair[0], pair[1], word)
+                if cached is not None:
+                    self.prefetched[pair] = cached
+            if not translator_pool.available():
+                continue
+
+            task = TranslationTask(self.translation_generation, word, pair[0], pair[1],
+                                   self.translation_cache, (source_lang, target_lang, self.pivot_lookup))
+            task.signals.finished.connect(self.on_translation_finished)
+            self.prefetch_pending.add(pair)
+            # The pair on screen goes ahead of the prefetches queued before it
+            self.translation_pool.start(task, 1 if (source_lang, target_lang) == current else 0)
 
     def translate_word(self):
-        """Function to translate the word"""
-        if not TRANSLATOR_AVAILABLE:
-            self.translation_entry.setText("Translator not available")
+        """Show the translation of the current word, prefetching the other pairs"""
+        word = self.word_entry.text().strip()
+        if word == "":
+            self.cancel_prefetch()
+            self.translation_entry.clear()
             return
-            
-        if self.word_entry.text().strip() == "":
+
+        source_lang = self.source_languages[self.source_lang_index]
+        target_lang = self.target_languages[self.target_lang_index]
+        self.shown_pair = (LANGUAGES[source_lang]['code'], LANGUAGES[target_lang]['code'])
+
+        if word != self.prefetch_word:
+            self.word_frequencies.bump(source_lang, word)
+            self.prefetch(word)
+        elif self.shown_pair not in self.prefetched and self.shown_pair not in self.prefetch_pending:
+            # Same word on a pair the prefetch left out (changed settings)
+            self.prefetch(word)
+
+        if self.shown_pair in self.prefetched:
+            self.translation_entry.setText(self.prefetched[self.shown_pair])
+        elif self.shown_pair in self.prefetch_pending:
+            # The result is shown by on_translation_finished
             self.translation_entry.clear()
+        elif not translator_pool.available():
+            # Only the dictionaries already loaded; loading one here would block the window
+            saved = lookup_saved(word, source_lang, target_lang, self.pivot_lookup, loaded_only=True)
+            self.translation_entry.setText(saved[0] if saved is not None else "Translator not available")
+
+    def on_translation_finished(self, generation, translation, error, pair):
+        """Keep a translation result for the current word and show it if its pair is on screen"""
+        if generation != self.translation_generation:
             return
 
-        word = self.word_entry.text().strip()
-        source_code = LANGUAGES[self.source_languages[self.source_lang_index]]['code']
-        target_code = LANGUAGES[self.target_languages[self.target_lang_index]]['code']
+        self.prefetch_pending.discard(pair)
+        if not error:
+            self.prefetched[pair] = translation
+        if pair != self.shown_pair:
+            return
 
-        try:
-            if TRANSLATOR_TYPE == "deep_translator":
-                # Using deep-translator (recommended)
-                translator = GoogleTranslator(source=source_code, target=target_code)
-                translation = translator.translate(word)
-            else:
-                # Using old googletrans (fallback)
-                temp_translator = Translator()
-                result = temp_translator.translate(word, src=source_code, dest=target_code)
-                if hasattr(result, 'text'):
-                    translation = result.text
-                else:
-                    translation = str(result)
-            
-            if translation and translation.strip():
-                self.translation_entry.setText(translation.strip())
-            else:
-                raise Exception("Empty translation result")
-                
-        except Exception as e:
-            print(f"Translation error: {e}")
+        if error:
+            print(f"Translation error: {error}")
             self.translation_entry.setText("Translation error")
+        else:
+            self.translation_entry.setText(translation)
 
     def toggle_source_language(self):
         """Toggle source language"""
         self.source_lang_index = (self.source_lang_index + 1) % len(self.source_languages)
         self.source_lang_button.setText(self.source_languages[self.source_lang_index])
+        self.build_completion_index()
         self.translate_word()
 
     def toggle_target_language(self):
@@ -698,7 +1743,8 @@ class DictionaryApp(QWidget):
         """Open language settings dialog"""
         current_settings = {
             'source_languages': self.source_languages,
-            'target_languages': self.target_languages
+            'target_languages': self.target_languages,
+            'pivot_lookup': self.pivot_lookup
         }
         
         dialog = LanguageSettingsDialog(self, current_settings)
@@ -709,8 +1755,15 @@ class DictionaryApp(QWidget):
                 QMessageBox.warning(self, "Warning", "Please select at least one language for each button.")
                 return
             
+            if source_langs != self.source_languages or target_langs != self.target_languages:
+                translator_pool.clear()
+                if REPORTLAB_AVAILABLE:
+                    font_manager.prewarm(source_langs + target_langs)
+
             self.source_languages = source_langs
             self.target_languages = target_langs
+            self.pivot_lookup = dialog.get_pivot_lookup()
+            self.preload_dictionaries()
             
             # Reset indices if current selection is out of bounds
             if self.source_lang_index >= len(self.source_languages):
@@ -723,6 +1776,9 @@ class DictionaryApp(QWidget):
             self.target_lang_button.setText(self.target_languages[self.target_lang_index])
             
             self.save_settings()
+            self.build_completion_index()
+            # The language pairs (or the pivot setting) may have changed
+            self.cancel_prefetch()
             self.translate_word()
 
     def toggle_title_bar(self):
@@ -766,50 +1822,17 @@ class DictionaryApp(QWidget):
         source_lang = self.source_languages[self.source_lang_index]
         target_lang = self.target_languages[self.target_lang_index]
         
-        # Use relative path for JSON file
-        json_file = os.path.join(DATA_DIR, f"dict_{source_lang}_{target_lang}.json")
-        
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(json_file), exist_ok=True)
-            
-            # Load existing data
-            data = []
-            if os.path.exists(json_file):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                except (json.JSONDecodeError, Exception) as e:
-                    print(f"Error reading JSON file: {e}")
-                    # If file is corrupted, start with empty data
-                    data = []
-            
-            # Add new data
-            new_entry = {
-                'word': word,
-                'meaning': translation
-            }
-            
-            # Check if word already exists
-            word_exists = False
-            for i, entry in enumerate(data):
-                if entry.get('word', '').lower() == word.lower():
-                    data[i] = new_entry  # Update
-                    word_exists = True
-                    break
-            
-            if not word_exists:
-                data.append(new_entry)  # Add new
-            
-            # Save to file with proper error handling
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with metrics.timer('save_to_json', pair=f"{source_lang}-{target_lang}"):
+                store = get_dictionary_store(source_lang, target_lang)
+                store.upsert(word, translation)
+            metrics.set_value('dictionary_bytes', store.size_on_disk(), pair=f"{source_lang}-{target_lang}")
             
             print(f"Word saved successfully: {word} -> {translation}")
-            
-            # Refresh table if it's open
-            if self.table_window and self.table_window.isVisible():
-                self.table_window.refresh_table()
+
+            self.word_frequencies.bump(source_lang, word, WordFrequencies.SAVE_WEIGHT)
+            # An open table editor and the completion index get the row from
+            # the store's change notification
             
         except Exception as e:
             print(f"JSON save error: {e}")
@@ -836,8 +1859,13 @@ class DictionaryApp(QWidget):
     def closeEvent(self, event):
         """Override the close event to hide the window instead of quitting the application"""
         self.save_settings()
+        if self.translation_cache is not None:
+            print(f"Translation cache: {self.translation_cache.stats()}")
         if self.table_window:
             self.table_window.close()
+        close_dictionary_stores()
+        # Final flush of the settings, word frequencies and anything else written behind
+        write_behind.flush()
         # Hide the window instead of closing it
         event.accept()
         self.hide()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wordpocket import config, storage
+from wordpocket.state import write_behind
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """An empty DATA_DIR with no dictionary stores loaded"""
+    monkeypatch.setattr(config, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(storage, '_dictionary_stores', {})
+    monkeypatch.setattr(storage, '_loading_stores', {})
+    monkeypatch.setattr(storage, '_all_stores_listeners', [])
+    monkeypatch.setattr(storage, '_pairs_scan', (None, None, ()))
+    yield str(tmp_path)
+    # Nothing may be left for the shared writer once the directory is gone
+    write_behind.flush()
@@ -0,0 +1,74 @@
+import pytest
+
+from wordpocket.backends import (BackendChain, BackendUnavailable, CircuitBreaker, TranslationBackend,
+                                 TranslationError)
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class Backend(TranslationBackend):
+    def __init__(self, name, answer=None, error=None):
+        super().__init__()
+        self.name = name
+        self.answer = answer
+        self.error = error
+        self.calls = 0
+
+    def translate(self, text, source_code, target_code):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.answer
+
+def test_breaker_opens_after_failures_and_half_opens_after_cooldown():
+    clock = Clock()
+    breaker = CircuitBreaker(failures=3, cooldown=30, clock=clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state() == 'open'
+    assert not breaker.allow()
+
+    clock.now = 31
+    assert breaker.state() == 'half-open'
+    assert breaker.allow()
+    # Only one trial at a time
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state() == 'open'
+
+    clock.now = 62
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state() == 'closed'
+
+def test_chain_falls_back_and_skips_an_open_backend():
+    down = Backend("down", error=TimeoutError())
+    up = Backend("up", answer=" merhaba ")
+    chain = BackendChain([down, up], failures=2, cooldown=30)
+    for _ in range(3):
+        assert chain.translate("hello", 'en', 'tr') == "merhaba"
+    assert down.calls == 2
+    assert up.calls == 3
+    assert [state for _, state, _ in chain.status()] == ['open', 'closed']
+
+def test_empty_answer_tries_the_next_backend_without_tripping():
+    empty = Backend("empty", answer="  ")
+    up = Backend("up", answer="merhaba")
+    chain = BackendChain([empty, up], failures=1)
+    assert chain.translate("hello", 'en', 'tr') == "merhaba"
+    assert chain.status()[0][1] == 'closed'
+
+def test_all_backends_failing_or_skipped():
+    chain = BackendChain([Backend("down", error=ConnectionError("refused"))], failures=1)
+    with pytest.raises(TranslationError) as failed:
+        chain.translate("hello", 'en', 'tr')
+    assert not isinstance(failed.value, BackendUnavailable)
+    with pytest.raises(BackendUnavailable):
+        chain.translate("hello", 'en', 'tr')
+    with pytest.raises(BackendUnavailable):
+        BackendChain([]).translate("hello", 'en', 'tr')
@@ -0,0 +1,46 @@
+from wordpocket import completion
+from wordpocket.completion import PrefixIndex, WordFrequencies
+from wordpocket.state import WriteBehind
+
+def test_complete_ranks_used_words_first():
+    index = PrefixIndex(['apple', 'Apricot', 'apply', 'banana', 'apt'], {'apt': 2, 'apply': 5, 'banana': 9})
+    assert index.complete('ap') == ['apply', 'apt', 'apple', 'Apricot']
+    assert index.complete('AP', limit=1) == ['apply']
+    assert index.complete('') == []
+
+def test_words_counted_later_are_ranked():
+    counts = {}
+    index = PrefixIndex(['apple', 'apply', 'apt'], counts)
+    assert index.complete('ap') == ['apple', 'apply', 'apt']
+    counts['apt'] = 1
+    assert index.complete('ap') == ['apt', 'apple', 'apply']
+    counts['apply'] = 2
+    counts['banana'] = 5
+    assert index.complete('ap') == ['apply', 'apt', 'apple']
+
+def test_add_and_remove_keep_the_index_sorted():
+    index = PrefixIndex(['b'])
+    index.add('a')
+    index.add('A')
+    index.add('c')
+    assert len(index) == 3
+    index.remove('B ')
+    index.remove('missing')
+    assert index.complete('a') == ['a']
+    assert len(index) == 2
+
+def test_failed_save_is_written_on_the_next_flush(tmp_path, monkeypatch):
+    writer = WriteBehind(delay=60)
+    monkeypatch.setattr(completion, 'write_behind', writer)
+    frequencies = WordFrequencies(str(tmp_path / "word_frequency.json"))
+    frequencies.load()
+    frequencies.bump('EN', 'hello')
+    frequencies.counts('EN')['bad'] = {1}
+    writer.flush()
+    assert writer.pending() == [frequencies.path]
+    del frequencies.counts('EN')['bad']
+    writer.flush()
+    assert writer.pending() == []
+    reread = WordFrequencies(frequencies.path)
+    reread.load()
+    assert reread.counts('EN') == {'hello': 1}
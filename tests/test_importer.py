@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from wordpocket.importer import ImportCancelled, import_vocabulary
+from wordpocket.storage import DictionaryStore
+
+def entries(store):
+    return [(entry['word'], entry['meaning']) for entry in store.iter_entries()]
+
+def test_null_words_are_skipped(data_dir, tmp_path):
+    path = tmp_path / "words.jsonl"
+    rows = [{'word': None, 'meaning': 'x'}, [None, 'y'], {'word': 'cat', 'meaning': None}]
+    path.write_text("\n".join(json.dumps(row) for row in rows), encoding='utf-8')
+    store = DictionaryStore('EN', 'TR')
+    counts = import_vocabulary(str(path), store)
+    assert counts == {'rows': 3, 'added': 1, 'updated': 0, 'unchanged': 0, 'skipped': 2}
+    assert entries(store) == [('cat', '')]
+
+def test_cancel_keeps_the_batches_imported_so_far(data_dir, tmp_path):
+    path = tmp_path / "words.tsv"
+    path.write_text("".join(f"w{i}\tm{i}\n" for i in range(10)), encoding='utf-8')
+    store = DictionaryStore('EN', 'TR')
+    batches = []
+    with pytest.raises(ImportCancelled):
+        import_vocabulary(str(path), store, progress=lambda done, total: batches.append(done),
+                          is_cancelled=lambda: len(batches) == 2, batch_rows=3)
+    assert len(store) == 6
+
+def test_cancel_after_the_last_batch_is_a_finished_import(data_dir, tmp_path):
+    path = tmp_path / "words.tsv"
+    path.write_text("".join(f"w{i}\tm{i}\n" for i in range(6)), encoding='utf-8')
+    store = DictionaryStore('EN', 'TR')
+    batches = []
+    counts = import_vocabulary(str(path), store, progress=lambda done, total: batches.append(done),
+                               is_cancelled=lambda: len(batches) == 2, batch_rows=3)
+    assert counts['added'] == 6
+    assert len(store) == 6
@@ -0,0 +1,66 @@
+import json
+import threading
+import time
+
+from wordpocket.state import SettingsFile, WriteBehind
+
+def test_coalesces_marks_into_one_write():
+    writer = WriteBehind(delay=0.05)
+    writes = []
+    for _ in range(10):
+        writer.mark_dirty('a', lambda: writes.append('a'))
+    writer.flush()
+    assert writes == ['a']
+    assert writer.pending() == []
+
+def test_failed_flush_is_retried_and_others_still_written():
+    writer = WriteBehind(delay=0.02)
+    attempts = []
+    written = []
+
+    def failing():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TypeError("Object of type set is not JSON serializable")
+        written.append('bad')
+
+    writer.mark_dirty('bad', failing)
+    writer.mark_dirty('good', lambda: written.append('good'))
+    deadline = time.monotonic() + 5
+    while 'bad' not in written and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert written == ['good', 'bad']
+    assert len(attempts) == 3
+    assert writer.pending() == []
+
+    # The writer thread survived the failures
+    assert writer._thread.is_alive()
+    done = threading.Event()
+    writer.mark_dirty('later', done.set)
+    assert done.wait(5)
+
+def test_os_error_keeps_the_key_dirty():
+    writer = WriteBehind(delay=60)
+
+    def failing():
+        raise OSError("disk full")
+
+    writer.mark_dirty('a', failing)
+    writer.flush()
+    assert writer.pending() == ['a']
+
+def test_settings_file_is_read_once_and_written_behind(tmp_path, monkeypatch):
+    from wordpocket import state
+    writer = WriteBehind(delay=60)
+    monkeypatch.setattr(state, 'write_behind', writer)
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({'a': 1}), encoding='utf-8')
+
+    settings = SettingsFile(str(path), {'a': 0, 'b': 2})
+    assert settings.get('a') == 1 and settings.get('b') == 2
+    assert settings.update({'a': 1}) is False
+    assert writer.pending() == []
+    assert settings.update({'a': 3}) is True
+    assert json.loads(path.read_text(encoding='utf-8')) == {'a': 1}
+    writer.flush()
+    assert json.loads(path.read_text(encoding='utf-8')) == {'a': 3, 'b': 2}
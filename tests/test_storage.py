@@ -0,0 +1,245 @@
+import json
+import os
+
+import pytest
+
+from wordpocket import storage
+from wordpocket.storage import DictionaryStore, write_entries_atomic
+
+def entries(store):
+    return [(entry['word'], entry['meaning']) for entry in store.iter_entries()]
+
+def reloaded(store):
+    """A fresh store for the same pair, loaded from what store has written"""
+    store.flush()
+    store.close()
+    return DictionaryStore(store.source_lang, store.target_lang)
+
+def write_snapshot(data_dir, data, name="dict_EN_TR.json"):
+    with open(os.path.join(data_dir, name), 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+def test_put_get_is_case_insensitive(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    assert store.upsert('Hello', 'merhaba') is True
+    assert store.upsert('hello', 'selam') is False
+    assert store.get('HELLO') == {'word': 'hello', 'meaning': 'selam'}
+    assert len(store) == 1
+
+def test_round_trip_through_journal(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    store.upsert('one', '1')
+    store.upsert('two', '2')
+    store.apply_changes(['one'], [(None, 'three', '3')])
+    store.apply_changes([], [('two', 'Zwei', 'iki')])
+    assert entries(store) == [('Zwei', 'iki'), ('three', '3')]
+    assert entries(reloaded(store)) == [('Zwei', 'iki'), ('three', '3')]
+
+def test_delete_keeps_the_order_of_the_other_rows(data_dir):
+    write_entries_atomic(os.path.join(data_dir, "dict_EN_TR.json"),
+                         [f"w{i}" for i in range(10)], [f"m{i}" for i in range(10)])
+    store = DictionaryStore('EN', 'TR')
+    store.apply_changes(['w2', 'w5'], [])
+    expected = [(f"w{i}", f"m{i}") for i in range(10) if i not in (2, 5)]
+    assert len(store) == 8
+    assert store.get('w2') is None
+    assert entries(store) == expected
+    words, meanings, index = store.snapshot()
+    assert list(zip(words, meanings)) == expected
+    assert all(words[row].lower() == key for key, row in index.items())
+    assert entries(reloaded(store)) == expected
+
+def test_delete_then_put_again(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    for i in range(5):
+        store.upsert(f"w{i}", "old")
+    for _ in range(3):
+        store.apply_changes(['w1', 'w3'], [])
+        store.apply_changes([], [(None, 'w1', 'new'), (None, 'w3', 'new')])
+    expected = [('w0', 'old'), ('w2', 'old'), ('w4', 'old'), ('w1', 'new'), ('w3', 'new')]
+    assert entries(store) == expected
+    assert entries(reloaded(store)) == expected
+
+def test_deleting_everything(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    store.upsert('a', '1')
+    store.apply_changes(['a'], [])
+    assert len(store) == 0
+    assert entries(store) == []
+    assert entries(reloaded(store)) == []
+
+def test_rename_keeps_position_and_merges_into_an_existing_word(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    for word in ('a', 'b', 'c'):
+        store.upsert(word, word.upper())
+    store.apply_changes([], [('b', 'bee', 'BEE')])
+    assert entries(store) == [('a', 'A'), ('bee', 'BEE'), ('c', 'C')]
+    store.apply_changes([], [('bee', 'C', 'merged')])
+    assert entries(store) == [('a', 'A'), ('C', 'merged')]
+    assert entries(reloaded(store)) == [('a', 'A'), ('C', 'merged')]
+
+def test_unchanged_delta_writes_nothing(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    store.upsert('a', '1')
+    assert store.apply_changes([], [('a', 'a', '1')]) == 0
+
+def test_compact_folds_the_journal_into_the_snapshot(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    for i in range(20):
+        store.upsert(f"w{i}", str(i))
+    store.apply_changes([f"w{i}" for i in range(0, 20, 2)], [])
+    expected = [(f"w{i}", str(i)) for i in range(1, 20, 2)]
+    store.compact()
+    with open(store.json_file, encoding='utf-8') as f:
+        assert [(entry['word'], entry['meaning']) for entry in json.load(f)] == expected
+    assert os.path.getsize(store.journal_file) == 0
+    assert not os.path.exists(store.compacting_file)
+    assert entries(reloaded(store)) == expected
+
+def test_interrupted_compaction_is_replayed(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    store.upsert('a', '1')
+    store.flush()
+    store.close()
+    # The journal was moved aside, but the new snapshot was never written
+    os.replace(store.journal_file, store.compacting_file)
+    assert entries(DictionaryStore('EN', 'TR')) == [('a', '1')]
+
+def test_torn_journal_line_is_skipped(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    store.upsert('a', '1')
+    store.flush()
+    store.close()
+    with open(store.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"op": "put", "word": "b", "mea')
+    assert entries(DictionaryStore('EN', 'TR')) == [('a', '1')]
+
+def test_snapshot_file_matches_json_dump(data_dir, tmp_path):
+    words = ['a', 'ç "q"', 'اب']
+    meanings = ['1', '\\n', '']
+    path = str(tmp_path / "out.json")
+    write_entries_atomic(path, words, meanings)
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    assert text == json.dumps([{'word': w, 'meaning': m} for w, m in zip(words, meanings)],
+                              ensure_ascii=False, indent=2)
+    write_entries_atomic(path, [], [])
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == "[]"
+
+def test_duplicate_words_in_old_files_are_merged(data_dir):
+    write_snapshot(data_dir, [{'word': 'A', 'meaning': 'first'}, {'word': 'a', 'meaning': 'second'},
+                              {'word': 'b', 'meaning': 'x'}])
+    store = DictionaryStore('EN', 'TR')
+    assert entries(store) == [('A', 'first'), ('b', 'x')]
+    with open(store.json_file, encoding='utf-8') as f:
+        assert len(json.load(f)) == 2
+
+def test_opening_an_empty_pair_leaves_no_files(data_dir):
+    storage.get_dictionary_store('EN', 'TR')
+    assert os.listdir(data_dir) == []
+    assert storage.dictionary_pairs() == []
+
+def test_import_policies(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    store.upsert('cat', 'kedi')
+    assert store.import_entries([('Cat', 'pisi'), ('dog', 'köpek')], 'keep') == (1, 0, 1)
+    assert store.get('cat')['meaning'] == 'kedi'
+    assert store.import_entries([('cat', 'pisi, kedi')], 'merge') == (0, 1, 0)
+    assert store.get('cat')['meaning'] == 'kedi, pisi'
+    assert store.import_entries([('cat', 'mırnav')], 'overwrite') == (0, 1, 0)
+    assert store.get('cat')['meaning'] == 'mırnav'
+    with pytest.raises(ValueError):
+        store.import_entries([], 'replace')
+
+def test_listeners_see_changes_and_origin(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    store.upsert('a', '1')
+    seen = []
+    store.subscribe(lambda changes, origin: seen.append((sorted(changes, key=str), origin)))
+    store.apply_changes(['a'], [(None, 'b', '2')], origin='editor')
+    assert seen == [([('a', None), ('b', {'word': 'b', 'meaning': '2'})], 'editor')]
+
+def test_reload_applies_an_outside_edit(data_dir):
+    write_snapshot(data_dir, [{'word': 'a', 'meaning': '1'}, {'word': 'b', 'meaning': '2'}])
+    store = DictionaryStore('EN', 'TR')
+    store.upsert('c', '3')
+    seen = []
+    store.subscribe(lambda changes, origin: seen.extend(changes))
+    write_snapshot(data_dir, [{'word': 'a', 'meaning': 'one'}, {'word': 'd', 'meaning': '4'}])
+    os.utime(store.json_file, ns=(1, 1))
+    # b deleted, a changed, d added; c is still in the journal
+    assert store.reload_if_changed() == 3
+    assert sorted(entries(store)) == [('a', 'one'), ('c', '3'), ('d', '4')]
+    assert sorted(key for key, _ in seen) == ['a', 'b', 'd']
+    assert store.reload_if_changed() == 0
+
+@pytest.mark.parametrize('content', ['[1, 2]', '{"word": "x"}', '[{"word": {"x": 1}}]', '[["a", "b"]]'])
+def test_malformed_snapshot_raises_value_error(data_dir, content):
+    write_snapshot(data_dir, [{'word': 'a', 'meaning': '1'}])
+    store = DictionaryStore('EN', 'TR')
+    with open(store.json_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.utime(store.json_file, ns=(1, 1))
+    with pytest.raises(ValueError):
+        store.reload_if_changed()
+    with pytest.raises(ValueError):
+        DictionaryStore('EN', 'TR')
+    assert entries(store) == [('a', '1')]
+
+def test_search_index_follows_changes(data_dir):
+    store = DictionaryStore('EN', 'TR')
+    store.upsert('apple', 'elma')
+    assert store.search('elm') == {'apple'}
+    store.apply_changes(['apple'], [(None, 'pear', 'armut')])
+    assert store.search('elm') == set()
+    assert store.search('armu') == {'pear'}
+
+def test_concurrent_callers_share_one_store(data_dir):
+    import threading
+    write_snapshot(data_dir, [{'word': f"w{i}", 'meaning': ''} for i in range(20000)])
+    stores = []
+    threads = [threading.Thread(target=lambda: stores.append(storage.get_dictionary_store('EN', 'TR')))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(stores) == 4 and all(store is stores[0] for store in stores)
+    assert storage.loaded_dictionary_store('EN', 'TR') is stores[0]
+
+def test_reads_during_deletes_never_see_another_row(data_dir):
+    import sys
+    import threading
+    store = DictionaryStore('EN', 'TR')
+    store.import_entries([(f"w{i}", f"m{i}") for i in range(20000)])
+    done = threading.Event()
+    wrong = []
+
+    def read():
+        while not done.is_set():
+            for i in range(0, 20000, 3):
+                try:
+                    entry = store.get(f"w{i}")
+                except IndexError as e:
+                    wrong.append(e)
+                    continue
+                if entry is not None and entry['meaning'] != f"m{i}":
+                    wrong.append(entry)
+
+    # Switch threads often enough to land inside a hole closing
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        # Holes are closed once they outnumber the entries
+        for i in range(20000):
+            if i % 4:
+                store.apply_changes([f"w{i}"], [])
+    finally:
+        done.set()
+        reader.join()
+        sys.setswitchinterval(interval)
+    assert wrong == []
+    assert [entry['word'] for entry in store.iter_entries()] == [f"w{i}" for i in range(0, 20000, 4)]
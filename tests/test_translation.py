@@ -0,0 +1,69 @@
+import threading
+
+from wordpocket import translation
+from wordpocket.translation import SingleFlight, TranslationCache
+
+def test_cache_get_counts_and_peek_does_not(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.sqlite3"))
+    cache.put('en', 'tr', 'Hello', 'merhaba')
+    assert cache.peek('en', 'tr', ' hello ') == 'merhaba'
+    assert cache.peek('en', 'tr', 'hel') is None
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert cache.get('en', 'tr', 'hello') == 'merhaba'
+    assert cache.get('en', 'tr', 'hel') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.put('en', 'tr', 'a', '1')
+    cache.put('en', 'tr', 'b', '2')
+    cache.get('en', 'tr', 'a')
+    cache.put('en', 'tr', 'c', '3')
+    assert cache.peek('en', 'tr', 'b') is None
+    assert cache.peek('en', 'tr', 'a') == '1'
+    assert cache.stats()['evictions'] == 1
+    cache.close()
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow(value):
+        calls.append(value)
+        started.set()
+        release.wait(5)
+        return value * 2
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.run('k', slow, 21)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.run('k', slow, 21)))
+    follower.start()
+    while flight.coalesced == 0:
+        pass
+    release.set()
+    leader.join()
+    follower.join()
+    assert results == [42, 42]
+    assert calls == [21]
+
+def test_translate_many_skips_cached_and_duplicate_words(tmp_path, monkeypatch):
+    batches = []
+
+    class Chain:
+        def translate_batch(self, words, source_code, target_code):
+            batches.append(list(words))
+            return [f"{word}!" for word in words]
+
+    monkeypatch.setattr(translation, 'translator_pool', Chain())
+    cache = TranslationCache(str(tmp_path / "cache.sqlite3"))
+    cache.put('en', 'tr', 'known', 'bilinen')
+    results = translation.translate_many(['known', 'a', 'A ', 'b'], 'en', 'tr', cache, batch_size=10)
+    assert results == {'known': 'bilinen', 'a': 'a!', 'b': 'b!'}
+    assert batches == [['a', 'b']]
+    assert cache.peek('en', 'tr', 'b') == 'b!'
+    cache.close()
@@ -0,0 +1,6 @@
+"""GUI-free core of WordPocket.
+
+final.py builds the Qt widget on top of these modules. The command line
+interface in wordpocket.cli (`python -m wordpocket`) uses them without
+PySide6.
+"""
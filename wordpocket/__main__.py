@@ -0,0 +1,5 @@
+import sys
+
+from wordpocket.cli import main
+
+sys.exit(main())
@@ -0,0 +1,339 @@
+"""Translation backends, tried in priority order behind per-backend circuit breakers.
+
+A backend translates single texts and batches and may detect languages.
+BackendChain tries the configured backends in order and skips the ones
+whose circuit breaker is open, so a backend that keeps failing costs
+nothing until its cool-down is over instead of a network timeout per
+lookup.
+
+Backends are named in the configuration by one of:
+    deep_translator     Google Translate through deep-translator
+    googletrans         Google Translate through googletrans
+    http://host:port    a LibreTranslate-compatible HTTP service, such as
+                        the stand-in from `python -m wordpocket.standin`
+"""
+import json
+import threading
+import time
+
+from wordpocket import config
+from wordpocket.metrics import metrics
+
+# Seconds a backend may take per request before it counts as failed
+BACKEND_TIMEOUT = 5
+
+# Consecutive failures that open a backend's circuit, and the seconds it
+# stays open before one trial request is let through again
+BREAKER_FAILURES = 3
+BREAKER_COOLDOWN = 30
+
+class TranslationError(Exception):
+    pass
+
+class EmptyTranslation(TranslationError):
+    """The backend answered, but with nothing; says nothing about its health"""
+
+class BackendUnavailable(TranslationError):
+    """No backend could be asked (all skipped by their circuit breakers)"""
+
+class TranslationBackend:
+    """Interface of a backend; every call blocks and may be made from any thread"""
+    name = "backend"
+
+    def __init__(self, timeout=BACKEND_TIMEOUT):
+        self.timeout = timeout
+
+    def translate(self, text, source_code, target_code):
+        raise NotImplementedError
+
+    def translate_batch(self, texts, source_code, target_code):
+        """Translations of texts in order, "" where the backend returned nothing"""
+        return [self.translate(text, source_code, target_code) for text in texts]
+
+    def detect(self, text):
+        """Language code of text; NotImplementedError if the backend cannot detect"""
+        raise NotImplementedError(f"{self.name} cannot detect languages")
+
+    def clear(self):
+        """Drop per-language-pair state (called when the languages change)"""
+
+class DeepTranslatorBackend(TranslationBackend):
+    """deep-translator's GoogleTranslator, one client per language pair.
+
+    Building a client checks the pair and maps it to Google's codes, so the
+    clients are kept instead of built per lookup. A client keeps
+    per-request state in the instance, so each one is guarded by its own
+    lock. deep-translator takes no session and no timeout; its requests
+    are sent the way the library sends them.
+    """
+    name = "deep_translator"
+
+    def __init__(self, timeout=BACKEND_TIMEOUT):
+        super().__init__(timeout)
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _client(self, source_code, target_code):
+        key = (source_code, target_code)
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is None:
+                from deep_translator import GoogleTranslator
+                entry = (GoogleTranslator(source=source_code, target=target_code), threading.Lock())
+                self._clients[key] = entry
+            return entry
+
+    def translate(self, text, source_code, target_code):
+        from deep_translator.exceptions import TranslationNotFound
+        client, client_lock = self._client(source_code, target_code)
+        try:
+            with client_lock:
+                return client.translate(text)
+        except TranslationNotFound as e:
+            raise EmptyTranslation(str(e)) from e
+
+    def translate_batch(self, texts, source_code, target_code):
+        # A client of its own per batch, so batches run in parallel
+        from deep_translator import GoogleTranslator
+        from deep_translator.exceptions import TranslationNotFound
+        client = GoogleTranslator(source=source_code, target=target_code)
+        translations = []
+        for text in texts:
+            try:
+                translations.append(client.translate(text))
+            except TranslationNotFound:
+                translations.append("")
+        return translations
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+class GoogletransBackend(TranslationBackend):
+    """googletrans; its Translator pools connections, so one serves every pair"""
+    name = "googletrans"
+
+    def __init__(self, timeout=BACKEND_TIMEOUT):
+        super().__init__(timeout)
+        self._translator = None
+        self._lock = threading.Lock()
+
+    def _client(self):
+        with self._lock:
+            if self._translator is None:
+                from googletrans import Translator
+                self._translator = Translator(timeout=self.timeout)
+            return self._translator
+
+    def translate(self, text, source_code, target_code):
+        result = self._client().translate(text, src=source_code, dest=target_code)
+        return result.text if hasattr(result, 'text') else str(result)
+
+    def translate_batch(self, texts, source_code, target_code):
+        results = self._client().translate(list(texts), src=source_code, dest=target_code)
+        return [getattr(result, 'text', result) for result in results]
+
+    def detect(self, text):
+        return self._client().detect(text).lang
+
+class HttpBackend(TranslationBackend):
+    """A LibreTranslate-compatible service: POST /translate and POST /detect with JSON"""
+    def __init__(self, url, timeout=BACKEND_TIMEOUT):
+        super().__init__(timeout)
+        self.url = url.rstrip('/')
+        self.name = self.url
+
+    def _post(self, path, payload):
+        # Imported on first use, like the other backends' libraries: urllib
+        # costs startup time and is only needed once a lookup is made
+        import urllib.error
+        import urllib.request
+
+        request = urllib.request.Request(self.url + path, data=json.dumps(payload).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            raise TranslationError(f"{self.url}{path}: HTTP {e.code}") from e
+
+    def translate(self, text, source_code, target_code):
+        answer = self._post("/translate", {'q': text, 'source': source_code, 'target': target_code,
+                                           'format': 'text'})
+        return answer.get('translatedText', "")
+
+    def translate_batch(self, texts, source_code, target_code):
+        answer = self._post("/translate", {'q': list(texts), 'source': source_code, 'target': target_code,
+                                           'format': 'text'})
+        translations = answer.get('translatedText', [])
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise TranslationError(f"{self.url}/translate: unexpected batch answer")
+        return translations
+
+    def detect(self, text):
+        answer = self._post("/detect", {'q': text})
+        if not answer:
+            raise TranslationError(f"{self.url}/detect: no language")
+        return answer[0]['language']
+
+def create_backend(spec):
+    """Backend from a name or URL, a {'backend': ..., 'timeout': seconds} dict, or a backend itself"""
+    if isinstance(spec, TranslationBackend):
+        return spec
+    timeout = BACKEND_TIMEOUT
+    if isinstance(spec, dict):
+        timeout = spec.get('timeout', BACKEND_TIMEOUT)
+        spec = spec['backend']
+    if spec == "deep_translator":
+        return DeepTranslatorBackend(timeout)
+    if spec == "googletrans":
+        return GoogletransBackend(timeout)
+    if spec.startswith(("http://", "https://")):
+        return HttpBackend(spec, timeout)
+    raise ValueError(f"Unknown translation backend: {spec}")
+
+class CircuitBreaker:
+    """Closed until `failures` calls in a row fail, then open for `cooldown` seconds.
+
+    After the cool-down a single trial call is allowed (half-open): success
+    closes the circuit, failure opens it for another cool-down.
+    """
+    def __init__(self, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN, clock=time.monotonic):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.clock = clock
+        self._failed = 0
+        self._open_until = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._open_until is None:
+                return True
+            if self.clock() < self._open_until or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failed = 0
+            self._open_until = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failed += 1
+            if self._trial or self._failed >= self.failures:
+                self._open_until = self.clock() + self.cooldown
+            self._trial = False
+
+    def state(self):
+        with self._lock:
+            if self._open_until is None:
+                return 'closed'
+            if self.clock() < self._open_until:
+                return 'open'
+            return 'half-open'
+
+    def retry_in(self):
+        """Seconds until an open circuit lets a trial through"""
+        with self._lock:
+            return max(0.0, self._open_until - self.clock()) if self._open_until is not None else 0.0
+
+class BackendChain:
+    """The configured backends in priority order, each behind a CircuitBreaker.
+
+    A call goes to the first backend whose circuit lets it through; when it
+    fails (or answers with nothing) the next one is tried. If every backend
+    is skipped or fails, TranslationError (BackendUnavailable if all were
+    skipped) is raised at once with the reason for each.
+    """
+    def __init__(self, specs=None, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.breaker_failures = failures
+        self.breaker_cooldown = cooldown
+        self._lock = threading.Lock()
+        self.configure(config.TRANSLATION_BACKENDS if specs is None else specs)
+
+    def configure(self, specs):
+        """Replace the backends with those named in specs (see create_backend)"""
+        entries = [(create_backend(spec), CircuitBreaker(self.breaker_failures, self.breaker_cooldown))
+                   for spec in specs]
+        with self._lock:
+            self._entries = entries
+
+    def backends(self):
+        with self._lock:
+            return [backend for backend, _ in self._entries]
+
+    def status(self):
+        """[(backend name, breaker state, seconds until retry)] in priority order"""
+        with self._lock:
+            entries = list(self._entries)
+        return [(backend.name, breaker.state(), breaker.retry_in()) for backend, breaker in entries]
+
+    def available(self):
+        """True if at least one backend is configured"""
+        with self._lock:
+            return bool(self._entries)
+
+    def _call(self, name, pair, call):
+        """call(backend) on the first backend that lets it through, recorded as metric name"""
+        with self._lock:
+            entries = list(self._entries)
+        if not entries:
+            raise BackendUnavailable("No translation backend is configured")
+        errors = []
+        skipped = 0
+        for backend, breaker in entries:
+            if not breaker.allow():
+                skipped += 1
+                errors.append(f"{backend.name}: skipped for {breaker.retry_in():.0f}s after failures")
+                continue
+            start = time.monotonic()
+            try:
+                result = call(backend)
+            except (NotImplementedError, EmptyTranslation) as e:
+                # The backend answered; this says nothing about its health
+                breaker.record_success()
+                errors.append(f"{backend.name}: {e}")
+                continue
+            except Exception as e:
+                breaker.record_failure()
+                metrics.record(name, time.monotonic() - start, backend=backend.name, pair=pair, outcome='error')
+                errors.append(f"{backend.name}: {str(e) or type(e).__name__}")
+                continue
+            breaker.record_success()
+            metrics.record(name, time.monotonic() - start, backend=backend.name, pair=pair, outcome='ok')
+            return result
+        if skipped == len(entries):
+            raise BackendUnavailable("; ".join(errors))
+        raise TranslationError("; ".join(errors))
+
+    def translate(self, text, source_code, target_code):
+        """Stripped translation of text (blocking, thread-safe)"""
+        def call(backend):
+            translation = backend.translate(text, source_code, target_code)
+            if not translation or not translation.strip():
+                raise EmptyTranslation("Empty translation result")
+            return translation.strip()
+        return self._call('translate', f"{source_code}-{target_code}", call)
+
+    def translate_batch(self, texts, source_code, target_code):
+        """Stripped translations of texts in order, "" where nothing came back"""
+        texts = list(texts)
+
+        def call(backend):
+            return [(translation or "").strip()
+                    for translation in backend.translate_batch(texts, source_code, target_code)]
+        return self._call('translate_batch', f"{source_code}-{target_code}", call)
+
+    def detect(self, text):
+        """Language code of text from the first backend that can detect"""
+        return self._call('detect', "-", lambda backend: backend.detect(text))
+
+    def clear(self):
+        """Drop per-pair clients; they are recreated lazily for the new language pairs"""
+        for backend in self.backends():
+            backend.clear()
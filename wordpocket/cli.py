@@ -0,0 +1,217 @@
+"""Command line interface: bulk translation, import, PDF export and statistics.
+
+Run as `python -m wordpocket <command>`. Nothing here imports PySide6, so it
+works on servers, in pipelines and in cron jobs. Results are written to
+stdout; progress and diagnostics go to stderr.
+"""
+import argparse
+import contextlib
+import json
+import os
+import queue
+import sys
+import threading
+
+from wordpocket import config
+from wordpocket.config import LANGUAGES, normalize_text
+from wordpocket.importer import IMPORT_FORMATS, import_vocabulary
+from wordpocket.storage import (IMPORT_POLICIES, get_dictionary_store, close_dictionary_stores,
+                                dictionary_pairs)
+from wordpocket.translation import (TranslationCache, translate_many,
+                                    BATCH_TRANSLATE_SIZE, BATCH_TRANSLATE_WORKERS)
+
+# Words read from stdin are translated in chunks of up to this many lines; a
+# shorter chunk is sent as soon as stdin has been idle for STDIN_IDLE_SECONDS
+TRANSLATE_CHUNK_LINES = BATCH_TRANSLATE_SIZE * BATCH_TRANSLATE_WORKERS
+STDIN_IDLE_SECONDS = 0.2
+
+def read_chunks(stream, size, idle=STDIN_IDLE_SECONDS):
+    """Yield the lines of stream in lists of at most size lines.
+
+    A reader thread feeds a bounded queue, so memory stays constant however
+    long the input is, and an interactive user gets an answer per line
+    instead of waiting for a full chunk.
+    """
+    lines = queue.Queue(maxsize=size * 2)
+
+    def reader():
+        for line in stream:
+            lines.put(line.rstrip('\r\n'))
+        lines.put(None)
+
+    threading.Thread(target=reader, daemon=True).start()
+    while True:
+        line = lines.get()
+        if line is None:
+            return
+        chunk = [line]
+        while len(chunk) < size:
+            try:
+                line = lines.get(timeout=idle)
+            except queue.Empty:
+                break
+            if line is None:
+                yield chunk
+                return
+            chunk.append(line)
+        yield chunk
+
+def open_translation_cache():
+    """The translation cache shared with the desktop app, or None if it cannot be opened"""
+    try:
+        return TranslationCache(os.path.join(config.DATA_DIR, "translation_cache.sqlite3"))
+    except Exception as e:
+        print(f"Translation cache disabled: {e}")
+        return None
+
+def cmd_translate(args, out):
+    if not config.TRANSLATOR_AVAILABLE:
+        print("Translation requires 'deep-translator' or 'googletrans'. Install with: pip install deep-translator")
+        return 1
+
+    source_code = LANGUAGES[args.source]['code']
+    target_code = LANGUAGES[args.target]['code']
+    cache = None if args.no_cache else open_translation_cache()
+    store = get_dictionary_store(args.source, args.target) if args.save else None
+
+    failed = 0
+    for chunk in read_chunks(sys.stdin, TRANSLATE_CHUNK_LINES):
+        words = [line.strip() for line in chunk]
+        translations = translate_many(words, source_code, target_code, cache)
+        puts = []
+        for word in words:
+            translation = translations.get(normalize_text(word), "") if word else ""
+            if word and not translation:
+                failed += 1
+            out.write(f"{word}\t{translation}\n")
+            if store is not None and translation:
+                puts.append((None, word, translation))
+        out.flush()
+        if puts:
+            store.apply_changes([], puts)
+
+    if cache is not None:
+        cache.close()
+    if failed:
+        print(f"{failed} words could not be translated")
+        return 1
+    return 0
+
+def cmd_import(args, out):
+    store = get_dictionary_store(args.source, args.target)
+
+    def progress(done, total):
+        print(f"\rImporting {done * 100 // max(total, 1)}%", end="", flush=True)
+
+    counts = import_vocabulary(args.file, store, args.policy, args.format, progress=progress)
+    print()
+    out.write(f"{os.path.basename(store.json_file)}: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['unchanged']} unchanged, {counts['skipped']} skipped of {counts['rows']} rows\n")
+    return 0
+
+def cmd_export_pdf(args, out):
+    if not config.REPORTLAB_AVAILABLE:
+        print("PDF export requires 'reportlab', 'arabic-reshaper', 'python-bidi'. Install with: pip install reportlab arabic-reshaper python-bidi")
+        return 1
+    from wordpocket.pdf import export_dictionary_pdf
+
+    store = get_dictionary_store(args.source, args.target)
+    words, meanings, _ = store.snapshot()
+
+    def progress(done, total):
+        print(f"\rExporting {done}/{total}", end="", flush=True)
+
+    exported = export_dictionary_pdf(args.output, args.source, args.target, words, meanings,
+                                     progress=progress)
+    print()
+    out.write(f"Exported {exported} rows to {args.output}\n")
+    return 0
+
+def cmd_stats(args, out):
+    dictionaries = []
+    for source_lang, target_lang in dictionary_pairs():
+        store = get_dictionary_store(source_lang, target_lang)
+        dictionaries.append({
+            'source': source_lang,
+            'target': target_lang,
+            'entries': len(store),
+            'without_meaning': sum(1 for entry in store.iter_entries() if not entry['meaning'].strip()),
+            'bytes': store.size_on_disk(),
+        })
+
+    cache_entries = None
+    if os.path.exists(os.path.join(config.DATA_DIR, "translation_cache.sqlite3")):
+        cache = open_translation_cache()
+        if cache is not None:
+            cache_entries = cache.stats()['entries']
+            cache.close()
+
+    if args.json:
+        json.dump({'dictionaries': dictionaries, 'translation_cache_entries': cache_entries},
+                  out, ensure_ascii=False, indent=2)
+        out.write("\n")
+        return 0
+
+    out.write(f"{'pair':<8}{'entries':>10}{'no meaning':>12}{'size':>12}\n")
+    for d in dictionaries:
+        out.write(f"{d['source'] + '-' + d['target']:<8}{d['entries']:>10}{d['without_meaning']:>12}"
+                  f"{d['bytes'] / 1024:>10.1f}kB\n")
+    out.write(f"{'total':<8}{sum(d['entries'] for d in dictionaries):>10}\n")
+    if cache_entries is not None:
+        out.write(f"translation cache: {cache_entries} entries\n")
+    return 0
+
+def language(value):
+    value = value.upper()
+    if value not in LANGUAGES:
+        raise argparse.ArgumentTypeError(f"unknown language {value!r} (choose from {', '.join(LANGUAGES)})")
+    return value
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="wordpocket", description="WordPocket without the GUI")
+    parser.add_argument("--data-dir", help="dictionary and cache directory (default: %(default)s)",
+                        default=config.DATA_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_pair(command):
+        command.add_argument("-s", "--source", type=language, required=True, help="source language, e.g. EN")
+        command.add_argument("-t", "--target", type=language, required=True, help="target language, e.g. AR")
+
+    translate = commands.add_parser("translate", help="translate words read from stdin, one per line")
+    add_pair(translate)
+    translate.add_argument("--save", action="store_true", help="also save the translations to the dictionary")
+    translate.add_argument("--no-cache", action="store_true", help="do not use the translation cache")
+    translate.set_defaults(handler=cmd_translate)
+
+    import_ = commands.add_parser("import", help="add a CSV/TSV/JSON-lines vocabulary to a dictionary")
+    add_pair(import_)
+    import_.add_argument("file", help="word/meaning rows (.csv, .tsv, .txt, .jsonl) or a dict_*.json list")
+    import_.add_argument("--policy", choices=IMPORT_POLICIES, default='keep',
+                         help="words already saved: keep them, overwrite them or merge the meanings (default: %(default)s)")
+    import_.add_argument("--format", choices=sorted(set(IMPORT_FORMATS.values())),
+                         help="file format (default: from the extension)")
+    import_.set_defaults(handler=cmd_import)
+
+    export_pdf = commands.add_parser("export-pdf", help="export a dictionary as PDF")
+    add_pair(export_pdf)
+    export_pdf.add_argument("output", help="PDF file to write")
+    export_pdf.set_defaults(handler=cmd_export_pdf)
+
+    stats = commands.add_parser("stats", help="show dictionary sizes")
+    stats.add_argument("--json", action="store_true", help="machine-readable output")
+    stats.set_defaults(handler=cmd_stats)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config.DATA_DIR = args.data_dir
+    out = sys.stdout
+    # The core reports through print(); keep stdout for the command's results
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            return args.handler(args, out)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return 1
+        finally:
+            close_dictionary_stores()
@@ -0,0 +1,168 @@
+"""Word completion: a sorted prefix index ranked by how often words are used."""
+import bisect
+import heapq
+import json
+import os
+import threading
+
+from wordpocket import config
+from wordpocket.state import write_behind, write_json_atomic
+from wordpocket.storage import dictionary_pairs, get_dictionary_store
+
+# Suggestions shown for a prefix
+COMPLETION_LIMIT = 8
+
+class WordFrequencies:
+    """How often each word was looked up or saved, per source language.
+
+    Kept in data/word_frequency.json. Nothing is read until load() (the app
+    calls it off the GUI thread); changes are saved by the write-behind
+    thread, and only once loaded.
+    """
+    # A save says more about a word than a lookup
+    SAVE_WEIGHT = 3
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(config.DATA_DIR, "word_frequency.json")
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._modified = False
+        self._loaded = False
+
+    def load(self):
+        """Read the saved counts once, adding them to those counted meanwhile"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            saved = {}
+        except (OSError, ValueError) as e:
+            print(f"Error loading word frequencies: {e}")
+            return
+        with self._lock:
+            for lang, saved_counts in saved.items():
+                counts = self._counts.setdefault(lang, {})
+                for key, count in saved_counts.items():
+                    counts[key] = counts.get(key, 0) + count
+            modified = self._modified
+        if modified:
+            # Counted before the load; they could not be saved until now
+            write_behind.mark_dirty(self.path, self.save)
+
+    def counts(self, lang):
+        """{lower-cased word: count} for a language (a live dict, do not modify)"""
+        with self._lock:
+            return self._counts.setdefault(lang, {})
+
+    def bump(self, lang, word, amount=1):
+        key = word.strip().lower()
+        if not key:
+            return
+        with self._lock:
+            counts = self._counts.setdefault(lang, {})
+            counts[key] = counts.get(key, 0) + amount
+            self._modified = True
+        write_behind.mark_dirty(self.path, self.save)
+
+    def save(self):
+        with self._lock:
+            # Unless loaded, writing would drop the counts of earlier sessions
+            if not self._modified or not self._loaded:
+                return
+            data = {lang: dict(counts) for lang, counts in self._counts.items()}
+            self._modified = False
+        try:
+            write_json_atomic(self.path, data)
+        except Exception:
+            # Still modified, so the write-behind retry writes it
+            with self._lock:
+                self._modified = True
+            raise
+
+class PrefixIndex:
+    """Saved words of one language in a sorted array, completed by bisection.
+
+    A prefix selects a contiguous slice of the lower-cased keys. Only words
+    that were ever used have a count; their keys are kept sorted as well, so
+    the same bisection finds the used words with the prefix, which are
+    ranked first. The rest of the suggestions are simply the start of the
+    slice: a completion walks neither the slice nor every counted word,
+    even for a one-letter prefix over a large dictionary.
+    """
+    def __init__(self, words=(), counts=None):
+        # Lower-cased key -> the spelling shown (the first one seen)
+        spellings = {}
+        for word in words:
+            word = word.strip()
+            if word:
+                spellings.setdefault(word.lower(), word)
+        self._keys = sorted(spellings)
+        self._words = [spellings[key] for key in self._keys]
+        self.counts = counts if counts is not None else {}
+        self._counted = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, word):
+        word = word.strip()
+        key = word.lower()
+        position = bisect.bisect_left(self._keys, key)
+        if key and (position == len(self._keys) or self._keys[position] != key):
+            self._keys.insert(position, key)
+            self._words.insert(position, word)
+
+    def remove(self, word):
+        key = word.strip().lower()
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+            del self._words[position]
+
+    def _counted_keys(self):
+        """Sorted keys of counts; sorted again only when a word was counted for the first time"""
+        # Counted words are never dropped, so the same size means the same keys
+        if len(self._counted) != len(self.counts):
+            self._counted = sorted(self.counts)
+        return self._counted
+
+    def complete(self, prefix, limit=COMPLETION_LIMIT):
+        """Up to limit words starting with prefix, most used first, then alphabetically"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + '\U0010ffff', start)
+        used_keys = self._counted_keys()
+        first = bisect.bisect_left(used_keys, prefix)
+        last = bisect.bisect_left(used_keys, prefix + '\U0010ffff', first)
+        used = []
+        for key in used_keys[first:last]:
+            count = self.counts.get(key, 0)
+            if count > 0:
+                position = bisect.bisect_left(self._keys, key, start, end)
+                if position < end and self._keys[position] == key:
+                    used.append((-count, position))
+        positions = [position for _, position in heapq.nsmallest(limit, used)]
+        chosen = set(positions)
+        position = start
+        while len(positions) < limit and position < end:
+            if position not in chosen:
+                positions.append(position)
+            position += 1
+        return [self._words[position] for position in positions]
+
+def build_prefix_index(lang, frequencies=None):
+    """PrefixIndex over the words of every saved dictionary with lang as source"""
+    if frequencies is not None:
+        frequencies.load()
+    words = []
+    for source_lang, target_lang in dictionary_pairs():
+        if source_lang == lang:
+            store = get_dictionary_store(source_lang, target_lang)
+            words.extend(store.snapshot()[0])
+    return PrefixIndex(words, frequencies.counts(lang) if frequencies is not None else None)
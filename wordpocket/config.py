@@ -0,0 +1,75 @@
+"""Languages, data locations and optional-dependency probes."""
+import importlib.util
+import os
+
+def module_available(name):
+    """Check whether a module can be imported without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+# The translation and PDF libraries are slow to import and only needed on the
+# first lookup or export, so startup only probes for them; the imports happen
+# inside the functions that use them.
+if module_available("deep_translator"):
+    TRANSLATOR_AVAILABLE = True
+    TRANSLATOR_TYPE = "deep_translator"
+elif module_available("googletrans"):
+    # Fallback to older googletrans version
+    TRANSLATOR_AVAILABLE = True
+    TRANSLATOR_TYPE = "googletrans"
+else:
+    TRANSLATOR_AVAILABLE = False
+    TRANSLATOR_TYPE = None
+
+# Translation backends in priority order (see wordpocket.backends): the
+# installed libraries by default. WORDPOCKET_BACKENDS replaces the list with
+# comma-separated names or URLs, e.g. "http://localhost:5000,deep_translator".
+BACKENDS_ENV = "WORDPOCKET_BACKENDS"
+if os.environ.get(BACKENDS_ENV):
+    TRANSLATION_BACKENDS = [spec.strip() for spec in os.environ[BACKENDS_ENV].split(",") if spec.strip()]
+    TRANSLATOR_AVAILABLE = bool(TRANSLATION_BACKENDS)
+else:
+    TRANSLATION_BACKENDS = [name for name in ("deep_translator", "googletrans") if module_available(name)]
+
+# The application directory (next to final.py), which holds fonts/ and data/.
+# Both may be reassigned before the first dictionary or font is used.
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(SCRIPT_DIR, "data")
+
+# PDF export also needs arabic-reshaper and python-bidi for Arabic text shaping
+REPORTLAB_AVAILABLE = all(module_available(name) for name in ("reportlab", "arabic_reshaper", "bidi"))
+
+LANGUAGES = {
+    'EN': {'name': 'English', 'code': 'en', 'font': 'NotoSans-Regular.ttf'},
+    'TR': {'name': 'Türkçe', 'code': 'tr', 'font': 'NotoSans-Regular.ttf'},
+    'AR': {'name': 'العربية', 'code': 'ar', 'font': 'NotoSansArabic-Regular.ttf'},
+    'FR': {'name': 'Français', 'code': 'fr', 'font': 'NotoSans-Regular.ttf'},
+    'DE': {'name': 'Deutsch', 'code': 'de', 'font': 'NotoSans-Regular.ttf'},
+    'ES': {'name': 'Español', 'code': 'es', 'font': 'NotoSans-Regular.ttf'},
+    'IT': {'name': 'Italiano', 'code': 'it', 'font': 'NotoSans-Regular.ttf'},
+    'RU': {'name': 'Русский', 'code': 'ru', 'font': 'NotoSans-Regular.ttf'},
+    'JA': {'name': '日本語', 'code': 'ja', 'font': 'NotoSansJP-Regular.ttf'},
+    'KO': {'name': '한국어', 'code': 'ko', 'font': 'NotoSansKR-Regular.ttf'},
+    'ZH': {'name': '中文', 'code': 'zh', 'font': 'NotoSansSC-Regular.ttf'},
+    'PT': {'name': 'Português', 'code': 'pt', 'font': 'NotoSans-Regular.ttf'},
+    'NL': {'name': 'Nederlands', 'code': 'nl', 'font': 'NotoSans-Regular.ttf'},
+    'SV': {'name': 'Svenska', 'code': 'sv', 'font': 'NotoSans-Regular.ttf'},
+    'DA': {'name': 'Dansk', 'code': 'da', 'font': 'NotoSans-Regular.ttf'},
+    'NO': {'name': 'Norsk', 'code': 'no', 'font': 'NotoSans-Regular.ttf'},
+    'FI': {'name': 'Suomi', 'code': 'fi', 'font': 'NotoSans-Regular.ttf'},
+    'PL': {'name': 'Polski', 'code': 'pl', 'font': 'NotoSans-Regular.ttf'},
+    'CS': {'name': 'Čeština', 'code': 'cs', 'font': 'NotoSans-Regular.ttf'},
+    'HU': {'name': 'Magyar', 'code': 'hu', 'font': 'NotoSans-Regular.ttf'}
+}
+
+# Add font mapping to the LANGUAGES dictionary
+default_latin_font = 'NotoSans-Regular.ttf'
+for lang_key in LANGUAGES:
+    if lang_key not in ['AR', 'JA', 'KO', 'ZH']:
+        LANGUAGES[lang_key]['font'] = default_latin_font
+
+def normalize_text(text):
+    """Normalize a lookup key: trim, collapse inner whitespace and lower-case"""
+    return " ".join(text.split()).lower()
@@ -0,0 +1,41 @@
+"""Typing debounce that adapts to the user's cadence and the backend latency."""
+import time
+
+class AdaptiveDebounce:
+    """Delay between the last keystroke and a network lookup.
+
+    The delay is about CADENCE_FACTOR typical gaps between keystrokes (a
+    pause that long means the word is probably finished) but at least
+    LATENCY_FACTOR round-trips of the backend (on a slow link a request sent
+    mid-word is both wasted and queued ahead of the real one), clamped to
+    [min_ms, max_ms]. Until both are known initial_ms is used.
+    """
+    CADENCE_FACTOR = 2.0
+    LATENCY_FACTOR = 0.5
+    # Gaps longer than this are pauses, not typing
+    TYPING_GAP_MS = 1000
+    # Weight of the newest gap in the running average
+    WEIGHT = 0.3
+
+    def __init__(self, min_ms=150, max_ms=800, initial_ms=500, clock=time.monotonic):
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.initial_ms = initial_ms
+        self.clock = clock
+        self.gap_ms = None
+        self._last_keystroke = None
+
+    def keystroke(self):
+        now = self.clock()
+        if self._last_keystroke is not None:
+            gap = (now - self._last_keystroke) * 1000
+            if gap < self.TYPING_GAP_MS:
+                self.gap_ms = gap if self.gap_ms is None else self.gap_ms + self.WEIGHT * (gap - self.gap_ms)
+        self._last_keystroke = now
+
+    def delay_ms(self, latency=None):
+        """Debounce delay in ms, given the recent backend latency in seconds (or None)"""
+        delay = self.initial_ms if self.gap_ms is None else self.CADENCE_FACTOR * self.gap_ms
+        if latency is not None:
+            delay = max(delay, self.LATENCY_FACTOR * latency * 1000)
+        return int(min(max(delay, self.min_ms), self.max_ms))
@@ -0,0 +1,153 @@
+"""Streaming import of vocabulary files (CSV, TSV, JSON lines) into a dictionary store."""
+import csv
+import io
+import json
+import os
+
+from wordpocket.storage import IMPORT_POLICIES
+
+# File extension -> format read by read_vocabulary
+IMPORT_FORMATS = {
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+    '.tab': 'tsv',
+    '.txt': 'tsv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.json': 'json',
+}
+
+# Rows handed to the store per journal write (and per progress report)
+IMPORT_BATCH_ROWS = 5000
+
+# Header names recognised for the two columns, lower-cased
+WORD_COLUMNS = ('word', 'words', 'term', 'source')
+MEANING_COLUMNS = ('meaning', 'meanings', 'translation', 'definition', 'target')
+
+class ImportCancelled(Exception):
+    pass
+
+def detect_format(path):
+    """Import format from the file extension, or None if it is not supported"""
+    return IMPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+
+def _read_rows(rows):
+    """(word, meaning) pairs from csv rows; an optional header row names the columns"""
+    word_column, meaning_column = 0, 1
+    first = True
+    for row in rows:
+        if first:
+            first = False
+            header = [cell.strip().lower() for cell in row]
+            if any(name in header for name in WORD_COLUMNS):
+                word_column = next(header.index(name) for name in WORD_COLUMNS if name in header)
+                meaning_column = next((header.index(name) for name in MEANING_COLUMNS if name in header),
+                                      1 if word_column != 1 else 0)
+                continue
+        if not row:
+            continue
+        if len(row) <= word_column:
+            yield None
+            continue
+        meaning = row[meaning_column] if len(row) > meaning_column else ""
+        yield row[word_column], meaning
+
+def _read_json_lines(f):
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield None
+            continue
+        if isinstance(record, dict):
+            yield record.get('word', ''), record.get('meaning', '')
+        elif isinstance(record, list) and record:
+            yield record[0], record[1] if len(record) > 1 else ""
+        else:
+            yield None
+
+def read_vocabulary(f, fmt):
+    """Yield (word, meaning) pairs from an open text file, None for unreadable rows.
+
+    csv, tsv and jsonl are read a row at a time. json (the dict_*.json list
+    format) has to be parsed as a whole and is only meant for moving
+    dictionaries between installations.
+    """
+    if fmt == 'csv':
+        yield from _read_rows(csv.reader(f))
+    elif fmt == 'tsv':
+        # Plain tab-separated lines: quotes are part of the text
+        yield from _read_rows(csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE))
+    elif fmt == 'jsonl':
+        yield from _read_json_lines(f)
+    elif fmt == 'json':
+        for entry in json.load(f):
+            if isinstance(entry, dict):
+                yield entry.get('word', ''), entry.get('meaning', '')
+            else:
+                yield None
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+def import_vocabulary(path, store, policy='keep', fmt=None, progress=None, is_cancelled=None,
+                      batch_rows=IMPORT_BATCH_ROWS):
+    """Stream a vocabulary file into a DictionaryStore.
+
+    Rows are stripped and handed to store.import_entries in batches of
+    batch_rows, so memory stays constant whatever the file size and words are
+    deduplicated case-insensitively exactly like save_to_json does (see
+    DictionaryStore.import_entries for the policies). progress(bytes_read,
+    total_bytes) is called after every batch. is_cancelled() is checked
+    before each batch and raises ImportCancelled, keeping the batches
+    already imported; once the last batch is in, the import is done.
+    Returns a dict of row counts.
+    """
+    if policy not in IMPORT_POLICIES:
+        raise ValueError(f"Unknown import policy: {policy}")
+    fmt = fmt or detect_format(path)
+    if fmt is None:
+        raise ValueError(f"Unsupported file type: {os.path.basename(path)} (use .csv, .tsv, .jsonl or .json)")
+
+    counts = {'rows': 0, 'added': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+    total_bytes = os.path.getsize(path)
+
+    def flush(batch, position):
+        if batch:
+            if is_cancelled is not None and is_cancelled():
+                raise ImportCancelled()
+            added, updated, unchanged = store.import_entries(batch, policy)
+            counts['added'] += added
+            counts['updated'] += updated
+            counts['unchanged'] += unchanged
+        if progress is not None:
+            progress(position, total_bytes)
+
+    with open(path, 'rb') as raw:
+        # utf-8-sig drops the BOM spreadsheet programs like to write
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        batch = []
+        for pair in read_vocabulary(text, fmt):
+            counts['rows'] += 1
+            if pair is None:
+                counts['skipped'] += 1
+                continue
+            word, meaning = pair
+            # A JSON null word is no word, not the text "None"
+            word = str(word).strip() if word is not None else ""
+            if not word:
+                counts['skipped'] += 1
+                continue
+            batch.append((word, str(meaning or "").strip()))
+            if len(batch) >= batch_rows:
+                flush(batch, raw.tell())
+                batch = []
+        flush(batch, total_bytes)
+
+    # A large import leaves a journal as long as the snapshot; fold it in now
+    # rather than on the next maintenance tick
+    if store.needs_compaction():
+        store.compact()
+    return counts
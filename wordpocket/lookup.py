@@ -0,0 +1,55 @@
+"""Answering lookups from the saved dictionaries before going online."""
+from wordpocket.storage import dictionary_pairs, get_dictionary_store, loaded_dictionary_store
+
+def meaning_parts(meaning):
+    """The comma-separated alternatives of a saved meaning"""
+    return [part.strip() for part in meaning.split(',') if part.strip()]
+
+def lookup_saved(word, source_lang, target_lang, pivot=True, loaded_only=False):
+    """Translate word from the saved dictionaries; returns (translation, via) or None.
+
+    dict_{source}_{target} answers directly (via is None). Otherwise, if
+    pivot is set, a language P with both dict_{source}_{P} and
+    dict_{P}_{target} saved is tried: every alternative of the first meaning
+    is looked up in the second dictionary (via is P). With loaded_only, only
+    dictionaries already in memory are used, so the call never touches disk
+    and is safe on the GUI thread.
+    """
+    word = word.strip()
+    if not word:
+        return None
+    store_for = loaded_dictionary_store if loaded_only else get_dictionary_store
+
+    pairs = dictionary_pairs()
+    if (source_lang, target_lang) in pairs:
+        store = store_for(source_lang, target_lang)
+        entry = store.get(word) if store is not None else None
+        if entry is not None and entry['meaning'].strip():
+            return entry['meaning'], None
+    if not pivot:
+        return None
+
+    targets_of = {}
+    for pair_source, pair_target in pairs:
+        targets_of.setdefault(pair_source, set()).add(pair_target)
+    for via in sorted(targets_of.get(source_lang, ())):
+        if via == target_lang or target_lang not in targets_of.get(via, ()):
+            continue
+        first = store_for(source_lang, via)
+        second = store_for(via, target_lang)
+        if first is None or second is None:
+            continue
+        entry = first.get(word)
+        if entry is None:
+            continue
+        found = []
+        for part in meaning_parts(entry['meaning']):
+            pivot_entry = second.get(part)
+            if pivot_entry is None:
+                continue
+            for meaning in meaning_parts(pivot_entry['meaning']):
+                if meaning.lower() not in (known.lower() for known in found):
+                    found.append(meaning)
+        if found:
+            return ", ".join(found), via
+    return None
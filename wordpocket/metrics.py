@@ -0,0 +1,127 @@
+"""Timing and size metrics: rolling histograms plus an optional JSON-lines trace."""
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+
+# Samples kept per histogram; older ones roll off
+HISTOGRAM_SAMPLES = 1000
+
+# Setting this environment variable to a file path turns the trace on at startup
+TRACE_ENV = "WORDPOCKET_TRACE"
+
+class Histogram:
+    """The last HISTOGRAM_SAMPLES values of one measurement, plus all-time totals"""
+    def __init__(self, size=HISTOGRAM_SAMPLES):
+        self.samples = collections.deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {'count': self.count}
+
+        def percentile(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return {
+            'count': self.count,
+            'mean': sum(ordered) / len(ordered),
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'max': ordered[-1],
+        }
+
+class Metrics:
+    """Process-wide registry of measurements.
+
+    record() adds a value to the histogram of a name and its labels (e.g.
+    'translate' with backend and pair), set_value() keeps the last value of
+    a gauge such as a file size. Both are safe from any thread. When a trace
+    file is set, every call is also appended to it as one JSON object per
+    line with a wall-clock timestamp.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._values = {}
+        self._trace = None
+        self.trace_path = None
+        path = os.environ.get(TRACE_ENV)
+        if path:
+            self.set_trace(path)
+
+    @staticmethod
+    def _key(name, labels):
+        return name + "".join(f" {key}={labels[key]}" for key in sorted(labels))
+
+    def record(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.add(value)
+            self._write_trace(name, value, labels)
+
+    def set_value(self, name, value, **labels):
+        with self._lock:
+            self._values[self._key(name, labels)] = value
+            self._write_trace(name, value, labels)
+
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        """Record the seconds spent in the with block (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        """{'histograms': {key: summary}, 'values': {key: value}}"""
+        with self._lock:
+            return {
+                'histograms': {key: histogram.summary() for key, histogram in sorted(self._histograms.items())},
+                'values': dict(sorted(self._values.items())),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._values = {}
+
+    def set_trace(self, path):
+        """Append every measurement to path as JSON lines; None stops tracing"""
+        with self._lock:
+            if self._trace is not None:
+                self._trace.close()
+                self._trace = None
+            self.trace_path = path
+            if path:
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                    # Line-buffered, so a crash loses at most the current line
+                    self._trace = open(path, 'a', encoding='utf-8', buffering=1)
+                except OSError as e:
+                    print(f"Performance trace disabled: {e}")
+                    self.trace_path = None
+
+    def _write_trace(self, name, value, labels):
+        if self._trace is None:
+            return
+        try:
+            self._trace.write(json.dumps(dict(labels, ts=time.time(), name=name, value=value),
+                                         ensure_ascii=False) + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Performance trace error: {e}")
+
+metrics = Metrics()
@@ -0,0 +1,416 @@
+"""PDF export of a dictionary, with Arabic shaping and per-language fonts."""
+import functools
+import json
+import os
+import re
+import threading
+import time
+import weakref
+
+from wordpocket import config
+from wordpocket.config import LANGUAGES
+from wordpocket.metrics import metrics
+from wordpocket.state import write_atomic
+
+# Rows per LongTable chunk in PDF exports; only about two chunks of
+# Paragraphs are alive at any time
+PDF_EXPORT_CHUNK_ROWS = 200
+
+class ExportCancelled(Exception):
+    pass
+
+class _LazyFlowables(list):
+    """Flowable list that is filled from a generator while the PDF is built.
+
+    SimpleDocTemplate.build only looks at the front of the list and deletes
+    each flowable once it is laid out, so keeping two chunks buffered is
+    enough and finished chunks are freed as the build goes on.
+    """
+    def __init__(self, generator):
+        super().__init__()
+        self._generator = generator
+        self._fill()
+
+    def _fill(self):
+        while self._generator is not None and list.__len__(self) < 2:
+            try:
+                self.append(next(self._generator))
+            except StopIteration:
+                self._generator = None
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._fill()
+
+# Arabic script blocks: Arabic, Arabic Supplement, Arabic Extended-A and the
+# two presentation-form blocks
+ARABIC_TEXT_RE = re.compile('[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]')
+
+# Shaped strings kept by TextShaper; dictionaries repeat a lot of meanings
+SHAPING_CACHE_SIZE = 8192
+
+class TextShaper:
+    """Prepares text for PDF output: Arabic reshaping plus bidi reordering.
+
+    One ArabicReshaper is built on first use and shared, script detection is a
+    single precompiled regex search, and shaped strings are memoized in a
+    bounded LRU. Safe to use from the export worker thread.
+    """
+    RESHAPER_CONFIGURATION = {
+        'delete_harakat': False,
+        'delete_tatweel': False,
+        'support_ligatures': True,
+        'arabic_reshaper_join_by_shadda': True,
+        'delete_unnecessary_dots': False,
+        'shift_harakat_position': False,
+        'support_vocalized_arabic': True,
+    }
+
+    def __init__(self, cache_size=SHAPING_CACHE_SIZE):
+        self._reshaper = None
+        self._lock = threading.Lock()
+        self._shape_rtl = functools.lru_cache(maxsize=cache_size)(self._reshape)
+
+    def _get_reshaper(self):
+        with self._lock:
+            if self._reshaper is None:
+                from arabic_reshaper import ArabicReshaper
+                self._reshaper = ArabicReshaper(configuration=self.RESHAPER_CONFIGURATION)
+            return self._reshaper
+
+    def _reshape(self, text):
+        from bidi.algorithm import get_display
+        reshaped_text = self._get_reshaper().reshape(text)
+        return get_display(reshaped_text)
+
+    @staticmethod
+    def is_arabic_text(text):
+        return ARABIC_TEXT_RE.search(text) is not None
+
+    def prepare_arabic_text(self, text):
+        return self._shape_rtl(text)
+
+    def process_text(self, text, lang_code):
+        """Process text for PDF display, handling RTL and special characters."""
+        if not text:
+            return ""
+
+        if lang_code == 'AR' or self.is_arabic_text(text):
+            return self._shape_rtl(text)
+
+        return text
+
+    def process_column(self, texts, lang_code):
+        """Process a whole column at once; each distinct string is shaped once"""
+        shaped = {}
+        result = []
+        for text in texts:
+            processed = shaped.get(text)
+            if processed is None:
+                processed = shaped[text] = self.process_text(text, lang_code)
+            result.append(processed)
+        return result
+
+    def cache_info(self):
+        return self._shape_rtl.cache_info()
+
+text_shaper = TextShaper()
+
+# Bumped when the cached metrics change shape
+FONT_CACHE_VERSION = 1
+
+class FontManager:
+    """Registers the TTF fonts named in LANGUAGES[...]['font'] with reportlab.
+
+    Every font file is registered once under its own name, however many
+    languages share it. Parsing a TTF (cmap, hmtx, loca) is pure Python, so
+    the parsed metrics are saved as JSON in cache_dir, keyed on the file
+    size, mtime and reportlab version; later runs only load them and read
+    the raw font bytes. The cache is plain data, so a file planted in the
+    data directory can at worst give wrong metrics, never run code.
+    reportlab embeds dynamic subsets holding just the glyphs a document
+    uses, so fonts whose license forbids subsetting are not used.
+    Missing or broken font files fall back to Helvetica.
+    """
+    FALLBACK_FONT = 'Helvetica'
+
+    def __init__(self, font_dir=None, cache_dir=None):
+        self._font_dir = font_dir
+        self._cache_dir = cache_dir
+        self._fonts = {}  # font file -> registered font name
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @property
+    def font_dir(self):
+        return self._font_dir or os.path.join(config.SCRIPT_DIR, "fonts")
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir or os.path.join(config.DATA_DIR, "font_cache")
+
+    def font_name(self, lang):
+        """Return the font name to use for lang, registering the font if needed"""
+        font_file = LANGUAGES[lang]['font']
+        name = self._fonts.get(font_file)
+        if name is not None:
+            return name
+        with self._lock:
+            file_lock = self._locks.setdefault(font_file, threading.Lock())
+        # Per-file lock: a font being prewarmed is waited for, not parsed twice
+        with file_lock:
+            name = self._fonts.get(font_file)
+            if name is None:
+                with metrics.timer('font_register', font=font_file):
+                    name = self._register(font_file)
+                self._fonts[font_file] = name
+        return name
+
+    def prewarm(self, langs):
+        """Register the fonts for langs on a background thread"""
+        langs = [lang for lang in dict.fromkeys(langs) if lang in LANGUAGES]
+        thread = threading.Thread(target=lambda: [self.font_name(lang) for lang in langs],
+                                  name="font-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def _register(self, font_file):
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFError
+        name = os.path.splitext(font_file)[0]
+        if name in pdfmetrics.getRegisteredFontNames():
+            return name
+        try:
+            font = self._load_font(name, os.path.join(self.font_dir, font_file))
+        except (OSError, TTFError) as e:
+            print(f"Font {font_file} unavailable, using {self.FALLBACK_FONT}: {e}")
+            return self.FALLBACK_FONT
+        if font.face._full_font:
+            # Would embed every glyph in each PDF instead of a subset
+            print(f"Font {font_file} does not allow subsetting, using {self.FALLBACK_FONT}")
+            return self.FALLBACK_FONT
+        pdfmetrics.registerFont(font)
+        return name
+
+    @staticmethod
+    def _scale(units_per_em):
+        # Same glyph-unit -> PDF-unit scaling TTFontFile builds while parsing
+        if units_per_em == 1000:
+            return lambda x: x
+        factor = 1000 / units_per_em
+        return lambda x: x * factor
+
+    def _load_font(self, name, path):
+        from reportlab import Version as REPORTLAB_VERSION
+        from reportlab.pdfbase.ttfonts import TTEncoding, TTFont, TTFontFace
+        stat = os.stat(path)
+        key = [stat.st_size, stat.st_mtime_ns, REPORTLAB_VERSION, FONT_CACHE_VERSION]
+        cache_path = os.path.join(self.cache_dir, os.path.basename(path) + ".metrics.json")
+
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f, object_hook=_decode_metrics)
+            if cached['key'] == key:
+                with open(path, 'rb') as f:
+                    ttf_data = f.read()
+                face = TTFontFace.__new__(TTFontFace)
+                face.__dict__.update(cached['face'])
+                face._ttf_data = ttf_data
+                face._pdfScale = self._scale(face.unitsPerEm)
+                font = TTFont.__new__(TTFont)
+                font.__dict__.update(cached['font'])
+                font.fontName = name
+                font.face = face
+                font.encoding = TTEncoding()
+                font.state = weakref.WeakKeyDictionary()
+                return font
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring font cache {cache_path}: {e}")
+
+        font = TTFont(name, path)
+        # The raw bytes are reread from the font file, the scale is a lambda
+        # and the encoding and per-document state are rebuilt, so none of
+        # them are cached
+        font_state = {k: v for k, v in font.__dict__.items() if k not in ('fontName', 'face', 'encoding', 'state')}
+        face_state = {k: v for k, v in font.face.__dict__.items() if k not in ('_ttf_data', '_pdfScale')}
+        try:
+            cached = _encode_metrics({'key': key, 'font': font_state, 'face': face_state})
+            write_atomic(cache_path, lambda f: json.dump(cached, f, separators=(',', ':')))
+        except (OSError, TypeError) as e:
+            print(f"Could not cache font metrics for {path}: {e}")
+        return font
+
+def _encode_metrics(value):
+    """JSON-ready copy of parsed font state; bytes, tuples and int-keyed dicts become tagged objects"""
+    from reportlab.pdfbase.ttfonts import TTFNameBytes
+    if isinstance(value, bytes):
+        return {'$': 'name' if isinstance(value, TTFNameBytes) else 'bytes', 'v': value.decode('latin-1')}
+    if isinstance(value, tuple):
+        return {'$': 'tuple', 'v': [_encode_metrics(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode_metrics(item) for item in value]
+    if isinstance(value, dict):
+        if all(isinstance(k, str) and k != '$' for k in value):
+            return {k: _encode_metrics(v) for k, v in value.items()}
+        if all(isinstance(k, int) for k in value):
+            return {'$': 'intdict', 'v': [[k, _encode_metrics(v)] for k, v in value.items()]}
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot cache font metrics of type {type(value).__name__}")
+
+def _decode_metrics(obj):
+    """json object hook undoing _encode_metrics"""
+    tag = obj.get('$')
+    if tag is None:
+        return obj
+    value = obj['v']
+    if tag == 'intdict':
+        return {int(k): v for k, v in value}
+    if tag == 'tuple':
+        return tuple(value)
+    if tag == 'bytes':
+        return value.encode('latin-1')
+    if tag == 'name':
+        from reportlab.pdfbase.ttfonts import TTFNameBytes
+        return TTFNameBytes(value.encode('latin-1'))
+    raise ValueError(f"Unknown font cache tag {tag!r}")
+
+font_manager = FontManager()
+
+def export_dictionary_pdf(file_path, source_lang, target_lang, words, meanings,
+                          progress=None, is_cancelled=None):
+    """Write words/meanings as a two-column PDF table.
+
+    Rows are turned into LongTable chunks of PDF_EXPORT_CHUNK_ROWS only when
+    the layout reaches them, so memory is bounded by the chunk size rather
+    than the dictionary size. The column header is drawn on every page by the
+    page template, which keeps the chunk boundaries invisible. progress(done,
+    total) is called after each chunk; if is_cancelled() returns True the
+    build stops with ExportCancelled. Returns the number of exported rows.
+    The time spent on fonts, shaping and layout goes to wordpocket.metrics.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.enums import TA_CENTER
+    # Measured from here: importing reportlab is a one-off cost of the first export
+    export_start = time.perf_counter()
+
+    column_width = 3 * inch
+    header_height = 30
+    # The header band sits above the frame, so the frame starts lower
+    doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=inch + header_height)
+    styles = getSampleStyleSheet()
+
+    # --- Fonts (usually already registered by the startup prewarm) ---
+    with metrics.timer('pdf_fonts'):
+        source_font_name = font_manager.font_name(source_lang)
+        target_font_name = font_manager.font_name(target_lang)
+
+    # --- Paragraph Styles ---
+    source_style = styles['Normal'].clone('SourceStyle')
+    source_style.fontName = source_font_name
+    source_style.alignment = TA_CENTER
+    source_style.fontSize = 12
+    source_style.leading = 15
+
+    target_style = styles['Normal'].clone('TargetStyle')
+    target_style.fontName = target_font_name
+    target_style.alignment = TA_CENTER
+    target_style.fontSize = 12
+    target_style.leading = 15
+
+    # --- Header Styles ---
+    header_source_style = styles['Heading2'].clone('HeaderSourceStyle')
+    header_source_style.fontName = source_style.fontName
+    header_source_style.alignment = TA_CENTER
+
+    header_target_style = styles['Heading2'].clone('HeaderTargetStyle')
+    header_target_style.fontName = target_style.fontName
+    header_target_style.alignment = TA_CENTER
+
+    headers = [
+        Paragraph(text_shaper.process_text(LANGUAGES[source_lang]['name'], source_lang), header_source_style),
+        Paragraph(text_shaper.process_text(LANGUAGES[target_lang]['name'], target_lang), header_target_style)
+    ]
+
+    def draw_header(canvas, doc):
+        x = (doc.pagesize[0] - 2 * column_width) / 2
+        # Sits right on top of the first row (the frame has 6pt of padding)
+        y = doc.pagesize[1] - doc.topMargin - 6
+        canvas.saveState()
+        canvas.setFillColor(colors.grey)
+        canvas.setStrokeColor(colors.black)
+        canvas.setLineWidth(1)
+        canvas.rect(x, y, 2 * column_width, header_height, stroke=1, fill=1)
+        canvas.line(x + column_width, y, x + column_width, y + header_height)
+        canvas.setLineWidth(2)
+        canvas.line(x, y, x + 2 * column_width, y)
+        for i, header in enumerate(headers):
+            _, height = header.wrapOn(canvas, column_width - 12, header_height)
+            header.drawOn(canvas, x + i * column_width + 6, y + (header_height - height) / 2)
+        canvas.restoreState()
+
+    table_style = TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ])
+
+    total = len(words)
+    exported = 0
+    # Shaping happens inside doc.build as chunks are reached; its time is
+    # summed up here and reported apart from the layout
+    shaping_seconds = 0.0
+
+    def make_table(chunk_words, chunk_meanings):
+        nonlocal shaping_seconds
+        # Each column is shaped in one batch
+        start = time.perf_counter()
+        shaped_words = text_shaper.process_column(chunk_words, source_lang)
+        shaped_meanings = text_shaper.process_column(chunk_meanings, target_lang)
+        shaping_seconds += time.perf_counter() - start
+        rows = [[Paragraph(word, source_style), Paragraph(meaning, target_style)]
+                for word, meaning in zip(shaped_words, shaped_meanings)]
+        table = LongTable(rows, colWidths=[column_width, column_width])
+        table.setStyle(table_style)
+        return table
+
+    def chunks():
+        nonlocal exported
+        chunk_words = []
+        chunk_meanings = []
+        done = 0
+        for word, meaning in zip(words, meanings):
+            done += 1
+            word = word.strip()
+            meaning = meaning.strip()
+            if word or meaning:
+                chunk_words.append(word)
+                chunk_meanings.append(meaning)
+            if len(chunk_words) == PDF_EXPORT_CHUNK_ROWS or (chunk_words and done == total):
+                if is_cancelled is not None and is_cancelled():
+                    raise ExportCancelled()
+                exported += len(chunk_words)
+                table = make_table(chunk_words, chunk_meanings)
+                chunk_words = []
+                chunk_meanings = []
+                if progress is not None:
+                    progress(done, total)
+                yield table
+
+    start = time.perf_counter()
+    doc.build(_LazyFlowables(chunks()), onFirstPage=draw_header, onLaterPages=draw_header)
+    metrics.record('pdf_shaping', shaping_seconds)
+    metrics.record('pdf_build', time.perf_counter() - start - shaping_seconds)
+    metrics.record('pdf_export', time.perf_counter() - export_start)
+    metrics.set_value('pdf_rows', exported)
+    return exported
@@ -0,0 +1,166 @@
+"""In-memory search over the words and meanings of a dictionary."""
+import bisect
+import collections
+import heapq
+import re
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Fuzzy matching kicks in for query words of at least FUZZY_MIN_LENGTH
+# characters that match fewer than FUZZY_BELOW_RESULTS entries; at most
+# FUZZY_MAX_CANDIDATES tokens (those sharing the most trigrams) are compared
+FUZZY_MIN_LENGTH = 4
+FUZZY_BELOW_RESULTS = 10
+FUZZY_MAX_CANDIDATES = 100
+
+# Further query words filter the matches so far directly when there are at
+# most this many, rather than through the index
+FILTER_BELOW_RESULTS = 2000
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def within_edit_distance(a, b, limit):
+    """True if the Levenshtein distance between a and b is at most limit"""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+class SearchIndex:
+    """Prefix, substring and typo-tolerant search over (word, meaning) documents.
+
+    Documents are keyed like DictionaryStore entries and split into lower-cased
+    tokens. Every distinct token is kept once: in a sorted list (a prefix query
+    is two bisects), in a trigram index (substring and fuzzy candidates) and in
+    a map to the keys of the documents that contain it. Adding, changing or
+    removing a document only touches its own tokens.
+    """
+    def __init__(self):
+        self._docs = {}  # key -> tokens of the document
+        self._token_keys = {}  # token -> keys of the documents containing it
+        self._sorted_tokens = []
+        # trigram -> {token length: tokens containing it}; fuzzy matching only
+        # has to look at tokens of about the query's length
+        self._gram_tokens = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, key, word, meaning):
+        """Index a document, replacing an older version with the same key"""
+        self.remove(key)
+        self._add(key, word, meaning, True)
+
+    def add_many(self, documents):
+        """Index (key, word, meaning) documents in bulk; keys must not be indexed yet"""
+        for key, word, meaning in documents:
+            self._add(key, word, meaning, False)
+        self._sorted_tokens = sorted(self._token_keys)
+
+    def _add(self, key, word, meaning, keep_sorted):
+        tokens = tuple(set(TOKEN_RE.findall(f"{word} {meaning}".lower())))
+        self._docs[key] = tokens
+        for token in tokens:
+            keys = self._token_keys.get(token)
+            if keys is None:
+                keys = self._token_keys[token] = set()
+                if keep_sorted:
+                    bisect.insort(self._sorted_tokens, token)
+                for gram in trigrams(token):
+                    self._gram_tokens.setdefault(gram, {}).setdefault(len(token), set()).add(token)
+            keys.add(key)
+
+    def remove(self, key):
+        tokens = self._docs.pop(key, None)
+        if not tokens:
+            return
+        for token in tokens:
+            keys = self._token_keys[token]
+            keys.discard(key)
+            if keys:
+                continue
+            del self._token_keys[token]
+            del self._sorted_tokens[bisect.bisect_left(self._sorted_tokens, token)]
+            for gram in trigrams(token):
+                by_length = self._gram_tokens[gram]
+                by_length[len(token)].discard(token)
+                if not by_length[len(token)]:
+                    del by_length[len(token)]
+                    if not by_length:
+                        del self._gram_tokens[gram]
+
+    def search(self, query):
+        """Keys of the documents that match every word of query.
+
+        A query word matches a token it is a prefix of (words shorter than
+        three characters) or a substring of; words that find almost nothing
+        also match tokens one typo away (two for words of eight or more).
+        """
+        # The longest word usually narrows the most; once the matches are few,
+        # the other words filter them instead of building their own key sets
+        parts = sorted(set(TOKEN_RE.findall(query.lower())), key=len, reverse=True)
+        if not parts:
+            return set()
+        result = self._match(parts[0])
+        for part in parts[1:]:
+            if not result:
+                break
+            if len(result) > FILTER_BELOW_RESULTS:
+                result &= self._match(part)
+                continue
+            short = len(part) < 3
+            matched = {key for key in result
+                       if any(token.startswith(part) if short else part in token for token in self._docs[key])}
+            if len(matched) < FUZZY_BELOW_RESULTS and len(part) >= FUZZY_MIN_LENGTH:
+                matched |= result & self._match(part)
+            result = matched
+        return result
+
+    def _match(self, part):
+        tokens = self._prefix_tokens(part) if len(part) < 3 else self._substring_tokens(part)
+        keys = set()
+        for token in tokens:
+            keys |= self._token_keys[token]
+        if len(keys) < FUZZY_BELOW_RESULTS and len(part) >= FUZZY_MIN_LENGTH:
+            for token in self._fuzzy_tokens(part):
+                keys |= self._token_keys[token]
+        return keys
+
+    def _prefix_tokens(self, prefix):
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        end = bisect.bisect_left(self._sorted_tokens, prefix + '\U0010ffff', start)
+        return self._sorted_tokens[start:end]
+
+    def _substring_tokens(self, part):
+        # Every token containing part is listed under each of part's
+        # trigrams, so scanning the rarest one is enough
+        rarest = None
+        rarest_size = None
+        for gram in trigrams(part):
+            by_length = self._gram_tokens.get(gram)
+            if by_length is None:
+                return []
+            size = sum(len(tokens) for length, tokens in by_length.items() if length >= len(part))
+            if rarest is None or size < rarest_size:
+                rarest, rarest_size = by_length, size
+        return [token for length, tokens in rarest.items() if length >= len(part)
+                for token in tokens if part in token]
+
+    def _fuzzy_tokens(self, part):
+        limit = 1 if len(part) < 8 else 2
+        shared = collections.Counter()
+        for gram in trigrams(part):
+            by_length = self._gram_tokens.get(gram, {})
+            for length in range(len(part) - limit, len(part) + limit + 1):
+                shared.update(by_length.get(length, ()))
+        # Ties broken by the token itself so results do not depend on set order
+        candidates = heapq.nsmallest(FUZZY_MAX_CANDIDATES, shared.items(), key=lambda item: (-item[1], item[0]))
+        return [token for token, _ in candidates if within_edit_distance(part, token, limit)]
@@ -0,0 +1,117 @@
+"""Local stand-in for a LibreTranslate-compatible translation service.
+
+Run as `python -m wordpocket.standin --port 5000` and point the app at it
+with WORDPOCKET_BACKENDS=http://localhost:5000 (optionally followed by the
+real backends). Translations are derived from a hash of the pair and the
+text, so they are the same on every run; --latency, --fail-rate and --hang
+simulate a slow, flaky or stalled service for testing the fallback chain.
+"""
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def fake_translation(text, source_code, target_code):
+    digest = hashlib.sha1(f"{source_code}:{target_code}:{text}".encode('utf-8')).hexdigest()
+    return f"{target_code}-{digest[:8]}"
+
+def detect_language(text):
+    """A rough guess from the script of the first letter"""
+    for char in text:
+        if '\u0600' <= char <= '\u06ff':
+            return 'ar'
+        if '\u3040' <= char <= '\u30ff':
+            return 'ja'
+        if '\uac00' <= char <= '\ud7af':
+            return 'ko'
+        if '\u4e00' <= char <= '\u9fff':
+            return 'zh'
+        if '\u0400' <= char <= '\u04ff':
+            return 'ru'
+        if char.isalpha():
+            return 'en'
+    return 'en'
+
+class StandinHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_rate = 0.0
+    hang = False
+    rng = random.Random(0)
+
+    def _answer(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            request = json.loads(self.rfile.read(length).decode('utf-8') or "{}")
+        except ValueError:
+            self._answer(400, {'error': "Invalid JSON"})
+            return
+
+        if self.hang:
+            # Never answer, like a service that accepts connections but stalls
+            time.sleep(3600)
+        time.sleep(self.latency)
+        if self.rng.random() < self.fail_rate:
+            self._answer(500, {'error': "Simulated failure"})
+            return
+
+        text = request.get('q', "")
+        if self.path == "/translate":
+            source_code = request.get('source', 'auto')
+            target_code = request.get('target', 'en')
+            if isinstance(text, list):
+                translated = [fake_translation(item, source_code, target_code) for item in text]
+            else:
+                translated = fake_translation(text, source_code, target_code)
+            self._answer(200, {'translatedText': translated})
+        elif self.path == "/detect":
+            self._answer(200, [{'language': detect_language(text), 'confidence': 90.0}])
+        else:
+            self._answer(404, {'error': f"Unknown endpoint {self.path}"})
+
+    def log_message(self, format, *args):
+        # Keep stdout quiet; requests go to stderr only with --verbose
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def serve(port=5000, latency=0.0, fail_rate=0.0, hang=False, verbose=False, host="127.0.0.1"):
+    """Start the stand-in and return the server (call serve_forever() or shutdown())"""
+    handler = type('ConfiguredStandinHandler', (StandinHandler,),
+                   {'latency': latency, 'fail_rate': fail_rate, 'hang': hang})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m wordpocket.standin",
+                                     description="Local stand-in translation service for testing.")
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every answer")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    parser.add_argument('--hang', action='store_true', help="accept requests but never answer")
+    parser.add_argument('--verbose', action='store_true', help="log every request to stderr")
+    args = parser.parse_args(argv)
+
+    server = serve(args.port, args.latency, args.fail_rate, args.hang, args.verbose)
+    print(f"Stand-in translation service on http://127.0.0.1:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
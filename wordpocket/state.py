@@ -0,0 +1,133 @@
+"""Write-behind persistence: state lives in memory and is written off the GUI thread."""
+import atexit
+import json
+import os
+import threading
+import time
+
+from wordpocket.metrics import metrics
+
+# Seconds between the first change and the write; later changes in that
+# window are written by the same pass
+WRITE_BEHIND_DELAY = 1.0
+
+def write_atomic(path, write):
+    """Call write(f) on a temporary text file and rename it over path.
+
+    Readers (and a crash at any point) see either the old file or the new one,
+    never a truncated one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def write_json_atomic(path, data):
+    """Write JSON through a temporary file and rename it over the target"""
+    write_atomic(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=2))
+
+class WriteBehind:
+    """Writes dirty state on a background thread, coalescing bursts.
+
+    mark_dirty(key, flush) registers the callable that writes one piece of
+    state (a file). The first mark wakes the writer, which waits `delay`
+    seconds and then calls each dirty key's flush once, however often it
+    was marked meanwhile. flush() writes everything pending on the calling
+    thread; shutdown calls it for the final flush, and it also runs at
+    interpreter exit. A flush that fails, with OSError or anything else,
+    stays dirty and is retried by the next pass; the other keys are written
+    regardless and the writer thread keeps running.
+    """
+    def __init__(self, delay=WRITE_BEHIND_DELAY):
+        self.delay = delay
+        self._dirty = {}
+        self._cond = threading.Condition()
+        # One pass at a time, so a file is never written by two threads
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def mark_dirty(self, key, flush):
+        with self._cond:
+            self._dirty[key] = flush
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def pending(self):
+        """Keys waiting to be written"""
+        with self._cond:
+            return list(self._dirty)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+            time.sleep(self.delay)
+            self.flush()
+
+    def flush(self):
+        """Write every dirty key now"""
+        with self._flush_lock:
+            with self._cond:
+                dirty, self._dirty = self._dirty, {}
+            for key, flush in dirty.items():
+                try:
+                    with metrics.timer('write_behind_flush', target=os.path.basename(key)):
+                        flush()
+                except Exception as e:
+                    print(f"Error writing {key}, will retry: {str(e) or type(e).__name__}")
+                    with self._cond:
+                        self._dirty.setdefault(key, flush)
+
+write_behind = WriteBehind()
+atexit.register(write_behind.flush)
+
+class SettingsFile:
+    """A JSON settings file, read once and written behind.
+
+    values holds the settings over the given defaults. update() changes
+    them and schedules one write for any burst of changes; nothing is read
+    from disk again.
+    """
+    def __init__(self, path, defaults):
+        self.path = path
+        self.values = dict(defaults)
+        self.existed = False
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            self.existed = True
+            if isinstance(saved, dict):
+                self.values.update(saved)
+            else:
+                print(f"Error loading settings: {path} does not hold an object")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Error loading settings: {e}")
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self.values.get(key, default)
+
+    def update(self, values):
+        """Set several values; schedules a write if any of them changed"""
+        with self._lock:
+            changed = not self.existed or any(self.values.get(key) != value for key, value in values.items())
+            self.values.update(values)
+            self.existed = True
+        if changed:
+            write_behind.mark_dirty(self.path, self.flush)
+        return changed
+
+    def flush(self):
+        with self._lock:
+            data = dict(self.values)
+        write_json_atomic(self.path, data)
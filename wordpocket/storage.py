@@ -0,0 +1,730 @@
+"""Dictionary storage: JSON snapshots plus append-only journals."""
+import functools
+import json
+import os
+import re
+import threading
+
+from wordpocket import config
+from wordpocket.search import SearchIndex
+from wordpocket.state import write_atomic, write_behind
+
+def write_entries_atomic(path, words, meanings):
+    """Write parallel word/meaning lists as a dict_*.json file, atomically.
+
+    The text is the same as json.dump of the equivalent list of
+    {'word', 'meaning'} dicts with indent=2, but it is streamed row by row,
+    so no dict is built per entry.
+    """
+    def write(f):
+        if not words:
+            f.write("[]")
+            return
+        f.write("[\n")
+        last = len(words) - 1
+        for row, (word, meaning) in enumerate(zip(words, meanings)):
+            f.write('  {\n    "word": ' + json.dumps(word, ensure_ascii=False) +
+                    ',\n    "meaning": ' + json.dumps(meaning, ensure_ascii=False) +
+                    ('\n  }\n' if row == last else '\n  },\n'))
+        f.write("]")
+    write_atomic(path, write)
+
+def _entry_fields(pairs):
+    """json object hook: (word, meaning) of an entry instead of a dict"""
+    fields = dict(pairs)
+    return fields.get('word', ''), fields.get('meaning', '')
+
+def read_entries(path):
+    """(word, meaning) tuples of a dict_*.json file.
+
+    Raises ValueError if the file is not JSON or not a list of objects with
+    string words and meanings (an outside edit can leave anything there).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        # (word, meaning) tuples; no dict per entry is kept while parsing
+        data = json.load(f, object_pairs_hook=_entry_fields)
+    if not isinstance(data, list) or not all(
+            type(entry) is tuple and isinstance(entry[0], str) and isinstance(entry[1], str) for entry in data):
+        raise ValueError(f"{path} is not a list of word entries")
+    return data
+
+def merge_meanings(current, meaning):
+    """Append the comma-separated parts of meaning that current does not list yet"""
+    parts = [part.strip() for part in current.split(',') if part.strip()]
+    known = {part.lower() for part in parts}
+    for part in meaning.split(','):
+        part = part.strip()
+        if part and part.lower() not in known:
+            parts.append(part)
+            known.add(part.lower())
+    return ", ".join(parts)
+
+# How import_entries treats a word that is already saved
+IMPORT_POLICIES = ('keep', 'overwrite', 'merge')
+
+# Journal records are written, fsynced and compacted behind (see
+# wordpocket.state); compaction waits for at least this many records
+JOURNAL_COMPACT_MIN_RECORDS = 500
+
+# Rows iter_entries() copies per acquisition of the store lock
+ITER_ENTRIES_CHUNK = 1000
+
+class DictionaryStore:
+    """Saved words for one language pair, indexed by the lower-cased word.
+
+    Entries are kept as two parallel lists of strings, words and meanings,
+    plus index mapping each key to its row; a key equal to its word (the
+    common case) is the word's own string. That is two list slots per entry
+    on top of the text, where a {'word', 'meaning'} dict per entry costs
+    more than the text of a typical entry. get() and iter_entries() build
+    entry dicts on demand. A delete leaves None in both lists (a hole) so
+    that it costs O(1) and the other rows keep their order; the holes are
+    closed by the next compaction, or sooner once they outnumber the
+    entries. snapshot() gives the rows without holes.
+
+    dict_{src}_{tgt}.json is the snapshot and dict_{src}_{tgt}.journal an
+    append-only list of the changes made since, one JSON object per line
+    ({"op": "put"|"del", ...}; a put may carry the "old" word it renames).
+    A change is a dictionary lookup plus one buffered record, whatever the
+    size of the dictionary. The write-behind thread appends the buffered
+    records in one write and fsync and, once the journal is as long as the
+    snapshot, folds it into a new snapshot written via temp file + rename.
+    Loading replays the journal, so a crash loses at most the changes of the
+    last WRITE_BEHIND_DELAY and never corrupts the snapshot.
+    """
+    def __init__(self, source_lang, target_lang):
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.json_file = os.path.join(config.DATA_DIR, f"dict_{source_lang}_{target_lang}.json")
+        self.journal_file = os.path.join(config.DATA_DIR, f"dict_{source_lang}_{target_lang}.journal")
+        # Journal being folded into the snapshot by a compaction
+        self.compacting_file = self.journal_file + ".compacting"
+        self.words = []
+        self.meanings = []
+        self.index = {}
+        # Rows of deleted entries still in words and meanings
+        self._holes = 0
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        # Held while writing the journal file; taken before _lock
+        self._write_lock = threading.Lock()
+        self._journal = None
+        # Records not written to the journal yet, as JSON lines
+        self._pending = []
+        self._journal_records = 0
+        self._snapshot_size = 0
+        # Built on first use by search_index(); _search_changed collects the
+        # keys changed while a build is running
+        self._search_index = None
+        self._search_changed = None
+        self._search_build_lock = threading.Lock()
+        # subscribe()d listeners and the keys changed since they were last told
+        self._listeners = []
+        self._unpublished = set()
+        # (mtime, size) of the snapshot as last read or written by this store
+        self._snapshot_stat = None
+        self.load()
+
+    @staticmethod
+    def key(word):
+        """Index key of a word, the same rule save_to_json always used"""
+        key = word.lower()
+        # Shares the word's string when it is lower-case already
+        return word if key == word else key
+
+    def load(self):
+        """Load the snapshot and replay the journal(s) on top of it"""
+        data = []
+        if os.path.exists(self.json_file):
+            self._snapshot_stat = _file_stat(self.json_file)
+            data = read_entries(self.json_file)
+
+        with self._lock:
+            self.words = []
+            self.meanings = []
+            self.index = {}
+            self._holes = 0
+            for word, meaning in data:
+                self._put(word, meaning, overwrite=False)
+            loaded_count = len(data)
+            del data
+            self._snapshot_size = len(self.words)
+
+            if not os.path.exists(self.journal_file) and not os.path.exists(self.compacting_file):
+                self._migrate(loaded_count)
+                return
+
+            # A leftover .compacting journal means a compaction was interrupted;
+            # its records may or may not be in the snapshot, and replaying them is
+            # harmless either way.
+            self._journal_records = 0
+            for path in (self.compacting_file, self.journal_file):
+                if os.path.exists(path):
+                    self._journal_records += self._replay(path)
+            self._close_holes()
+
+    def _replay(self, path):
+        count = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                if not isinstance(record, dict):
+                    # Typically the last line of a write cut short by a crash
+                    print(f"Skipping unreadable journal line in {path}")
+                    continue
+                count += 1
+                if record.get('op') == 'del':
+                    self._delete([self.key(record.get('word', ''))])
+                    continue
+                old_word = record.get('old')
+                if old_word is not None and self.key(old_word) in self.index:
+                    self._rename(old_word, record.get('word', ''), record.get('meaning', ''))
+                else:
+                    self._put(record.get('word', ''), record.get('meaning', ''))
+        return count
+
+    def _migrate(self, loaded_count):
+        """Conversion of a plain JSON dictionary into a snapshot.
+
+        Older files may list the same word more than once (the table editor
+        allowed it); the first occurrence is kept, which is the entry
+        save_to_json used to update. The journal is only created by the
+        first change, so opening a pair that has no dictionary leaves no
+        file behind.
+        """
+        if len(self.words) != loaded_count:
+            print(f"Migrating {self.json_file}: merged {loaded_count - len(self.words)} duplicate words")
+            write_entries_atomic(self.json_file, self.words, self.meanings)
+            self._snapshot_stat = _file_stat(self.json_file)
+
+    def _put(self, word, meaning, overwrite=True):
+        """Insert or update an entry in memory; returns True if the word was new"""
+        key = self.key(word)
+        row = self.index.get(key)
+        if row is None:
+            self.index[key] = len(self.words)
+            self.words.append(word)
+            self.meanings.append(meaning)
+            self._changed((key,))
+            return True
+        if overwrite:
+            self.words[row] = word
+            self.meanings[row] = meaning
+            self._changed((key,))
+        return False
+
+    def _rename(self, old_word, word, meaning):
+        """Change an entry's word in place; merges into the target if it already exists"""
+        old_key = self.key(old_word)
+        new_key = self.key(word)
+        if new_key in self.index:
+            self._delete([old_key])
+            self._put(word, meaning)
+            return
+        row = self.index.pop(old_key)
+        self.index[new_key] = row
+        self.words[row] = word
+        self.meanings[row] = meaning
+        self._changed((old_key, new_key))
+
+    def _delete(self, keys):
+        """Remove entries from memory, leaving holes in their rows"""
+        deleted = []
+        for key in keys:
+            row = self.index.pop(key, None)
+            if row is None:
+                continue
+            self.words[row] = None
+            self.meanings[row] = None
+            self._holes += 1
+            deleted.append(key)
+        if not deleted:
+            return
+        self._changed(deleted)
+        # Closing the holes is O(n), so it waits for as many deletes
+        if self._holes > len(self.index):
+            self._close_holes()
+
+    def _close_holes(self):
+        """Drop the rows of deleted entries and renumber the index (called under the lock)"""
+        if not self._holes:
+            return
+        rows = []
+        words = []
+        meanings = []
+        for word, meaning in zip(self.words, self.meanings):
+            rows.append(len(words))
+            if word is not None:
+                words.append(word)
+                meanings.append(meaning)
+        for key, row in self.index.items():
+            self.index[key] = rows[row]
+        self.words = words
+        self.meanings = meanings
+        self._holes = 0
+
+    def _changed(self, keys):
+        """Record changed keys for the search index and the listeners (called under the lock)"""
+        self._search_update(keys)
+        if self._listeners:
+            self._unpublished.update(keys)
+
+    def subscribe(self, listener):
+        """Call listener(changes, origin) after every change to the entries.
+
+        changes is a list of (key, entry) with the entry now saved under key,
+        None if the key was deleted; a renamed word is a deletion of its old
+        key plus its new entry. origin is whatever the caller that made the
+        change passed (apply_changes lets an editor recognize its own saves).
+        The listener runs on the thread that made the change.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners:
+                self._unpublished = set()
+
+    def _publish(self, origin=None):
+        """Tell the listeners about the keys changed since the last call"""
+        with self._lock:
+            if not self._unpublished:
+                return
+            keys, self._unpublished = self._unpublished, set()
+            changes = [(key, self.get(key)) for key in keys]
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(changes, origin)
+
+    def _search_update(self, keys):
+        """Bring the search index up to date for changed keys (called under the lock)"""
+        if self._search_changed is not None:
+            self._search_changed.update(keys)
+        if self._search_index is None:
+            return
+        for key in keys:
+            row = self.index.get(key)
+            if row is None:
+                self._search_index.remove(key)
+            else:
+                self._search_index.add(key, self.words[row], self.meanings[row])
+
+    def search_index(self):
+        """The SearchIndex over words and meanings, built on first use.
+
+        The build works on a copy of the entries outside the store lock, so
+        saves are not held up by it; keys changed in the meantime are
+        re-indexed once it is done. From then on every change updates it.
+        """
+        with self._search_build_lock:
+            if self._search_index is None:
+                with self._lock:
+                    self._search_changed = set()
+                    documents = [(self.key(word), word, meaning)
+                                 for word, meaning in zip(self.words, self.meanings) if word is not None]
+                search_index = SearchIndex()
+                search_index.add_many(documents)
+                with self._lock:
+                    self._search_index = search_index
+                    changed, self._search_changed = self._search_changed, None
+                    self._search_update(changed)
+            return self._search_index
+
+    def search_index_ready(self):
+        """True once search_index() has been built, so search() will not wait for it"""
+        return self._search_index is not None
+
+    def search(self, query):
+        """Keys of the entries whose word or meaning match query (see SearchIndex.search)"""
+        search_index = self.search_index()
+        with self._lock:
+            return search_index.search(query)
+
+    def _append(self, records):
+        """Buffer change records for the journal; the write-behind thread writes them"""
+        self._pending.extend(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        self._journal_records += len(records)
+        write_behind.mark_dirty(self.journal_file, self.flush)
+
+    def _write_pending(self, lines):
+        """Append lines to the journal and fsync it (called under _write_lock)"""
+        if self._journal is None:
+            os.makedirs(os.path.dirname(self.journal_file), exist_ok=True)
+            self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        self._journal.write("".join(lines))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def get(self, word):
+        """Return the saved entry for a word (case-insensitive) or None"""
+        # Under the lock: closing the holes renumbers the rows
+        with self._lock:
+            row = self.index.get(self.key(word))
+            if row is None:
+                return None
+            return {'word': self.words[row], 'meaning': self.meanings[row]}
+
+    def iter_entries(self):
+        """Yield the entries as {'word', 'meaning'} dicts, one at a time.
+
+        The rows are read under the lock a chunk at a time. Closing the holes
+        swaps in new lists and leaves the ones being read unchanged, so this
+        sees each entry at most once.
+        """
+        with self._lock:
+            words, meanings = self.words, self.meanings
+        start = 0
+        while True:
+            with self._lock:
+                chunk = list(zip(words[start:start + ITER_ENTRIES_CHUNK],
+                                 meanings[start:start + ITER_ENTRIES_CHUNK]))
+            if not chunk:
+                return
+            start += len(chunk)
+            for word, meaning in chunk:
+                if word is not None:
+                    yield {'word': word, 'meaning': meaning}
+
+    def snapshot(self):
+        """(words, meanings, {key: row}) copies taken together, for a view that follows the changes"""
+        with self._lock:
+            self._close_holes()
+            return list(self.words), list(self.meanings), dict(self.index)
+
+    def upsert(self, word, meaning):
+        """Add or update one word; returns True if the word was new"""
+        with self._lock:
+            is_new = self._put(word, meaning)
+            self._append([{'op': 'put', 'word': word, 'meaning': meaning}])
+        self._publish()
+        return is_new
+
+    def apply_changes(self, deleted_words, puts, origin=None):
+        """Apply an editor delta: words to delete and (old_word, word, meaning) puts.
+
+        old_word is None for new rows. A put whose old_word has a different key
+        renames the entry in place, keeping its position. Puts that do not
+        change anything are dropped, so an unchanged delta writes nothing.
+        origin is passed on to the listeners. Returns the number of journaled
+        records.
+        """
+        with self._lock:
+            records = []
+            deleted = [self.key(word) for word in deleted_words if self.key(word) in self.index]
+            if deleted:
+                self._delete(deleted)
+                records += [{'op': 'del', 'word': key} for key in deleted]
+
+            for old_word, word, meaning in puts:
+                if old_word is not None and self.key(old_word) != self.key(word) and self.key(old_word) in self.index:
+                    self._rename(old_word, word, meaning)
+                    records.append({'op': 'put', 'old': old_word, 'word': word, 'meaning': meaning})
+                    continue
+                current = self.get(word)
+                if current is None or current['word'] != word or current['meaning'] != meaning:
+                    self._put(word, meaning)
+                    records.append({'op': 'put', 'word': word, 'meaning': meaning})
+
+            if records:
+                self._append(records)
+        self._publish(origin)
+        return len(records)
+
+    def import_entries(self, pairs, policy='keep'):
+        """Add (word, meaning) pairs with a single journal write.
+
+        A word that is already saved (same key) is left alone ('keep'),
+        replaced ('overwrite') or gets the new meanings appended ('merge').
+        Duplicates within pairs follow the same rule. Returns (added,
+        updated, unchanged) counts.
+        """
+        if policy not in IMPORT_POLICIES:
+            raise ValueError(f"Unknown import policy: {policy}")
+        added = updated = unchanged = 0
+        with self._lock:
+            records = []
+            for word, meaning in pairs:
+                row = self.index.get(self.key(word))
+                if row is None:
+                    added += 1
+                else:
+                    if policy == 'keep':
+                        unchanged += 1
+                        continue
+                    if policy == 'merge':
+                        word = self.words[row]
+                        meaning = merge_meanings(self.meanings[row], meaning)
+                    if self.words[row] == word and self.meanings[row] == meaning:
+                        unchanged += 1
+                        continue
+                    updated += 1
+                self._put(word, meaning)
+                records.append({'op': 'put', 'word': word, 'meaning': meaning})
+            if records:
+                self._append(records)
+        self._publish()
+        return added, updated, unchanged
+
+    def flush(self):
+        """Write and fsync the buffered records, then compact if the journal grew too long"""
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if lines:
+                try:
+                    self._write_pending(lines)
+                except Exception:
+                    with self._lock:
+                        self._pending[:0] = lines
+                    raise
+        if self.needs_compaction():
+            self.compact()
+
+    def needs_compaction(self):
+        # Compacting once the journal is as long as the snapshot keeps the
+        # amortized cost per change constant
+        return self._journal_records >= max(JOURNAL_COMPACT_MIN_RECORDS, self._snapshot_size)
+
+    def compact(self):
+        """Fold the journal into a new snapshot.
+
+        The journal is swapped out under the lock, then the snapshot is written
+        without holding it, so saves are never blocked by the O(n) write.
+        Buffered records go into the old journal first, so they survive a
+        crash before the new snapshot is in place.
+        """
+        with self._compact_lock, self._write_lock:
+            with self._lock:
+                if self._pending:
+                    self._write_pending(self._pending)
+                    self._pending = []
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                if os.path.exists(self.journal_file):
+                    os.replace(self.journal_file, self.compacting_file)
+                open(self.journal_file, 'a', encoding='utf-8').close()
+                self._journal_records = 0
+                # Copies of the row lists (the strings are shared) are a
+                # consistent snapshot
+                self._close_holes()
+                words = list(self.words)
+                meanings = list(self.meanings)
+                self._snapshot_size = len(words)
+
+            write_entries_atomic(self.json_file, words, meanings)
+            self._snapshot_stat = _file_stat(self.json_file)
+            if os.path.exists(self.compacting_file):
+                os.remove(self.compacting_file)
+
+    def _saved_state(self):
+        """{key: entry} that a fresh load would give: snapshot, journals, then buffered records"""
+        state = {}
+        for word, meaning in read_entries(self.json_file):
+            if self.key(word) not in state:
+                state[self.key(word)] = {'word': word, 'meaning': meaning}
+        lines = []
+        for path in (self.compacting_file, self.journal_file):
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    lines.extend(f)
+        for line in lines + self._pending:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            if record.get('op') == 'del':
+                state.pop(self.key(record.get('word', '')), None)
+                continue
+            if record.get('old') is not None:
+                state.pop(self.key(record['old']), None)
+            word = record.get('word', '')
+            state[self.key(word)] = {'word': word, 'meaning': record.get('meaning', '')}
+        return state
+
+    def reload_if_changed(self):
+        """Pick up an outside edit of the snapshot file by applying the difference.
+
+        Does nothing if the file is still the one this store last read or
+        wrote. Otherwise the entries become what a restart would load (the
+        edited file plus the journal on top) through ordinary changes, so
+        listeners see only the rows that differ. Returns the number of
+        changed keys.
+        """
+        with self._write_lock, self._lock:
+            stat = _file_stat(self.json_file)
+            if stat is None or stat == self._snapshot_stat:
+                return 0
+            state = self._saved_state()
+            self._snapshot_stat = stat
+            self._snapshot_size = len(state)
+            deleted = [key for key in self.index if key not in state]
+            if deleted:
+                self._delete(deleted)
+            changed = len(deleted)
+            for key, entry in state.items():
+                current = self.get(key)
+                if current is None or current['word'] != entry['word'] or current['meaning'] != entry['meaning']:
+                    self._put(entry['word'], entry['meaning'])
+                    changed += 1
+        self._publish()
+        return changed
+
+    def close(self):
+        """Write the buffered records and close the journal"""
+        with self._write_lock:
+            with self._lock:
+                if self._pending:
+                    self._write_pending(self._pending)
+                    self._pending = []
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+
+    def export_json(self, path):
+        """Write the word list in the plain dict_*.json format"""
+        words, meanings, _ = self.snapshot()
+        write_entries_atomic(path, words, meanings)
+
+    def __len__(self):
+        return len(self.index)
+
+    def size_on_disk(self):
+        """Bytes of the snapshot plus the journal"""
+        return sum(os.path.getsize(path) for path in (self.json_file, self.journal_file)
+                   if os.path.exists(path))
+
+def _file_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+DICTIONARY_FILE_RE = re.compile(r'^dict_([A-Z]+)_([A-Z]+)\.(?:json|journal)$')
+
+# Loaded stores, and stores being loaded by some thread (pair -> _Loading);
+# _stores_lock only guards these dicts and is never held while loading
+_dictionary_stores = {}
+_loading_stores = {}
+_stores_lock = threading.Lock()
+# subscribe_all() listeners, subscribed to every store as it is loaded
+_all_stores_listeners = []
+# (DATA_DIR, its mtime, pairs found) of the last dictionary_pairs() scan
+_pairs_scan = (None, None, ())
+
+class _Loading:
+    """A store being loaded; other threads asking for the same pair wait on it"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.store = None
+        self.error = None
+
+def get_dictionary_store(source_lang, target_lang):
+    """Return the shared store for a language pair, loading it on first use.
+
+    The load runs on the calling thread without holding the module lock, so
+    loading one pair never holds up loaded_dictionary_store() or
+    dictionary_pairs(); a second caller for the same pair waits for the
+    first one's load.
+    """
+    key = (source_lang, target_lang)
+    with _stores_lock:
+        store = _dictionary_stores.get(key)
+        if store is not None:
+            return store
+        loading = _loading_stores.get(key)
+        loads_here = loading is None
+        if loads_here:
+            loading = _loading_stores[key] = _Loading()
+
+    if not loads_here:
+        loading.done.wait()
+        if loading.error is not None:
+            raise loading.error
+        return loading.store
+
+    try:
+        store = DictionaryStore(source_lang, target_lang)
+    except BaseException as e:
+        loading.error = e
+        raise
+    else:
+        loading.store = store
+    finally:
+        with _stores_lock:
+            del _loading_stores[key]
+            if loading.store is not None:
+                for listener in _all_stores_listeners:
+                    loading.store.subscribe(functools.partial(listener, loading.store))
+                _dictionary_stores[key] = loading.store
+        loading.done.set()
+    return store
+
+def subscribe_all(listener):
+    """Call listener(store, changes, origin) after every change to any store, loaded now or later.
+
+    See DictionaryStore.subscribe for changes and origin.
+    """
+    with _stores_lock:
+        _all_stores_listeners.append(listener)
+        for store in _dictionary_stores.values():
+            store.subscribe(functools.partial(listener, store))
+
+def loaded_dictionary_store(source_lang, target_lang):
+    """Return the store for a language pair if it is already loaded, else None (never waits for a load)"""
+    with _stores_lock:
+        return _dictionary_stores.get((source_lang, target_lang))
+
+def dictionary_pairs():
+    """Sorted (source, target) pairs that have a dictionary, saved or loaded.
+
+    The data directory is only listed again when its mtime changes, so this
+    is cheap enough to call on every lookup.
+    """
+    global _pairs_scan
+    data_dir = config.DATA_DIR
+    try:
+        mtime = os.stat(data_dir).st_mtime_ns
+    except OSError:
+        mtime = None
+    scanned_dir, scanned_mtime, pairs = _pairs_scan
+    if scanned_dir != data_dir or scanned_mtime != mtime:
+        pairs = set()
+        if mtime is not None:
+            for name in os.listdir(data_dir):
+                match = DICTIONARY_FILE_RE.match(name)
+                if match and all(lang in config.LANGUAGES for lang in match.groups()):
+                    pairs.add(match.groups())
+        pairs = tuple(pairs)
+        _pairs_scan = (data_dir, mtime, pairs)
+    with _stores_lock:
+        # A store opened for a pair without a dictionary counts once it has entries
+        loaded = [pair for pair, store in _dictionary_stores.items() if len(store)]
+    return sorted(set(pairs).union(loaded))
+
+def close_dictionary_stores():
+    """Fold pending journals into their snapshots and close them; called on shutdown.
+
+    This keeps dict_*.json up to date for anything reading it outside the app.
+    """
+    with _stores_lock:
+        stores = list(_dictionary_stores.values())
+    for store in stores:
+        try:
+            if store._journal_records:
+                store.compact()
+            store.close()
+        except OSError as e:
+            print(f"Error closing {store.journal_file}: {e}")
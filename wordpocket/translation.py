@@ -0,0 +1,282 @@
+"""Translation backends, the persistent translation cache and bulk translation."""
+import concurrent.futures
+import os
+import sqlite3
+import threading
+import time
+
+from wordpocket.backends import BackendChain, BackendUnavailable
+from wordpocket.config import normalize_text
+
+class TranslationCache:
+    """Persistent (source, target, text) -> translation cache backed by SQLite.
+
+    Entries are evicted least-recently-used first once the cache holds more than
+    max_entries rows. If ttl is set (seconds), older entries count as misses.
+    The cache is shared between the GUI thread and the translation workers, so
+    every access goes through a lock.
+    """
+    def __init__(self, path, max_entries=20000, ttl=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL with synchronous=NORMAL keeps commits (and so LRU touches) cheap
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                text TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (source, target, text)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def get(self, source_code, target_code, text):
+        """Return the cached translation or None"""
+        key = (source_code, target_code, normalize_text(text))
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT translation, created_at FROM translations WHERE source=? AND target=? AND text=?",
+                    key).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                translation, created_at = row
+                if self.ttl is not None and now - created_at > self.ttl:
+                    self._conn.execute("DELETE FROM translations WHERE source=? AND target=? AND text=?", key)
+                    self._conn.commit()
+                    self._size -= 1
+                    self.misses += 1
+                    return None
+
+                self._conn.execute(
+                    "UPDATE translations SET last_used=? WHERE source=? AND target=? AND text=?",
+                    (now,) + key)
+                self._conn.commit()
+                self.hits += 1
+            except sqlite3.Error as e:
+                print(f"Translation cache read error: {e}")
+                return None
+        return translation
+
+    def peek(self, source_code, target_code, text):
+        """Return the cached translation or None, without counting a hit or miss or touching last_used.
+
+        For previews that are no real lookup (such as every keystroke); no
+        write is made, so it is cheap enough for the GUI thread.
+        """
+        key = (source_code, target_code, normalize_text(text))
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT translation, created_at FROM translations WHERE source=? AND target=? AND text=?",
+                    key).fetchone()
+            except sqlite3.Error as e:
+                print(f"Translation cache read error: {e}")
+                return None
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            return None
+        return row[0]
+
+    def put(self, source_code, target_code, text, translation):
+        """Store a translation and evict the least recently used entries if needed"""
+        key = (source_code, target_code, normalize_text(text))
+        now = time.time()
+        with self._lock:
+            try:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM translations WHERE source=? AND target=? AND text=?", key).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO translations (source, target, text, translation, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    key + (translation, now, now))
+                if not exists:
+                    self._size += 1
+
+                overflow = self._size - self.max_entries
+                if overflow > 0:
+                    self._conn.execute(
+                        "DELETE FROM translations WHERE rowid IN "
+                        "(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)", (overflow,))
+                    self._size -= overflow
+                    self.evictions += overflow
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"Translation cache write error: {e}")
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current size"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': self._size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# The configured backends behind their circuit breakers; clear() after a
+# language change, configure() to change the chain
+translator_pool = BackendChain()
+
+class SingleFlight:
+    """Runs one call per key at a time; callers arriving meanwhile share its outcome.
+
+    Typing back and forth ("cat", "cats", "cat") or a lookup racing a
+    prefetch for the same pair and text then costs one network request.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def run(self, key, function, *args):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+            else:
+                self.coalesced += 1
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+        try:
+            call['result'] = function(*args)
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+        return call['result']
+
+class LatencyAverage:
+    """Exponentially weighted average of backend round-trips, in seconds"""
+    def __init__(self, weight=0.3):
+        self.weight = weight
+        self.value = None
+
+    def add(self, seconds):
+        # A single float assignment, safe to call from the worker threads
+        self.value = seconds if self.value is None else self.value + self.weight * (seconds - self.value)
+
+single_flight = SingleFlight()
+translation_latency = LatencyAverage()
+
+def _timed_translate(word, source_code, target_code):
+    # The chain records per-backend metrics; this feeds the typing debounce
+    start = time.monotonic()
+    translation = translator_pool.translate(word, source_code, target_code)
+    translation_latency.add(time.monotonic() - start)
+    return translation
+
+def translate_text(word, source_code, target_code):
+    """Translate a single word through the backend chain.
+
+    Identical requests (pair and normalized text) in flight at the same time
+    share one backend call.
+    """
+    return single_flight.run((source_code, target_code, normalize_text(word)),
+                             _timed_translate, word, source_code, target_code)
+
+# Bulk translation: words per backend call, batches in flight, attempts per
+# batch and the first retry delay in seconds (doubled on every retry)
+BATCH_TRANSLATE_SIZE = 20
+BATCH_TRANSLATE_WORKERS = 4
+BATCH_TRANSLATE_ATTEMPTS = 3
+BATCH_TRANSLATE_BACKOFF = 1.0
+
+def translate_many(words, source_code, target_code, cache=None, progress=None, is_cancelled=None,
+                   batch_size=BATCH_TRANSLATE_SIZE, max_workers=BATCH_TRANSLATE_WORKERS,
+                   attempts=BATCH_TRANSLATE_ATTEMPTS, backoff=BATCH_TRANSLATE_BACKOFF):
+    """Translate many words with batched, concurrent backend calls.
+
+    Words are deduplicated on normalize_text and words already in the cache
+    are not sent. At most max_workers batches are in flight at once; a failed
+    batch is retried with exponential backoff, then its words are skipped.
+    progress(done, total) is called as batches complete and is_cancelled()
+    stops before the next batch. Returns {normalized word: translation} for
+    every word that was translated.
+    """
+    pending = {}
+    for word in words:
+        word = word.strip()
+        key = normalize_text(word)
+        if key and key not in pending:
+            pending[key] = word
+    total = len(pending)
+
+    results = {}
+    if cache is not None:
+        for key, word in list(pending.items()):
+            cached = cache.get(source_code, target_code, word)
+            if cached is not None:
+                results[key] = cached
+                del pending[key]
+    done = len(results)
+    if progress is not None:
+        progress(done, total)
+
+    items = list(pending.items())
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    def run_batch(batch):
+        batch_words = [word for _, word in batch]
+        for attempt in range(attempts):
+            if is_cancelled is not None and is_cancelled():
+                return None
+            try:
+                return translator_pool.translate_batch(batch_words, source_code, target_code)
+            except Exception as e:
+                # Retrying cannot help while every backend's circuit is open
+                if attempt == attempts - 1 or isinstance(e, BackendUnavailable):
+                    print(f"Batch translation failed, skipping {len(batch)} words: {e}")
+                    return None
+                delay = backoff * 2 ** attempt
+                print(f"Batch translation failed ({e}), retrying in {delay:.0f}s")
+                time.sleep(delay)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_batch, batch): batch for batch in batches}
+        for future in concurrent.futures.as_completed(futures):
+            batch = futures[future]
+            translations = future.result()
+            if translations is not None:
+                for (key, word), translation in zip(batch, translations):
+                    if translation:
+                        results[key] = translation
+                        if cache is not None:
+                            cache.put(source_code, target_code, word, translation)
+            done += len(batch)
+            if progress is not None:
+                progress(done, total)
+            if is_cancelled is not None and is_cancelled():
+                for pending_future in futures:
+                    pending_future.cancel()
+                break
+    return results